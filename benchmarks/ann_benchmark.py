@@ -0,0 +1,140 @@
+# benchmarks/ann_benchmark.py
+
+"""
+IVF-flat ANN benchmark (src/utils/ann_index.py) against the exact blockwise scan the similarity check uses.
+
+For each size a synthetic corpus of clustered, L2-normalised vectors is written to a temporary EmbeddingStore
+(float16, like data/similarity_index/). Queries are near-duplicates of random stored rows (cosine ~0.93, i.e. what
+the similarity check has to catch) plus fresh draws from the same clusters. Per nprobe it reports:
+    - recall@k:      overlap of the IVF top-k with the exact top-k
+    - dup recall:    share of planted duplicates whose source row is returned with score >= --threshold
+    - ms/query and the share of rows actually scored, next to the exact scan's ms/query
+plus the index build time (k-means training + assignment) and the cost of an incremental insert.
+
+Usage:
+    python benchmarks/ann_benchmark.py [--sizes 10000 100000 1000000] [--dim 384] [--queries 200] [--nprobe 1 4 8 16 32]
+1M x 384 float16 is ~750MB on disk; the store is memory-mapped, so peak RSS stays around one scan block.
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import logging
+import tempfile
+from typing import Any, Dict, List
+
+import numpy as np
+
+# --- Path Setup ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Path Setup ---
+
+logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+from src.utils.embedding_store import EmbeddingStore
+from src.utils.ann_index import IVFFlatIndex
+
+WRITE_CHUNK_ROWS: int = 50000
+SCAN_BLOCK_ROWS: int = 65536
+INSERT_ROWS: int = 1000
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+def _clustered_vectors(rng: np.random.Generator, centers: np.ndarray, n_rows: int, spread: float) -> np.ndarray:
+    rows = centers[rng.integers(0, len(centers), n_rows)] + rng.standard_normal((n_rows, centers.shape[1]), dtype=np.float32) * spread
+    return _normalize(rows).astype(np.float32)
+
+def _build_store(directory: str, n_rows: int, dim: int, rng: np.random.Generator, centers: np.ndarray, spread: float) -> EmbeddingStore:
+    store = EmbeddingStore(directory, 'bench', model_name='synthetic', normalize=False)
+    for start in range(0, n_rows, WRITE_CHUNK_ROWS):
+        chunk = _clustered_vectors(rng, centers, min(WRITE_CHUNK_ROWS, n_rows - start), spread)
+        store.add_many([(f"a{start + i}", vector) for i, vector in enumerate(chunk)])
+    return store
+
+def _exact_top_k(store: EmbeddingStore, queries: np.ndarray, k: int) -> List[List[str]]:
+    """The similarity check's exact path: blockwise float32 upcast of the memmap, one matrix product per block."""
+    keys, matrix = store.matrix()
+    best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+    best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+    for start in range(0, matrix.shape[0], SCAN_BLOCK_ROWS):
+        block_scores = queries @ np.asarray(matrix[start:start + SCAN_BLOCK_ROWS], dtype=np.float32).T
+        scores = np.concatenate([best_scores, block_scores], axis=1)
+        rows = np.concatenate([best_rows, np.broadcast_to(np.arange(start, start + block_scores.shape[1]), block_scores.shape)], axis=1)
+        keep = np.argpartition(-scores, min(k, scores.shape[1]) - 1, axis=1)[:, :k]
+        best_scores, best_rows = np.take_along_axis(scores, keep, axis=1), np.take_along_axis(rows, keep, axis=1)
+    order = np.argsort(-best_scores, axis=1)
+    return [[keys[row] for row in row_list] for row_list in np.take_along_axis(best_rows, order, axis=1)]
+
+def run_size(n_rows: int, dim: int, n_queries: int, nprobes: List[int], k: int, threshold: float, seed: int) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    centers = _normalize(rng.standard_normal((max(64, n_rows // 500), dim), dtype=np.float32))
+    spread = 1.2 / np.sqrt(dim) # Rows sit at cosine ~0.6 from their cluster centre, like real topic clusters
+    directory = tempfile.mkdtemp(prefix='ann_bench_')
+    try:
+        store = _build_store(directory, n_rows, dim, rng, centers, spread)
+        _, matrix = store.raw_matrix()
+        sources = np.sort(rng.choice(n_rows, n_queries // 2, replace=False))
+        source_vectors = np.asarray(matrix[sources], dtype=np.float32)
+        duplicates = _normalize(source_vectors + rng.standard_normal(source_vectors.shape, dtype=np.float32) * (0.4 / np.sqrt(dim)))
+        queries = np.vstack([duplicates, _clustered_vectors(rng, centers, n_queries - len(duplicates), spread)]).astype(np.float32)
+
+        started_at = time.perf_counter()
+        exact = _exact_top_k(store, queries, k)
+        exact_ms = (time.perf_counter() - started_at) * 1000 / len(queries)
+
+        ann = IVFFlatIndex(store, min_train_rows=0)
+        started_at = time.perf_counter()
+        ann.sync()
+        build_s = time.perf_counter() - started_at
+
+        result: Dict[str, Any] = {'rows': n_rows, 'nlist': ann.summary()['nlist'], 'build_s': build_s, 'exact_ms': exact_ms, 'runs': []}
+        for nprobe in nprobes:
+            rows_scored_before = ann.stats['rows_scored']
+            started_at = time.perf_counter()
+            found = ann.search(queries, k=k, nprobe=nprobe)
+            ann_ms = (time.perf_counter() - started_at) * 1000 / len(queries)
+            recall = np.mean([len(set(exact_keys) & {key for key, _ in hits}) / len(exact_keys) for exact_keys, hits in zip(exact, found)])
+            dup_recall = np.mean([any(key == f"a{source}" and score >= threshold for key, score in hits) for source, hits in zip(sources, found)])
+            scanned = (ann.stats['rows_scored'] - rows_scored_before) / len(queries) / n_rows
+            result['runs'].append({'nprobe': nprobe, 'ms': ann_ms, 'recall': recall, 'dup_recall': dup_recall, 'scanned': scanned})
+
+        store.add_many([(f"new{i}", vector) for i, vector in enumerate(_clustered_vectors(rng, centers, INSERT_ROWS, spread))])
+        started_at = time.perf_counter()
+        ann.sync()
+        result['insert_ms'] = (time.perf_counter() - started_at) * 1000
+        return result
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def format_report(results: List[Dict[str, Any]], k: int) -> str:
+    lines: List[str] = []
+    for result in results:
+        lines.append(f"N={result['rows']:,}  nlist={result['nlist']}  build={result['build_s']:.1f}s  "
+                     f"insert {INSERT_ROWS} rows={result['insert_ms']:.0f}ms  exact scan={result['exact_ms']:.2f} ms/query")
+        lines.append(f"  {'nprobe':>6} {'ms/query':>9} {'speedup':>8} {'scanned':>8} {f'recall@{k}':>10} {'dup recall':>11}")
+        for run in result['runs']:
+            lines.append(f"  {run['nprobe']:>6} {run['ms']:>9.2f} {result['exact_ms'] / run['ms']:>7.1f}x {run['scanned']:>7.1%} "
+                         f"{run['recall']:>10.3f} {run['dup_recall']:>11.3f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark IVF-flat ANN search against the exact embedding scan.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000], help="Corpus sizes (vectors).")
+    parser.add_argument('--dim', type=int, default=384, help="Vector dimension (all-MiniLM-L6-v2 is 384).")
+    parser.add_argument('--queries', type=int, default=200, help="Queries per size; half are planted near-duplicates.")
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 4, 8, 16, 32], help="nprobe values to sweep.")
+    parser.add_argument('--k', type=int, default=10, help="Neighbours per query for recall@k.")
+    parser.add_argument('--threshold', type=float, default=0.8, help="Score a planted duplicate must reach to count as found.")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark_results = [run_size(size, args.dim, max(2, args.queries), args.nprobe, args.k, args.threshold, args.seed) for size in args.sizes]
+    print(format_report(benchmark_results, args.k))
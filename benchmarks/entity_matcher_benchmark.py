@@ -0,0 +1,103 @@
+# benchmarks/entity_matcher_benchmark.py
+
+"""
+Content-signal matching benchmark: the PhraseMatcher used by analyze_content_signals vs. the previous
+per-entity approach (one `re.search(r'\b<entity>\b')` per entity per category plus one substring scan per
+indicator), on the entities in data/important_entities.json.
+
+Texts are synthetic feed entries (title + summary) mixing filler words, entity names, indicator words and
+boundary traps (entities glued to letters, digits, '_' or punctuation), so both engines see matches and
+near-misses. Reports µs per text for each engine; --check also compares their results on every text and
+exits 1 on any difference.
+
+Usage:
+    python benchmarks/entity_matcher_benchmark.py [--texts 500] [--summary-words 120] [--repeat 5] [--seed 0] [--check]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import logging
+from typing import Any, Dict, List
+
+# --- Path Setup ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Path Setup ---
+
+logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+from src.agents import filter_news_agent as fna
+
+FILLER_WORDS: List[str] = ("the a of and to in for on with new its that this from by at as is are was will has have "
+                           "company said week report users data chips cloud market team launch version update").split()
+TRAPS: List[str] = ['{}s', 'x{}', '{}_', '{}2', '#{}', '({})', '{}-based', '"{}"', '{}.']
+
+
+def _legacy_signals(title: str, summary: str) -> Dict[str, Any]:
+    combined_text = f"{title} {summary}".lower()
+    signals: Dict[str, Any] = {key: sum(1 for indicator in indicators if indicator in combined_text) for key, indicators in fna.INDICATOR_GROUPS.items()}
+    signals["length_score"] = min(len(summary) / 500.0, 2.0)
+    signals["entity_matches"] = []
+    for category, entities in fna.ENTITY_INDEX.snapshot().categories.items():
+        matches = [entity for entity in entities if re.search(r'\b' + re.escape(entity) + r'\b', combined_text)]
+        if matches:
+            signals["entity_matches"].append({"category": category, "entities": matches})
+    return signals
+
+def _synthetic_texts(n_texts: int, summary_words: int, seed: int) -> List[List[str]]:
+    rng = random.Random(seed)
+    snapshot = fna.ENTITY_INDEX.snapshot()
+    entities = snapshot.people + snapshot.companies_products
+    indicators = [indicator for group in fna.INDICATOR_GROUPS.values() for indicator in group]
+    def words(count: int) -> str:
+        out = []
+        for _ in range(count):
+            roll = rng.random()
+            if entities and roll < 0.04:
+                out.append(rng.choice(entities).title() if rng.random() < 0.5 else rng.choice(entities))
+            elif entities and roll < 0.06:
+                out.append(rng.choice(TRAPS).format(rng.choice(entities)))
+            elif roll < 0.10:
+                out.append(rng.choice(indicators))
+            else:
+                out.append(rng.choice(FILLER_WORDS))
+        return ' '.join(out)
+    return [[words(rng.randint(6, 14)), words(summary_words)] for _ in range(n_texts)]
+
+def _time_per_text(fn: Any, texts: List[List[str]], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        for title, summary in texts:
+            fn(title, summary)
+        best = min(best, time.perf_counter() - started_at)
+    return best * 1e6 / len(texts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the content-signal phrase matcher against per-entity regex searches.")
+    parser.add_argument('--texts', type=int, default=500, help="Synthetic feed entries.")
+    parser.add_argument('--summary-words', type=int, default=120, help="Words per summary.")
+    parser.add_argument('--repeat', type=int, default=5, help="Passes per engine (best is reported).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='store_true', help="Exit 1 if the matcher's signals differ from the regex version on any text.")
+    args = parser.parse_args()
+
+    benchmark_texts = _synthetic_texts(max(1, args.texts), args.summary_words, args.seed)
+    print(f"{len(fna.ENTITY_INDEX.snapshot().matcher)} distinct phrases; {len(benchmark_texts)} texts of ~{args.summary_words} words")
+    legacy_us = _time_per_text(_legacy_signals, benchmark_texts, args.repeat)
+    matcher_us = _time_per_text(fna.analyze_content_signals, benchmark_texts, args.repeat)
+    print(f"  regex per entity   {legacy_us:>9.1f} µs/text")
+    print(f"  phrase matcher     {matcher_us:>9.1f} µs/text  ({legacy_us / matcher_us:.1f}x)")
+    if args.check:
+        mismatches = [title for title, summary in benchmark_texts if _legacy_signals(title, summary) != fna.analyze_content_signals(title, summary)]
+        for title in mismatches[:10]:
+            print(f"FAIL signals differ for '{title}'")
+        print(f"{len(benchmark_texts) - len(mismatches)}/{len(benchmark_texts)} texts match the regex version")
+        sys.exit(1 if mismatches else 0)
@@ -0,0 +1,146 @@
+# benchmarks/extraction_benchmark.py
+
+"""
+Article extraction benchmark over saved pages in benchmarks/fixtures/extraction/.
+
+For each fixture listed in manifest.json it times and scores:
+    - legacy:  BeautifulSoup html.parser parse + selector fallback + <head>-only meta lookup
+    - lxml:    one lxml parse shared by the single-walk selector strategy and meta lookup
+    - trafilatura (when installed): fed the page text vs. a copy of the shared lxml tree
+
+Quality per fixture: how many `must_contain` snippets were extracted, how many `must_not_contain`
+(boilerplate) snippets leaked through, and whether the meta image matches `expected_image`.
+
+Usage:
+    python benchmarks/extraction_benchmark.py [--repeat 20] [--fixtures DIR] [--check]
+--check exits non-zero if the lxml engine misses a snippet, leaks boilerplate or picks the wrong image.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import statistics
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# --- Path Setup ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+# --- End Path Setup ---
+
+logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+from src.agents import research_agent as ra
+from src.utils.html_extraction import LXML_AVAILABLE, parse_html_document, copy_tree, extract_meta_image_url, extract_main_text
+
+DEFAULT_FIXTURES_DIR: str = os.path.join(SCRIPT_DIR, 'fixtures', 'extraction')
+
+
+def _time_it(fn: Callable[[], Any], repeat: int) -> Tuple[Any, float]:
+    """Runs fn `repeat` times; returns (last result, median milliseconds)."""
+    timings: List[float] = []
+    result: Any = None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started_at) * 1000)
+    return result, statistics.median(timings)
+
+def _score(fixture: Dict[str, Any], text: Optional[str], image_url: Optional[str]) -> Dict[str, Any]:
+    text = text or ''
+    found = [snippet for snippet in fixture.get('must_contain', []) if snippet in text]
+    leaked = [snippet for snippet in fixture.get('must_not_contain', []) if snippet in text]
+    return {'found': len(found), 'expected': len(fixture.get('must_contain', [])), 'leaked': leaked,
+            'missing': [snippet for snippet in fixture.get('must_contain', []) if snippet not in found],
+            'image_ok': image_url == fixture.get('expected_image'), 'length': len(text)}
+
+def _run_legacy(content: bytes, encoding: str, url: str) -> Tuple[Optional[str], Optional[str]]:
+    page_text = ra._decode_html(content, encoding)
+    soup = ra.BeautifulSoup(page_text, 'html.parser')
+    text = ra._fetch_full_article_text_bs_fallback(page_text, url, soup=soup)
+    head_soup = ra.BeautifulSoup(ra._decode_html(ra._extract_head_bytes({'content': content}), encoding), 'html.parser')
+    return text, ra._extract_meta_image_url(head_soup, url)
+
+def _run_lxml(content: bytes, encoding: str, url: str) -> Tuple[Optional[str], Optional[str]]:
+    tree = parse_html_document(content, encoding)
+    text, _ = extract_main_text(tree, ra.MIN_FULL_TEXT_LENGTH)
+    return text, extract_meta_image_url(tree, url)
+
+def run_benchmark(fixtures_dir: str, repeat: int) -> List[Dict[str, Any]]:
+    with open(os.path.join(fixtures_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    rows: List[Dict[str, Any]] = []
+    for fixture in manifest['fixtures']:
+        with open(os.path.join(fixtures_dir, fixture['file']), 'rb') as f:
+            content = f.read()
+        encoding = ra._detect_html_encoding('text/html', content[:4096])
+        url = fixture['url']
+        row: Dict[str, Any] = {'file': fixture['file'], 'bytes': len(content)}
+        if ra.BS4_AVAILABLE:
+            (text, image_url), row['legacy_ms'] = _time_it(lambda: _run_legacy(content, encoding, url), repeat)
+            row['legacy'] = _score(fixture, text, image_url)
+        if LXML_AVAILABLE:
+            (text, image_url), row['lxml_ms'] = _time_it(lambda: _run_lxml(content, encoding, url), repeat)
+            row['lxml'] = _score(fixture, text, image_url)
+        if ra.TRAFILATURA_AVAILABLE:
+            page_text = ra._decode_html(content, encoding)
+            _, row['trafilatura_text_ms'] = _time_it(lambda: ra._fetch_full_article_text_with_trafilatura(page_text, url), repeat)
+            if LXML_AVAILABLE:
+                tree = parse_html_document(content, encoding)
+                _, row['trafilatura_tree_ms'] = _time_it(lambda: ra._fetch_full_article_text_with_trafilatura(copy_tree(tree), url), repeat)
+        rows.append(row)
+    return rows
+
+def _format_quality(score: Optional[Dict[str, Any]]) -> str:
+    if not score:
+        return '-'
+    return f"{score['found']}/{score['expected']} leak={len(score['leaked'])} img={'ok' if score['image_ok'] else 'BAD'} len={score['length']}"
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    ms = lambda value: f"{value:.2f}" if value is not None else '-'
+    lines = [f"{'Fixture':<38} {'KB':>6} {'legacy ms':>10} {'lxml ms':>8} {'speedup':>8}  {'legacy quality':<32} {'lxml quality':<32}"]
+    for row in rows:
+        speedup = f"{row['legacy_ms'] / row['lxml_ms']:.1f}x" if row.get('legacy_ms') and row.get('lxml_ms') else '-'
+        lines.append(f"{row['file']:<38} {row['bytes'] / 1024:>6.1f} {ms(row.get('legacy_ms')):>10} {ms(row.get('lxml_ms')):>8} {speedup:>8}  "
+                     f"{_format_quality(row.get('legacy')):<32} {_format_quality(row.get('lxml')):<32}")
+        if 'trafilatura_text_ms' in row:
+            lines.append(f"{'':<38} trafilatura: text {ms(row['trafilatura_text_ms'])} ms, shared tree copy {ms(row.get('trafilatura_tree_ms'))} ms")
+    total_bytes = sum(row['bytes'] for row in rows)
+    for engine in ('legacy', 'lxml'):
+        total_ms = sum(row.get(f'{engine}_ms') or 0 for row in rows)
+        if total_ms:
+            lines.append(f"{engine}: {len(rows) / (total_ms / 1000):.0f} pages/s, {total_bytes / 1024 / 1024 / (total_ms / 1000):.1f} MB/s")
+    return "\n".join(lines)
+
+def quality_failures(rows: List[Dict[str, Any]]) -> List[str]:
+    failures: List[str] = []
+    for row in rows:
+        score = row.get('lxml')
+        if not score:
+            continue
+        if score['missing']: failures.append(f"{row['file']}: missing {score['missing']}")
+        if score['leaked']: failures.append(f"{row['file']}: leaked {score['leaked']}")
+        if not score['image_ok']: failures.append(f"{row['file']}: wrong meta image")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark article text/meta-image extraction on saved pages.")
+    parser.add_argument('--repeat', type=int, default=20, help="Timed runs per fixture (median is reported).")
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES_DIR, help="Directory containing manifest.json and the saved pages.")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if the lxml engine regresses on any fixture's expectations.")
+    args = parser.parse_args()
+
+    if not LXML_AVAILABLE:
+        print("lxml is not installed; only the legacy BeautifulSoup path will be measured.")
+    benchmark_rows = run_benchmark(args.fixtures, max(1, args.repeat))
+    print(format_report(benchmark_rows))
+    if args.check:
+        failures = quality_failures(benchmark_rows)
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1 if failures or not LXML_AVAILABLE else 0)
@@ -0,0 +1,138 @@
+# benchmarks/import_benchmark.py
+
+"""
+Import-time benchmark for the orchestrator and agent modules, from `python -X importtime`.
+
+Each target is imported in a fresh interpreter. For every target it reports the wall time of the
+import, the cumulative import time of the target module itself, and the heaviest packages it pulled
+in (cumulative time of each package's outermost import, as measured by CPython).
+
+Heavy dependencies are deferred to the stage that uses them (modal on the first LLM call, the social
+SDKs when clients are initialized, sentence-transformers/spaCy through the model registry, ...).
+--check fails if a target cannot be imported, imports one of DEFERRED_MODULES at import time, or if a
+target's import exceeds --max-ms, so a new top-level import of a heavy library shows up as a failure here.
+
+Usage:
+    python benchmarks/import_benchmark.py [--targets src.main ...] [--top 10] [--repeat 3] [--max-ms 0] [--check]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+from typing import Any, Dict, List, Tuple
+
+# --- Path Setup ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+# --- End Path Setup ---
+
+DEFAULT_TARGETS: List[str] = [
+    'src.main',
+    'src.agents.research_agent',
+    'src.agents.filter_news_agent',
+    'src.agents.similarity_check_agent',
+    'src.agents.keyword_generator_agent',
+    'src.agents.title_generator_agent',
+    'src.agents.description_generator_agent',
+    'src.agents.markdown_generator_agent',
+    'src.agents.section_writer_agent',
+    'src.agents.article_review_agent',
+    'src.agents.seo_review_agent',
+    'src.social.social_media_poster',
+]
+# Must not be imported just by importing a target; each belongs to a specific stage
+DEFERRED_MODULES: Tuple[str, ...] = ('modal', 'torch', 'sentence_transformers', 'transformers', 'spacy', 'tweepy', 'praw',
+                                     'prawcore', 'atproto', 'trafilatura', 'feedparser', 'serpapi')
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+def _run_importtime(target: str) -> Tuple[float, str, int]:
+    """Imports `target` in a fresh interpreter with -X importtime. Returns (wall ms, stderr, return code)."""
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    started_at = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {target}'], cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return (time.perf_counter() - started_at) * 1000, completed.stderr, completed.returncode
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """[{'module', 'self_us', 'cumulative_us', 'depth'}] for every `import time:` line."""
+    rows: List[Dict[str, Any]] = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            rows.append({'module': match.group(4), 'self_us': int(match.group(1)), 'cumulative_us': int(match.group(2)),
+                         'depth': (len(match.group(3)) - 1) // 2})
+    return rows
+
+def measure_target(target: str, repeat: int, top: int) -> Dict[str, Any]:
+    wall_times: List[float] = []
+    rows: List[Dict[str, Any]] = []
+    error = None
+    for _ in range(repeat):
+        wall_ms, stderr, return_code = _run_importtime(target)
+        if return_code != 0:
+            error = next((line for line in reversed(stderr.splitlines()) if line and not line.startswith('import time:')), 'import failed')
+            break
+        wall_times.append(wall_ms)
+        rows = parse_importtime(stderr) # Keep the last (warm filesystem cache) breakdown
+    target_row = next((row for row in rows if row['module'] == target), None)
+    # Per top-level package, the cost of its outermost import (which includes everything it pulled in)
+    outermost: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        package = row['module'].split('.')[0]
+        if package not in (target.split('.')[0], 'site', 'encodings') and (package not in outermost or row['depth'] < outermost[package]['depth']):
+            outermost[package] = row
+    heaviest = sorted(outermost.items(), key=lambda item: item[1]['cumulative_us'], reverse=True)
+    deferred_hits = sorted({row['module'] for row in rows if row['module'].split('.')[0] in DEFERRED_MODULES})
+    return {'target': target, 'error': error, 'wall_ms': statistics.median(wall_times) if wall_times else None,
+            'import_ms': target_row['cumulative_us'] / 1000 if target_row else None, 'modules': len(rows),
+            'heaviest': [(package, row['cumulative_us'] / 1000) for package, row in heaviest[:top]], 'deferred_hits': deferred_hits}
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'Target':<42} {'wall ms':>8} {'import ms':>10} {'modules':>8}  deferred-module violations"]
+    for result in results:
+        if result['error']:
+            lines.append(f"{result['target']:<42} {'-':>8} {'-':>10} {'-':>8}  IMPORT FAILED: {result['error']}")
+            continue
+        import_ms = f"{result['import_ms']:.1f}" if result['import_ms'] is not None else '-'
+        lines.append(f"{result['target']:<42} {result['wall_ms']:>8.1f} {import_ms:>10} {result['modules']:>8}  "
+                     f"{', '.join(result['deferred_hits']) or 'none'}")
+    for result in results:
+        if result['heaviest']:
+            lines.append(f"\n{result['target']}: heaviest packages (cumulative ms of their outermost import)")
+            lines.extend(f"    {module:<40} {ms:>8.1f}" for module, ms in result['heaviest'])
+    return "\n".join(lines)
+
+def check_failures(results: List[Dict[str, Any]], max_ms: float) -> List[str]:
+    failures: List[str] = []
+    for result in results:
+        if result['error']: # A target that does not import has not been checked for deferred imports either
+            failures.append(f"{result['target']} failed to import: {result['error']}")
+            continue
+        if result['deferred_hits']:
+            failures.append(f"{result['target']} imports deferred module(s) at import time: {', '.join(result['deferred_hits'])}")
+        if max_ms and result['import_ms'] is not None and result['import_ms'] > max_ms:
+            failures.append(f"{result['target']} import took {result['import_ms']:.1f} ms (budget {max_ms:.0f} ms)")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-module import-time breakdown (python -X importtime) for the pipeline modules.")
+    parser.add_argument('--targets', nargs='+', default=DEFAULT_TARGETS, help="Modules to import, each in a fresh interpreter.")
+    parser.add_argument('--top', type=int, default=10, help="Heaviest packages listed per target.")
+    parser.add_argument('--repeat', type=int, default=3, help="Imports per target (median wall time is reported).")
+    parser.add_argument('--max-ms', type=float, default=0, help="With --check, fail targets whose import exceeds this many ms (0 = no budget).")
+    parser.add_argument('--check', action='store_true', help="Exit 1 on import failures, deferred-module violations or budget overruns.")
+    args = parser.parse_args()
+
+    benchmark_results = [measure_target(target, max(1, args.repeat), args.top) for target in args.targets]
+    print(format_report(benchmark_results))
+    if args.check:
+        failures = check_failures(benchmark_results, args.max_ms)
+        for failure in failures:
+            print(f"FAIL {failure}")
+        sys.exit(1 if failures else 0)
@@ -601,7 +601,26 @@ def run_delete_article_tool_cli():
 
 
 # ==============================================================================
-# SECTION 5: Main Menu and CLI Orchestration
+# SECTION 5: Feed Health Report (from src/utils/feed_health.py) - CLI Version
+# ==============================================================================
+def run_feed_health_report_tool_cli():
+    print_header("Dacoola Feed Health Report")
+    try:
+        from src.utils.feed_health import FeedHealthRegistry, format_feed_health_report, FEED_HEALTH_FILE
+    except ImportError as e:
+        print_error(f"Could not load feed health module: {e}")
+        cli_suite_logger.error(f"FeedHealth: import failed: {e}"); return
+    if not os.path.exists(FEED_HEALTH_FILE):
+        print_warning(f"No feed health data yet ({os.path.relpath(FEED_HEALTH_FILE, PROJECT_ROOT)} not found). Run the pipeline first.")
+        return
+    print("Sorted by seconds spent per new entry (costliest first). 'Next poll' shows feeds currently backed off.\n")
+    print(format_feed_health_report(FeedHealthRegistry(FEED_HEALTH_FILE)))
+    cli_suite_logger.info("FeedHealth: report displayed.")
+    print_success("\nFeed Health Report Done.")
+
+
+# ==============================================================================
+# SECTION 6: Main Menu and CLI Orchestration
 # ==============================================================================
 def display_main_menu_cli():
     print_header("Dacoola Tools Suite v1.0 (CLI)")
@@ -610,13 +629,14 @@ def display_main_menu_cli():
     print("  2. Prompt Maker (Generate AI prompt from project files)")
     print("  3. Extract Broken Article IDs (From dacola.log)")
     print("  4. Delete Article (By URL or ID)")
+    print("  5. Feed Health Report (Latency, failures, yield per feed)")
     print("  0. Exit Suite")
 
 def main_suite_orchestrator_cli():
     cli_suite_logger.info("Dacoola Tools Suite (CLI) started.")
     while True:
         display_main_menu_cli()
-        choice = input("Enter your choice (0-4): ").strip()
+        choice = input("Enter your choice (0-5): ").strip()
         cli_suite_logger.debug(f"User main menu choice: {choice}")
 
         if choice == '1':
@@ -627,6 +647,8 @@ def main_suite_orchestrator_cli():
             run_extract_broken_ids_tool_cli()
         elif choice == '4':
             run_delete_article_tool_cli()
+        elif choice == '5':
+            run_feed_health_report_tool_cli()
         elif choice == '0':
             print_success("Exiting Dacoola Tools Suite. Goodbye!")
             cli_suite_logger.info("Dacoola Tools Suite exited by user.")
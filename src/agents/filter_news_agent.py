@@ -1,13 +1,11 @@
 # src/agents/filter_news_agent.py
 import os
 import sys
-import modal
 import json
 import logging
-import re
 from dotenv import load_dotenv
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple, Optional, TypedDict, Union
+from typing import Dict, List, Optional, TypedDict, Union
 import time
 
 # --- Path Setup (Ensure src is in path if run standalone) ---
@@ -18,6 +16,10 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 # --- End Path Setup ---
 
+from src.utils.lazy_import import LazyModule
+modal = LazyModule('modal') # Imported on the first Modal call, not when this module is imported
+from src.utils.entity_index import EntityIndex
+
 # --- Setup Logging ---
 logger = logging.getLogger(__name__)
 if not logging.getLogger().hasHandlers():
@@ -77,83 +79,46 @@ class FilterVerdict(TypedDict):
     factual_basis_score: Optional[Union[int, float]]
     analysis_metadata: AnalysisMetadata
 
-# --- Enhanced Entity Loading with Validation ---
-def load_important_entities() -> Tuple[List[str], List[str], List[str], Dict[str, List[str]]]:
-    """Loads and validates important entities from the JSON file."""
-    try:
-        with open(IMPORTANT_ENTITIES_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        required_keys = ["people", "companies_products"]
-        for key in required_keys:
-            if key not in data or not isinstance(data[key], list):
-                logger.error(f"Invalid structure in {IMPORTANT_ENTITIES_FILE}: missing or invalid '{key}' field")
-                return [], [], [], {}
-
-        people = [p.strip().lower() for p in data.get("people", []) if p.strip()]
-        companies_products = [cp.strip().lower() for cp in data.get("companies_products", []) if cp.strip()]
-
-        entity_categories = {
-            "top_tier_people": [p for p in people if any(name in p for name in ["elon musk", "sam altman", "satya nadella", "jensen huang", "sundar pichai"])],
-            "top_tier_companies": [c for c in companies_products if any(name in c for name in ["openai", "google", "microsoft", "nvidia", "tesla", "meta", "apple", "amazon"])],
-            "ai_companies": [c for c in companies_products if any(term in c for term in ["ai", "anthropic", "deepmind", "stability"])],
-            "all_people": people,
-            "all_companies": companies_products
-        }
-
-        all_entities = list(set(people + companies_products))
-        logger.info(f"Loaded {len(people)} people, {len(companies_products)} companies/products. Top tier: {len(entity_categories['top_tier_people'])} people, {len(entity_categories['top_tier_companies'])} companies.")
-        return people, companies_products, all_entities, entity_categories
-
-    except FileNotFoundError:
-        logger.error(f"CRITICAL: {IMPORTANT_ENTITIES_FILE} not found. Entity-based filtering will fail.")
-        return [], [], [], {}
-    except json.JSONDecodeError as e:
-        logger.error(f"CRITICAL: JSON decode error in {IMPORTANT_ENTITIES_FILE}: {e}")
-        return [], [], [], {}
-    except Exception as e:
-        logger.error(f"CRITICAL: Unexpected error loading {IMPORTANT_ENTITIES_FILE}: {e}")
-        return [], [], [], {}
+# --- Content Signal Indicators ---
+BREAKING_INDICATORS = [
+    "breaking", "urgent", "just in", "announced", "launches", "releases",
+    "reveals", "unveils", "breakthrough", "first", "record", "largest",
+    "acquisition", "merger", "ipo", "funding round", "lawsuit", "regulation"
+]
+TECHNICAL_INDICATORS = [
+    "algorithm", "model", "architecture", "benchmark", "performance",
+    "efficiency", "optimization", "training", "inference", "parameters",
+    "dataset", "api", "framework", "library", "paper", "research"
+]
+HYPE_INDICATORS = [
+    "could", "might", "may", "potentially", "rumored", "speculated",
+    "opinion", "think", "believe", "predict", "future", "trend",
+    "analysis", "review", "comparison", "guide", "tips"
+]
+INDICATOR_GROUPS = {"breaking_score": BREAKING_INDICATORS, "technical_score": TECHNICAL_INDICATORS, "hype_score": HYPE_INDICATORS}
 
-IMPORTANT_PEOPLE_LIST, IMPORTANT_COMPANIES_PRODUCTS_LIST, ALL_ENTITIES, ENTITY_CATEGORIES = load_important_entities()
+# --- Entity Index (reloaded when important_entities.json changes) ---
+# Each snapshot carries one matcher for every entity category (whole-word matches) and indicator list (substring matches)
+ENTITY_INDEX = EntityIndex(IMPORTANT_ENTITIES_FILE, extra_groups=INDICATOR_GROUPS)
 
 # --- Enhanced Content Analysis ---
 def analyze_content_signals(title: str, summary: str) -> AnalysisContentSignals:
     """Analyzes content for various signals that indicate importance."""
     combined_text = f"{title} {summary}".lower()
-
-    breaking_indicators = [
-        "breaking", "urgent", "just in", "announced", "launches", "releases",
-        "reveals", "unveils", "breakthrough", "first", "record", "largest",
-        "acquisition", "merger", "ipo", "funding round", "lawsuit", "regulation"
-    ]
-    technical_indicators = [
-        "algorithm", "model", "architecture", "benchmark", "performance",
-        "efficiency", "optimization", "training", "inference", "parameters",
-        "dataset", "api", "framework", "library", "paper", "research"
-    ]
-    hype_indicators = [
-        "could", "might", "may", "potentially", "rumored", "speculated",
-        "opinion", "think", "believe", "predict", "future", "trend",
-        "analysis", "review", "comparison", "guide", "tips"
-    ]
+    entities = ENTITY_INDEX.snapshot()
+    matched = entities.matcher.find(combined_text) # Entities and indicators in a single pass over the text
 
     signals: AnalysisContentSignals = {
-        "breaking_score": sum(1 for indicator in breaking_indicators if indicator in combined_text),
-        "technical_score": sum(1 for indicator in technical_indicators if indicator in combined_text),
-        "hype_score": sum(1 for indicator in hype_indicators if indicator in combined_text),
+        "breaking_score": len(matched["breaking_score"]),
+        "technical_score": len(matched["technical_score"]),
+        "hype_score": len(matched["hype_score"]),
         "length_score": min(len(summary) / 500.0, 2.0),
         "entity_matches": []
     }
 
-    for category, entities in ENTITY_CATEGORIES.items():
-        matches = []
-        for entity in entities:
-            pattern = r'\b' + re.escape(entity) + r'\b'
-            if re.search(pattern, combined_text):
-                matches.append(entity)
-        if matches:
-            signals["entity_matches"].append({"category": category, "entities": matches})
+    for category in entities.categories:
+        if matched[category]:
+            signals["entity_matches"].append({"category": category, "entities": matched[category]})
     return signals
 
 # --- Enhanced Prompts ---
@@ -328,10 +293,11 @@ def run_filter_agent(article_data: Dict) -> Dict:
     content_signals = analyze_content_signals(article_title, article_summary)
 
     allowed_topics_str = "\n".join([f"- {topic}" for topic in ALLOWED_TOPICS])
-    top_tier_people_str = ", ".join(ENTITY_CATEGORIES.get("top_tier_people", [])[:10])
-    top_tier_companies_str = ", ".join(ENTITY_CATEGORIES.get("top_tier_companies", [])[:15])
-    key_individuals_examples_str = ", ".join(IMPORTANT_PEOPLE_LIST[:20]) + (", etc." if len(IMPORTANT_PEOPLE_LIST) > 20 else "")
-    key_companies_products_examples_str = ", ".join(IMPORTANT_COMPANIES_PRODUCTS_LIST[:25]) + (", etc." if len(IMPORTANT_COMPANIES_PRODUCTS_LIST) > 25 else "")
+    entities = ENTITY_INDEX.snapshot()
+    top_tier_people_str = ", ".join(entities.category("top_tier_people")[:10])
+    top_tier_companies_str = ", ".join(entities.category("top_tier_companies")[:15])
+    key_individuals_examples_str = ", ".join(entities.people[:20]) + (", etc." if len(entities.people) > 20 else "")
+    key_companies_products_examples_str = ", ".join(entities.companies_products[:25]) + (", etc." if len(entities.companies_products) > 25 else "")
 
     signals_str_list = [
         f"- Breaking indicators: {content_signals['breaking_score']}",
@@ -12,7 +12,6 @@ import os
 import sys
 import json
 import logging
-import modal # Added for Modal integration
 import re
 import time # For retry delays
 
@@ -28,6 +27,9 @@ dotenv_path = os.path.join(PROJECT_ROOT, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 # --- End Path Setup ---
 
+from src.utils.lazy_import import LazyModule
+modal = LazyModule('modal') # Imported on the first Modal call, not when this module is imported
+
 # --- Setup Logging ---
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -39,32 +41,19 @@ if not logger.handlers:
 # --- End Setup Logging ---
 
 # --- NLP Libraries Setup (Lazy Loading) ---
-SPACY_MODEL = None
-SENTENCE_MODEL = None
-SENTENCE_UTIL = None # For cos_sim
+# Models are loaded on first use and shared with the other agents through the model registry
+from src.utils.model_registry import get_model_registry, SENTENCE_TRANSFORMER, SPACY
 
-try:
-    import spacy
-    try:
-        # Attempt to load the small English model
-        SPACY_MODEL = spacy.load("en_core_web_sm")
-        logger.info("SpaCy model 'en_core_web_sm' loaded successfully for NER.")
-    except OSError:
-        # If model not found, provide instructions
-        logger.warning("SpaCy model 'en_core_web_sm' not found. Run 'python -m spacy download en_core_web_sm' to enable entity extraction.")
-        SPACY_MODEL = None # Ensure it's None if loading fails
-except ImportError:
+SPACY_MODEL_NAME = "en_core_web_sm"
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+SPACY_AVAILABLE = get_model_registry().is_available(SPACY)
+if not SPACY_AVAILABLE:
     logger.warning("SpaCy library not found. Named Entity Recognition (NER) will be disabled. Run 'pip install spacy'.")
 
-try:
-    from sentence_transformers import SentenceTransformer, util as sentence_transformers_util
-    SENTENCE_MODEL = SentenceTransformer('all-MiniLM-L6-v2')
-    SENTENCE_UTIL = sentence_transformers_util
-    logger.info("Sentence Transformer model 'all-MiniLM-L6-v2' loaded successfully for semantic deduplication.")
-except ImportError:
+SENTENCE_TRANSFORMERS_AVAILABLE = get_model_registry().is_available(SENTENCE_TRANSFORMER)
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     logger.warning("Sentence-transformers library not found. Semantic keyword deduplication will be disabled. Run 'pip install sentence-transformers'.")
-except Exception as e:
-    logger.error(f"Error loading Sentence Transformer model: {e}. Semantic deduplication disabled.")
 
 
 # --- Configuration & Constants ---
@@ -173,13 +162,14 @@ You are an ASI-level SEO Keyword Curator. Your task is to refine a provided **br
 # --- Helper Functions ---
 def _extract_named_entities(text: str) -> list:
     """Extracts named entities from text using SpaCy."""
-    if SPACY_MODEL is None:
-        logger.warning("SpaCy model not loaded. Skipping entity extraction.")
+    spacy_model = get_model_registry().spacy(SPACY_MODEL_NAME) if SPACY_AVAILABLE else None
+    if spacy_model is None:
+        logger.warning(f"SpaCy model '{SPACY_MODEL_NAME}' not loaded (run 'python -m spacy download {SPACY_MODEL_NAME}'). Skipping entity extraction.")
         return []
     
     entities = set()
     try:
-        doc = SPACY_MODEL(text)
+        doc = spacy_model(text)
         for ent in doc.ents:
             if ent.label_ in ["ORG", "PERSON", "PRODUCT", "LOC", "GPE", "NORP", "EVENT", "WORK_OF_ART", "FACILITY", "LANGUAGE"]:
                 entity_text = ent.text.strip().replace('\n', ' ').replace('\r', '').replace('  ', ' ')
@@ -194,16 +184,18 @@ def _semantically_deduplicate_keywords(keywords_list: list, primary_topic_keywor
     Deduplicates a list of keywords based on semantic similarity using Sentence Transformers.
     Prioritizes keywords based on containing the primary topic keyword or being shorter.
     """
-    if SENTENCE_MODEL is None or SENTENCE_UTIL is None or not keywords_list:
+    sentence_model = get_model_registry().sentence_transformer(SENTENCE_MODEL_NAME) if SENTENCE_TRANSFORMERS_AVAILABLE and keywords_list else None
+    if sentence_model is None:
         logger.warning("Sentence Transformer not loaded or keyword list is empty. Skipping semantic deduplication.")
         return keywords_list
+    from sentence_transformers import util as sentence_transformers_util
 
     primary_topic_lower = primary_topic_keyword.lower()
     final_unique_keywords = []
     
     try:
-        embeddings = SENTENCE_MODEL.encode(keywords_list, convert_to_tensor=True, show_progress_bar=False)
-        cosine_scores = SENTENCE_UTIL.pytorch_cos_sim(embeddings, embeddings)
+        embeddings = sentence_model.encode(keywords_list, convert_to_tensor=True, show_progress_bar=False)
+        cosine_scores = sentence_transformers_util.pytorch_cos_sim(embeddings, embeddings)
 
         # Map original indices to their current status (True = keep, False = remove)
         keep_status = [True] * len(keywords_list)
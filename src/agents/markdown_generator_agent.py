@@ -6,7 +6,6 @@ import os
 import sys
 import json
 import logging
-import modal # Added for Modal integration
 import re
 import time
 import random
@@ -24,6 +23,9 @@ dotenv_path = os.path.join(PROJECT_ROOT, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 # --- End Path Setup ---
 
+from src.utils.lazy_import import LazyModule
+modal = LazyModule('modal') # Imported on the first Modal call, not when this module is imported
+
 # --- Setup Logging ---
 # More structured logging can be implemented with a custom formatter if needed
 logger = logging.getLogger(__name__)
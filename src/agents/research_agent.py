@@ -36,8 +36,12 @@ import re
 import time
 import io
 import random
-from datetime import datetime, timezone
-from typing import Dict, List, Optional, Set, Tuple, Any, Union, Type
+import unicodedata
+import threading
+import queue
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple, Any, Union, Type, Iterator, Iterable
 from urllib.parse import urljoin
 
 # Path Setup
@@ -51,6 +55,15 @@ from dotenv import load_dotenv
 dotenv_path = os.path.join(PROJECT_ROOT, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 
+from src.utils.http_client import http_get
+from src.utils.host_scheduler import get_host_scheduler
+from src.utils.image_headers import probe_image_size, sniff_image_format, looks_like_markup
+from src.utils.persistent_cache import PersistentCache
+from src.utils.feed_health import FeedHealthRegistry
+from src.utils.lazy_import import lazy_module, module_available
+from src.utils.html_extraction import (LXML_AVAILABLE, parse_html_document, copy_tree, extract_meta_image_url, extract_main_text,
+                                       extract_page_metadata, find_canonical_url)
+
 # Logging Setup
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -61,22 +74,15 @@ if not logger.handlers:
     )
 
 # Graceful Degradation for External Libraries
-FEEDPARSER_AVAILABLE: bool
-try:
-    import feedparser
-    FEEDPARSER_AVAILABLE = True
-except ImportError:
-    feedparser = None 
-    FEEDPARSER_AVAILABLE = False
+# feedparser, trafilatura and serpapi are only checked for here; each is imported when its stage first uses it.
+FEEDPARSER_AVAILABLE: bool = module_available('feedparser')
+feedparser: Optional[Any] = lazy_module('feedparser')
+if not FEEDPARSER_AVAILABLE:
     logger.warning("feedparser library not found. RSS feed scraping will be disabled. Install with: pip install feedparser")
 
-TRAFILATURA_AVAILABLE: bool
-try:
-    import trafilatura
-    TRAFILATURA_AVAILABLE = True
-except ImportError:
-    trafilatura = None 
-    TRAFILATURA_AVAILABLE = False
+TRAFILATURA_AVAILABLE: bool = module_available('trafilatura')
+trafilatura: Optional[Any] = lazy_module('trafilatura')
+if not TRAFILATURA_AVAILABLE:
     logger.warning("trafilatura library not found. Advanced full article fetching will be limited. Install with: pip install trafilatura")
 
 BS4_AVAILABLE: bool
@@ -91,14 +97,9 @@ except ImportError:
     BS4_AVAILABLE = False
     logger.warning("BeautifulSoup library (bs4) not found. HTML parsing for content and images will be disabled. Install with: pip install beautifulsoup4")
 
-SERPAPI_AVAILABLE: bool
-GoogleSearch: Optional[Type[Any]] = None 
-try:
-    from serpapi import GoogleSearch as SerpGSearch
-    GoogleSearch = SerpGSearch
-    SERPAPI_AVAILABLE = True
-except ImportError:
-    SERPAPI_AVAILABLE = False
+SERPAPI_AVAILABLE: bool = module_available('serpapi')
+GoogleSearch: Optional[Any] = lazy_module('serpapi', 'GoogleSearch')
+if not SERPAPI_AVAILABLE:
     logger.warning("serpapi library not found. Google Image Search via SerpApi will be disabled. Install with: pip install google-search-results")
 
 PIL_AVAILABLE: bool
@@ -113,19 +114,32 @@ except ImportError:
     PIL_AVAILABLE = False
     logger.warning("Pillow (PIL) library not found. Image processing and validation will be skipped. Install with: pip install Pillow")
 
-SENTENCE_TRANSFORMERS_AVAILABLE: bool
-SentenceTransformer: Optional[Type[Any]] = None 
-st_cos_sim: Optional[Any] = None 
-CLIP_MODEL_INSTANCE: Optional[Any] = None 
+# The CLIP model is loaded on first use and shared through the model registry (see _get_clip_model)
+from src.utils.model_registry import get_model_registry, SENTENCE_TRANSFORMER
+SENTENCE_TRANSFORMERS_AVAILABLE: bool = get_model_registry().is_available(SENTENCE_TRANSFORMER)
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
+    logger.warning("sentence-transformers library not found. CLIP-based image filtering will be disabled. Install with: pip install sentence-transformers")
+
+CONTENT_SIGNALS_AVAILABLE: bool
+analyze_content_signals: Optional[Any] = None
+try:
+    from src.agents.filter_news_agent import analyze_content_signals as filter_analyze_content_signals
+    analyze_content_signals = filter_analyze_content_signals
+    CONTENT_SIGNALS_AVAILABLE = True
+except Exception as e:
+    CONTENT_SIGNALS_AVAILABLE = False
+    logger.warning(f"Filter agent content signals unavailable ({e}). Feed pre-screen will rank by recency only.")
+
+NUMPY_AVAILABLE: bool
+np: Optional[Any] = None
+EmbeddingStore: Optional[Type[Any]] = None
 try:
-    from sentence_transformers import SentenceTransformer as STSentenceTransformer
-    from sentence_transformers.util import cos_sim
-    SentenceTransformer = STSentenceTransformer
-    st_cos_sim = cos_sim
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
+    import numpy as np
+    from src.utils.embedding_store import EmbeddingStore
+    NUMPY_AVAILABLE = True
 except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
-    logger.warning("sentence-transformers library not found. CLIP-based image filtering will be disabled. Install with: pip install sentence-transformers")
+    NUMPY_AVAILABLE = False
+    logger.warning("numpy not found. CLIP-based image filtering will be disabled. Install with: pip install numpy")
 
 
 # Configuration & Constants
@@ -252,18 +266,111 @@ IMAGE_SEARCH_PARAMS: Dict[str, str] = {
     "engine": "google_images", "ijn": "0", "safe": "active",
     "tbs": "isz:l,itp:photo,iar:w",
 }
+
+# Image search backend: 'serpapi' (live, paid) or 'recorded' (offline stand-in serving IMAGE_SEARCH_RECORDINGS_FILE).
+IMAGE_SEARCH_BACKEND: str = os.getenv('IMAGE_SEARCH_BACKEND', 'serpapi').strip().lower()
+IMAGE_SEARCH_RECORDINGS_FILE: str = os.getenv('IMAGE_SEARCH_RECORDINGS_FILE', os.path.join(PROJECT_ROOT, 'data', 'image_search_recordings.json'))
+IMAGE_SEARCH_RECORD_RESULTS: bool = os.getenv('IMAGE_SEARCH_RECORD_RESULTS', 'false').lower() == 'true' # Save live results for the 'recorded' backend
+IMAGE_SEARCH_MAX_STORED_RESULTS: int = 20 # Results kept per query in the cache/recordings
+
+# Persistent image search cache (normalized query -> trimmed images_results)
+IMAGE_SEARCH_CACHE_FILE: str = os.path.join(PROJECT_ROOT, 'data', 'image_search_cache.json')
+IMAGE_SEARCH_CACHE_TTL_HOURS: float = float(os.getenv('IMAGE_SEARCH_CACHE_TTL_HOURS', '72'))
+IMAGE_SEARCH_CACHE_EMPTY_TTL_HOURS: float = float(os.getenv('IMAGE_SEARCH_CACHE_EMPTY_TTL_HOURS', '12')) # Queries with no results
+IMAGE_SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv('IMAGE_SEARCH_CACHE_MAX_ENTRIES', '2000'))
+IMAGE_SEARCH_CACHE: PersistentCache = PersistentCache(IMAGE_SEARCH_CACHE_FILE, default_ttl_seconds=IMAGE_SEARCH_CACHE_TTL_HOURS * 3600,
+                                                      max_entries=IMAGE_SEARCH_CACHE_MAX_ENTRIES, name='image_search')
+IMAGE_SEARCH_RECORDINGS: PersistentCache = PersistentCache(IMAGE_SEARCH_RECORDINGS_FILE, max_entries=100000, name='image_search_recordings')
 IMAGE_DOWNLOAD_TIMEOUT: int = 20
-IMAGE_DOWNLOAD_RETRIES: int = 2
-IMAGE_RETRY_DELAY: int = 3
+IMAGE_PROBE_MAX_BYTES: int = int(os.getenv('IMAGE_PROBE_MAX_BYTES', str(64 * 1024))) # Bytes read looking for the size header
+IMAGE_MAX_BYTES: int = int(os.getenv('IMAGE_MAX_BYTES', str(15 * 1024 * 1024))) # Hard cap for full image downloads
+IMAGE_STREAM_CHUNK_SIZE: int = 8192
+
+# Persistent image validation cache (URL -> status, dimensions, content-type, size, content hash, checked-at)
+IMAGE_VALIDATION_CACHE_FILE: str = os.path.join(PROJECT_ROOT, 'data', 'image_validation_cache.json')
+IMAGE_VALIDATION_CACHE_TTL_HOURS: float = float(os.getenv('IMAGE_VALIDATION_CACHE_TTL_HOURS', '168')) # Known-good URLs
+IMAGE_VALIDATION_CACHE_BAD_TTL_HOURS: float = float(os.getenv('IMAGE_VALIDATION_CACHE_BAD_TTL_HOURS', '24')) # Known-bad URLs
+IMAGE_VALIDATION_CACHE_MAX_ENTRIES: int = int(os.getenv('IMAGE_VALIDATION_CACHE_MAX_ENTRIES', '5000'))
+IMAGE_VALIDATION_CACHE: PersistentCache = PersistentCache(IMAGE_VALIDATION_CACHE_FILE, max_entries=IMAGE_VALIDATION_CACHE_MAX_ENTRIES,
+                                                          name='image_validation')
 
 MIN_IMAGE_WIDTH: int = int(os.getenv('MIN_IMAGE_WIDTH', '400'))
 MIN_IMAGE_HEIGHT: int = int(os.getenv('MIN_IMAGE_HEIGHT', '250'))
 MIN_CLIP_SCORE: float = float(os.getenv('MIN_CLIP_SCORE', '0.5'))
-ENABLE_CLIP_FILTERING: bool = SENTENCE_TRANSFORMERS_AVAILABLE and PIL_AVAILABLE
+ENABLE_CLIP_FILTERING: bool = SENTENCE_TRANSFORMERS_AVAILABLE and PIL_AVAILABLE and NUMPY_AVAILABLE
+CLIP_DOWNLOAD_WORKERS: int = int(os.getenv('CLIP_DOWNLOAD_WORKERS', '7')) # Candidate images downloaded in parallel
+CLIP_DOWNLOAD_DEADLINE_SECONDS: float = float(os.getenv('CLIP_DOWNLOAD_DEADLINE_SECONDS', '25')) # Overall budget for all candidates
+CLIP_MIN_IMAGES_TO_SCORE: int = int(os.getenv('CLIP_MIN_IMAGES_TO_SCORE', '4')) # Start encoding once this many images are in
+
+# Content-addressed CLIP embedding cache (float16, memory-mapped). Images are keyed by the sha256 of their bytes
+# (the content_hash recorded in IMAGE_VALIDATION_CACHE), prompts by the sha256 of the prompt text.
+CLIP_EMBEDDING_CACHE_DIR: str = os.path.join(PROJECT_ROOT, 'data', 'clip_embeddings')
+ENABLE_CLIP_EMBEDDING_CACHE: bool = os.getenv('ENABLE_CLIP_EMBEDDING_CACHE', 'true').lower() == 'true'
+CLIP_IMAGE_EMBEDDINGS: Optional[Any] = EmbeddingStore(CLIP_EMBEDDING_CACHE_DIR, 'images', model_name=CLIP_MODEL_NAME) \
+    if (ENABLE_CLIP_EMBEDDING_CACHE and EmbeddingStore) else None
+CLIP_PROMPT_EMBEDDINGS: Optional[Any] = EmbeddingStore(CLIP_EMBEDDING_CACHE_DIR, 'prompts', model_name=CLIP_MODEL_NAME) \
+    if (ENABLE_CLIP_EMBEDDING_CACHE and EmbeddingStore) else None
+clip_embedding_stats: Dict[str, int] = {'image_hits': 0, 'image_encoded': 0, 'prompt_hits': 0, 'prompt_encoded': 0, 'downloads_skipped': 0}
 
 # Define new constants for text length and article fetch timeout
 MIN_FULL_TEXT_LENGTH: int = int(os.getenv('MIN_FULL_TEXT_LENGTH', '300')) # Minimum characters for extracted full text
 ARTICLE_FETCH_TIMEOUT: int = int(os.getenv('ARTICLE_FETCH_TIMEOUT', '15')) # Timeout for fetching article HTML
+ARTICLE_MAX_BYTES: int = int(os.getenv('ARTICLE_MAX_BYTES', str(3 * 1024 * 1024))) # Article HTML beyond this is not downloaded
+ARTICLE_STREAM_CHUNK_SIZE: int = 16384
+ARTICLE_HEAD_MAX_BYTES: int = 256 * 1024 # Where to give up looking for </head> when extracting meta tags
+ARTICLE_HTML_CONTENT_TYPES: Tuple[str, ...] = ('text/html', 'application/xhtml+xml')
+
+ARTICLE_REQUEST_HEADERS: Dict[str, str] = {
+    'User-Agent': f'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 DacoolaNewsBot/1.0 (+{WEBSITE_URL_FOR_AGENT})',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9', 'Referer': 'https://www.google.com/'
+}
+
+# Per-run article page cache: URL -> fetched page (final URL, headers, body, parsed tree).
+# Text extraction and source image scraping both read from it, so each article page is fetched and parsed once.
+_ARTICLE_PAGE_CACHE: Dict[str, Dict[str, Any]] = {}
+_ARTICLE_PAGE_CACHE_LOCK: threading.Lock = threading.Lock()
+
+# Persistent extraction cache: "<canonical URL> <body sha256>" -> extracted text + metadata (title, meta image, published time).
+# Rescraped Gyro Picks and syndicated copies resolving to the same canonical page skip extraction entirely.
+ARTICLE_EXTRACTION_CACHE_FILE: str = os.path.join(PROJECT_ROOT, 'data', 'article_extraction_cache.json')
+ARTICLE_EXTRACTION_CACHE_TTL_HOURS: float = float(os.getenv('ARTICLE_EXTRACTION_CACHE_TTL_HOURS', '336'))
+ARTICLE_EXTRACTION_CACHE_EMPTY_TTL_HOURS: float = float(os.getenv('ARTICLE_EXTRACTION_CACHE_EMPTY_TTL_HOURS', '24')) # Pages that yielded no text
+ARTICLE_EXTRACTION_CACHE_MAX_ENTRIES: int = int(os.getenv('ARTICLE_EXTRACTION_CACHE_MAX_ENTRIES', '1000'))
+ARTICLE_EXTRACTION_CACHE_MAX_MB: float = float(os.getenv('ARTICLE_EXTRACTION_CACHE_MAX_MB', '20'))
+ARTICLE_EXTRACTION_CACHE: PersistentCache = PersistentCache(ARTICLE_EXTRACTION_CACHE_FILE, default_ttl_seconds=ARTICLE_EXTRACTION_CACHE_TTL_HOURS * 3600,
+                                                            max_entries=ARTICLE_EXTRACTION_CACHE_MAX_ENTRIES, name='article_extraction',
+                                                            max_bytes=int(ARTICLE_EXTRACTION_CACHE_MAX_MB * 1024 * 1024))
+
+# Feed entry pre-screen (feed metadata only, runs before any article/image network I/O)
+ARTICLE_MAX_AGE_DAYS_FILTER: int = int(os.getenv('ARTICLE_MAX_AGE_DAYS_FILTER', '30'))
+# Near-duplicate titles (Jaccard over title tokens) are only ranked lower: "iPhone 17 Pro" vs "iPhone 17 Pro Max" are different
+# stories, so whether a candidate repeats one is left to the similarity check once its content is known. Only exact titles are dropped.
+PRESCREEN_NEAR_DUPLICATE_TITLE_THRESHOLD: float = float(os.getenv('PRESCREEN_NEAR_DUPLICATE_TITLE_THRESHOLD', '0.8'))
+PRESCREEN_RECENCY_WINDOW_HOURS: float = float(os.getenv('PRESCREEN_RECENCY_WINDOW_HOURS', '48')) # Recency bonus decays to zero over this window
+PRESCREEN_SCORE_WEIGHTS: Dict[str, float] = {
+    'breaking': 2.0, 'technical': 1.0, 'hype': -1.0, 'length': 0.5, 'recency': 3.0, 'near_duplicate_title': -3.0,
+    'top_tier_people': 3.0, 'top_tier_companies': 3.0, 'ai_companies': 2.0, 'all_people': 1.0, 'all_companies': 1.0,
+}
+TITLE_MATCH_STOPWORDS: Set[str] = {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'with', 'at', 'by', 'from', 'as', 'is', 'are', 'be',
+    'its', 'it', 'this', 'that', 'new', 'says', 'after', 'how', 'why', 'what', 'will', 'can', 'into', 'about', 's',
+}
+
+# Streaming handoff to the processing stage (stream_research_agent)
+RESEARCH_QUEUE_MAXSIZE: int = int(os.getenv('RESEARCH_QUEUE_MAXSIZE', '2')) # Researched articles allowed to wait for processing
+_RESEARCH_STREAM_DONE: object = object()
+
+# Concurrent feed fetching
+FEED_FETCH_TIMEOUT: int = int(os.getenv('FEED_FETCH_TIMEOUT', '20')) # Per-feed download timeout
+FEED_FETCH_MAX_WORKERS: int = int(os.getenv('FEED_FETCH_MAX_WORKERS', '16')) # Feeds downloaded in parallel
+FEED_USER_AGENT: str = 'DacoolaNewsBot/1.0 (+https://dacoolaa.netlify.app) FeedFetcher'
+
+# Conditional-GET feed cache (ETag / Last-Modified / content hash per feed, persisted across runs)
+FEED_STATE_FILE: str = os.path.join(PROJECT_ROOT, 'data', 'feed_state.json')
+ENABLE_FEED_CONDITIONAL_GET: bool = os.getenv('ENABLE_FEED_CONDITIONAL_GET', 'true').lower() == 'true'
+# Adaptive polling: skip feeds that the health registry (data/feed_health.json) has backed off
+ENABLE_FEED_HEALTH_BACKOFF: bool = os.getenv('ENABLE_FEED_HEALTH_BACKOFF', 'true').lower() == 'true'
 
 def _get_article_id(entry: Dict[str, Any], source_identifier: str) -> str:
     raw_title: str = entry.get('title', '')
@@ -284,8 +391,12 @@ def _get_article_id(entry: Dict[str, Any], source_identifier: str) -> str:
     article_id: str = hashlib.sha256(identifier.encode('utf-8')).hexdigest()
     return article_id
 
+def _get_clip_model() -> Optional[Any]:
+    """The shared CLIP model from the model registry (loaded on first use), or None. Fetch it per use rather than keeping it."""
+    return get_model_registry().sentence_transformer(CLIP_MODEL_NAME) if SENTENCE_TRANSFORMERS_AVAILABLE else None
+
 def _load_sentence_model_clip() -> bool:
-    global CLIP_MODEL_INSTANCE, ENABLE_CLIP_FILTERING
+    global ENABLE_CLIP_FILTERING
     if not PIL_AVAILABLE: 
         logger.debug("Pillow not available, CLIP filtering cannot proceed.")
         ENABLE_CLIP_FILTERING = False
@@ -295,123 +406,282 @@ def _load_sentence_model_clip() -> bool:
         return False
     if not ENABLE_CLIP_FILTERING: 
         return False
-    if CLIP_MODEL_INSTANCE is None:
-        try:
-            logger.info(f"Loading CLIP model: {CLIP_MODEL_NAME}...")
-            CLIP_MODEL_INSTANCE = SentenceTransformer(CLIP_MODEL_NAME) if SentenceTransformer else None
-            if CLIP_MODEL_INSTANCE:
-                logger.info("CLIP model loaded successfully.")
-                return True
-            else: 
-                logger.error(f"SentenceTransformer was None despite _AVAILABLE flag. Disabling CLIP.")
-                ENABLE_CLIP_FILTERING = False
-                return False
-        except Exception as e:
-            logger.error(f"Failed to load CLIP model '{CLIP_MODEL_NAME}': {e}. Disabling CLIP filtering.")
-            ENABLE_CLIP_FILTERING = False
-            return False
+    if _get_clip_model() is None:
+        logger.error(f"CLIP model '{CLIP_MODEL_NAME}' could not be loaded. Disabling CLIP filtering.")
+        ENABLE_CLIP_FILTERING = False
+        return False
     return True
 
-def _download_image(url: str, attempt: int = 1) -> Tuple[Optional[Union[Any, bytes]], Optional[str]]:
-    if not PIL_AVAILABLE:
-        logger.warning("Pillow not available. Image dimension validation skipped. Returning raw content if download succeeds.")
-        try:
-            headers: Dict[str, str] = {'User-Agent': f'DacoolaImageScraper/1.1 (+{WEBSITE_URL_FOR_AGENT})'}
-            response: requests.Response = requests.get(url, timeout=IMAGE_DOWNLOAD_TIMEOUT, headers=headers, stream=True)
-            response.raise_for_status()
-            return response.content, url 
-        except Exception as e:
-            logger.warning(f"Pillow unavailable & basic image download failed for {url}: {e}")
-            return None, None
+def _remember_image_validation(url: str, is_valid: bool, reason: Optional[str] = None, width: Optional[int] = None,
+                               height: Optional[int] = None, content_type: Optional[str] = None,
+                               byte_size: Optional[int] = None, content_hash: Optional[str] = None) -> None:
+    previous: Optional[Dict[str, Any]] = IMAGE_VALIDATION_CACHE.peek(url)
+    entry: Dict[str, Any] = {
+        'status': 'ok' if is_valid else 'bad', 'reason': reason, 'width': width, 'height': height,
+        'content_type': content_type, 'byte_size': byte_size, 'content_hash': content_hash,
+        'checked_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    }
+    if is_valid and previous and previous.get('status') == 'ok':
+        # A header probe does not see the whole body; keep what an earlier full download learned.
+        for field in ('byte_size', 'content_hash'):
+            if entry[field] is None: entry[field] = previous.get(field)
+    ttl_hours: float = IMAGE_VALIDATION_CACHE_TTL_HOURS if is_valid else IMAGE_VALIDATION_CACHE_BAD_TTL_HOURS
+    IMAGE_VALIDATION_CACHE.set(url, entry, ttl_seconds=ttl_hours * 3600)
+
+def _download_image(url: str, probe_only: bool = False) -> Tuple[Optional[Union[Any, bytes]], Optional[str]]:
+    """
+    Validates (and optionally downloads) a candidate image.
+
+    The body is streamed: the first few KB are read and the dimensions taken from the JPEG/PNG/GIF/WebP
+    header, so undersized images and non-image bodies are rejected without downloading the rest.
+    With probe_only=True, a valid image returns ((width, height), url) as soon as its header has been read;
+    use it wherever only the URL is kept. Otherwise the full image is downloaded (capped at IMAGE_MAX_BYTES)
+    and returned as an RGB PIL image, or as raw bytes if Pillow is unavailable.
 
+    Results are remembered in IMAGE_VALIDATION_CACHE: known-bad URLs return immediately and known-good
+    URLs skip the network entirely in probe mode. Timeouts are retried only by the pooled session
+    (src/utils/http_client.py), not again here.
+    """
     if not url or not url.startswith('http'):
         logger.warning(f"Invalid image URL: {url}")
         return None, None
-    try:
-        headers = {'User-Agent': f'DacoolaImageScraper/1.1 (+{WEBSITE_URL_FOR_AGENT})'}
-        response = requests.get(url, timeout=IMAGE_DOWNLOAD_TIMEOUT, headers=headers, stream=True)
-        response.raise_for_status()
-        content_type: str = response.headers.get('content-type', '').lower()
-        if not content_type.startswith('image/'):
-            logger.warning(f"URL content-type not image ({content_type}): {url}")
-            return None, None
-        image_data: io.BytesIO = io.BytesIO(response.content)
-        if image_data.getbuffer().nbytes == 0:
-            logger.warning(f"Downloaded image is empty: {url}")
+    cached_validation: Optional[Dict[str, Any]] = IMAGE_VALIDATION_CACHE.get(url)
+    if cached_validation:
+        if cached_validation.get('status') == 'bad':
+            logger.debug(f"Image validation cache: known-bad URL ({cached_validation.get('reason')}), skipping: {url}")
             return None, None
-        
-        img_pil: Any = Image.open(image_data) if Image else None 
+        if probe_only and cached_validation.get('width') and cached_validation.get('height'):
+            logger.debug(f"Image validation cache: known-good URL ({cached_validation['width']}x{cached_validation['height']}): {url}")
+            return (cached_validation['width'], cached_validation['height']), url
+    if not PIL_AVAILABLE and not probe_only:
+        logger.warning("Pillow not available. Image dimension validation limited to header probing. Returning raw content if download succeeds.")
+    content_type: str = ''
+    try:
+        headers: Dict[str, str] = {'User-Agent': f'DacoolaImageScraper/1.1 (+{WEBSITE_URL_FOR_AGENT})'}
+        with http_get(url, timeout=IMAGE_DOWNLOAD_TIMEOUT, headers=headers, stream=True) as response:
+            response.raise_for_status()
+            content_type = response.headers.get('content-type', '').lower()
+            if PIL_AVAILABLE and not content_type.startswith('image/'):
+                logger.warning(f"URL content-type not image ({content_type}): {url}")
+                _remember_image_validation(url, False, reason='not_image_content_type', content_type=content_type)
+                return None, None
+            declared_length: str = response.headers.get('content-length', '')
+            if declared_length.isdigit() and int(declared_length) > IMAGE_MAX_BYTES:
+                logger.warning(f"Image too large ({declared_length} bytes > {IMAGE_MAX_BYTES}) at {url}. Skipping.")
+                _remember_image_validation(url, False, reason='too_large', content_type=content_type, byte_size=int(declared_length))
+                return None, None
+
+            body_chunks: Iterator[bytes] = response.iter_content(chunk_size=IMAGE_STREAM_CHUNK_SIZE)
+            image_bytes: bytearray = bytearray()
+            probed_size: Optional[Tuple[str, int, int]] = None
+            for chunk in body_chunks:
+                image_bytes.extend(chunk)
+                probed_size = probe_image_size(bytes(image_bytes))
+                if probed_size or len(image_bytes) >= IMAGE_PROBE_MAX_BYTES:
+                    break
+                if len(image_bytes) >= 32 and not sniff_image_format(bytes(image_bytes[:32])):
+                    break # Unknown format: nothing more to learn from the header
+            if not image_bytes:
+                logger.warning(f"Downloaded image is empty: {url}")
+                _remember_image_validation(url, False, reason='empty_body', content_type=content_type)
+                return None, None
+            if looks_like_markup(bytes(image_bytes)):
+                logger.warning(f"Image URL returned a markup/JSON body instead of an image: {url}")
+                _remember_image_validation(url, False, reason='markup_body', content_type=content_type)
+                return None, None
+            if probed_size:
+                _, probed_width, probed_height = probed_size
+                if probed_width < MIN_IMAGE_WIDTH or probed_height < MIN_IMAGE_HEIGHT:
+                    logger.warning(f"Image too small ({probed_width}x{probed_height}) from {url}. Min: {MIN_IMAGE_WIDTH}x{MIN_IMAGE_HEIGHT}.")
+                    _remember_image_validation(url, False, reason='too_small', width=probed_width, height=probed_height, content_type=content_type)
+                    return None, None
+                if probe_only:
+                    logger.debug(f"Validated image header without full download: {url} (Size: {probed_width}x{probed_height}, read {len(image_bytes)} bytes)")
+                    _remember_image_validation(url, True, width=probed_width, height=probed_height, content_type=content_type,
+                                               byte_size=int(declared_length) if declared_length.isdigit() else None)
+                    return (probed_width, probed_height), url
+
+            # Full download: needed for pixels (CLIP) or for formats the header probe does not understand.
+            for chunk in body_chunks:
+                image_bytes.extend(chunk)
+                if len(image_bytes) > IMAGE_MAX_BYTES:
+                    logger.warning(f"Image exceeded {IMAGE_MAX_BYTES} bytes while downloading {url}. Aborting.")
+                    _remember_image_validation(url, False, reason='too_large', content_type=content_type)
+                    return None, None
+
+        content_hash: str = hashlib.sha256(image_bytes).hexdigest()
+        if not PIL_AVAILABLE:
+            return bytes(image_bytes), url
+        img_pil: Any = Image.open(io.BytesIO(image_bytes)) if Image else None 
         if not img_pil: 
             logger.error(f"Image.open failed for {url} despite PIL_AVAILABLE being True (or Image module is None).")
             return None, None
             
         if img_pil.width < MIN_IMAGE_WIDTH or img_pil.height < MIN_IMAGE_HEIGHT:
             logger.warning(f"Image too small ({img_pil.width}x{img_pil.height}) from {url}. Min: {MIN_IMAGE_WIDTH}x{MIN_IMAGE_HEIGHT}.")
+            _remember_image_validation(url, False, reason='too_small', width=img_pil.width, height=img_pil.height,
+                                       content_type=content_type, byte_size=len(image_bytes), content_hash=content_hash)
             return None, None
+        _remember_image_validation(url, True, width=img_pil.width, height=img_pil.height, content_type=content_type,
+                                   byte_size=len(image_bytes), content_hash=content_hash)
+        if probe_only:
+            return (img_pil.width, img_pil.height), url
         if img_pil.mode != 'RGB':
             img_pil = img_pil.convert('RGB')
         logger.debug(f"Successfully downloaded and validated image: {url} (Size: {img_pil.size})")
         return img_pil, url
     except requests.exceptions.Timeout:
-        logger.warning(f"Timeout downloading image (attempt {attempt}): {url}")
-        if attempt < IMAGE_DOWNLOAD_RETRIES:
-            logger.info(f"Retrying download for {url} in {IMAGE_RETRY_DELAY}s...")
-            time.sleep(IMAGE_RETRY_DELAY)
-            return _download_image(url, attempt + 1)
+        logger.warning(f"Timeout downloading image (after the session's retries): {url}")
         return None, None
     except requests.exceptions.RequestException as e:
         logger.warning(f"Failed to download image {url}: {e}")
-        return None, None
-    except UnidentifiedImageError: 
-        logger.warning(f"Could not identify image file (Invalid format?) from: {url}")
+        status_code: Optional[int] = getattr(getattr(e, 'response', None), 'status_code', None)
+        if status_code and 400 <= status_code < 500 and status_code not in (408, 429):
+            _remember_image_validation(url, False, reason=f'http_{status_code}')
         return None, None
     except Exception as e:
-        logger.warning(f"Error processing image {url}: {e}")
+        if UnidentifiedImageError and isinstance(e, UnidentifiedImageError):
+            logger.warning(f"Could not identify image file (Invalid format?) from: {url}")
+            _remember_image_validation(url, False, reason='unidentified_image', content_type=content_type)
+        else:
+            logger.warning(f"Error processing image {url}: {e}")
         return None, None
 
+def _download_candidate_images(candidate_urls: List[str], min_images: int = CLIP_MIN_IMAGES_TO_SCORE) -> List[Tuple[Any, str]]:
+    """
+    Downloads candidate images concurrently under one overall deadline (CLIP_DOWNLOAD_DEADLINE_SECONDS).
+    Stops waiting as soon as `min_images` good images are in, so a stalled host no longer holds up
+    the article; downloads that have not started are cancelled and stragglers finish in the background.
+    Returns (image, url) pairs in the original candidate order.
+    """
+    if not candidate_urls: return []
+    started_at: float = time.monotonic()
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, min(CLIP_DOWNLOAD_WORKERS, len(candidate_urls))), thread_name_prefix='clip-img')
+    collected: List[Tuple[int, Any, str]] = []
+    try:
+        future_to_index: Dict[Future, int] = {executor.submit(_download_image, url): i for i, url in enumerate(candidate_urls)}
+        pending: Set[Future] = set(future_to_index)
+        while pending and len(collected) < min_images:
+            remaining: float = CLIP_DOWNLOAD_DEADLINE_SECONDS - (time.monotonic() - started_at)
+            if remaining <= 0:
+                logger.warning(f"Candidate image download deadline ({CLIP_DOWNLOAD_DEADLINE_SECONDS}s) reached with {len(pending)} still pending. Proceeding with {len(collected)} image(s).")
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    pil_image_or_bytes, validated_url = future.result()
+                except Exception as e:
+                    logger.debug(f"Candidate image download raised: {e}")
+                    continue
+                if pil_image_or_bytes and validated_url:
+                    collected.append((future_to_index[future], pil_image_or_bytes, validated_url))
+                else: logger.debug(f"Skipping image for CLIP (download/validation failed): {candidate_urls[future_to_index[future]]}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    collected.sort(key=lambda item: item[0])
+    logger.debug(f"Collected {len(collected)}/{len(candidate_urls)} candidate images in {time.monotonic() - started_at:.2f}s.")
+    return [(image, url) for _, image, url in collected]
+
+def _known_image_content_hash(url: str) -> Optional[str]:
+    """Returns the sha256 of the image bytes last downloaded from `url`, if it is known and still valid."""
+    cached_validation: Optional[Dict[str, Any]] = IMAGE_VALIDATION_CACHE.peek(url)
+    if cached_validation and cached_validation.get('status') == 'ok':
+        return cached_validation.get('content_hash')
+    return None
+
+def _get_clip_prompt_embedding(text_prompt: str) -> Any:
+    prompt_key: str = hashlib.sha256(text_prompt.strip().encode('utf-8')).hexdigest()
+    if CLIP_PROMPT_EMBEDDINGS is not None:
+        cached_vector: Optional[Any] = CLIP_PROMPT_EMBEDDINGS.get(prompt_key)
+        if cached_vector is not None:
+            clip_embedding_stats['prompt_hits'] += 1
+            return cached_vector
+    text_embedding: Any = _get_clip_model().encode([text_prompt], convert_to_numpy=True, show_progress_bar=False)[0]
+    clip_embedding_stats['prompt_encoded'] += 1
+    if CLIP_PROMPT_EMBEDDINGS is not None:
+        try: CLIP_PROMPT_EMBEDDINGS.add(prompt_key, text_embedding)
+        except Exception as e: logger.warning(f"Could not store CLIP prompt embedding: {e}")
+    return text_embedding
+
+def _get_clip_image_embeddings(candidate_urls: List[str]) -> Tuple[List[str], List[Any]]:
+    """
+    Returns (urls, embeddings) for the candidates that could be embedded, in candidate order.
+    Candidates whose bytes were seen before (content hash in IMAGE_VALIDATION_CACHE with a stored embedding)
+    are neither downloaded nor encoded again; only new images go through the CLIP model, in one batch.
+    Cached candidates are scored in addition to, not instead of, the usual CLIP_MIN_IMAGES_TO_SCORE new
+    downloads, so previously seen (often stock) images cannot crowd out the top-ranked fresh results.
+    """
+    vectors_by_url: Dict[str, Any] = {}
+    if CLIP_IMAGE_EMBEDDINGS is not None:
+        known_hashes: Dict[str, str] = {url: content_hash for url in candidate_urls if (content_hash := _known_image_content_hash(url))}
+        stored_vectors: Dict[str, Any] = CLIP_IMAGE_EMBEDDINGS.get_many(set(known_hashes.values()))
+        vectors_by_url = {url: stored_vectors[content_hash] for url, content_hash in known_hashes.items() if content_hash in stored_vectors}
+        clip_embedding_stats['downloads_skipped'] += len(vectors_by_url)
+
+    urls_to_download: List[str] = [url for url in candidate_urls if url not in vectors_by_url] # Still in search-rank order
+    images_to_encode: List[Any] = []
+    hashes_to_encode: List[Optional[str]] = []
+    urls_to_encode: List[str] = []
+    if urls_to_download:
+        for pil_image_or_bytes, validated_url in _download_candidate_images(urls_to_download):
+            if not (Image and isinstance(pil_image_or_bytes, Image.Image)):
+                logger.debug(f"Downloaded content for {validated_url} is not a PIL Image. Skipping for CLIP.")
+                continue
+            content_hash: Optional[str] = _known_image_content_hash(validated_url)
+            cached_vector: Optional[Any] = CLIP_IMAGE_EMBEDDINGS.get(content_hash) if (CLIP_IMAGE_EMBEDDINGS is not None and content_hash) else None
+            if cached_vector is not None: # Same bytes already embedded under another URL
+                vectors_by_url[validated_url] = cached_vector
+                continue
+            images_to_encode.append(pil_image_or_bytes)
+            hashes_to_encode.append(content_hash)
+            urls_to_encode.append(validated_url)
+    clip_embedding_stats['image_hits'] += len(vectors_by_url)
+
+    if images_to_encode:
+        logger.debug(f"Encoding {len(images_to_encode)} new image(s) with CLIP ({len(vectors_by_url)} from cache)...")
+        new_embeddings: Any = _get_clip_model().encode(images_to_encode, batch_size=8, convert_to_numpy=True, show_progress_bar=False)
+        clip_embedding_stats['image_encoded'] += len(images_to_encode)
+        to_store: Dict[str, Any] = {}
+        for url, content_hash, embedding in zip(urls_to_encode, hashes_to_encode, new_embeddings):
+            vectors_by_url[url] = embedding
+            if content_hash: to_store[content_hash] = embedding
+        if CLIP_IMAGE_EMBEDDINGS is not None and to_store:
+            try: CLIP_IMAGE_EMBEDDINGS.add_many(list(to_store.items()))
+            except Exception as e: logger.warning(f"Could not store CLIP image embeddings: {e}")
+
+    ordered_urls: List[str] = [url for url in candidate_urls if url in vectors_by_url]
+    return ordered_urls, [vectors_by_url[url] for url in ordered_urls]
+
 def _filter_images_with_clip(image_results_candidates: List[Dict[str, str]], text_prompt: str) -> Optional[str]:
     if not image_results_candidates: return None
-    if not ENABLE_CLIP_FILTERING or not _load_sentence_model_clip() or not CLIP_MODEL_INSTANCE or not st_cos_sim:
+    if not ENABLE_CLIP_FILTERING or not _load_sentence_model_clip():
         logger.debug("CLIP filtering skipped or model/library unavailable. Returning first downloadable candidate.")
         for img_data_fallback in image_results_candidates:
             url_fallback = img_data_fallback.get('url')
             if url_fallback:
-                _, validated_url_fallback = _download_image(url_fallback)
+                _, validated_url_fallback = _download_image(url_fallback, probe_only=True)
                 if validated_url_fallback: return validated_url_fallback
         return None
 
     logger.info(f"CLIP filtering {len(image_results_candidates)} candidates for prompt: '{text_prompt}'")
-    image_objects_for_clip: List[Any] = [] 
+    candidate_urls: List[str] = [img_data['url'] for img_data in image_results_candidates if img_data.get('url')]
     valid_original_urls: List[str] = []
-    for img_data in image_results_candidates:
-        url: Optional[str] = img_data.get('url')
-        if url:
-            pil_image_or_bytes, validated_url = _download_image(url)
-            if pil_image_or_bytes and validated_url:
-                if PIL_AVAILABLE and Image and isinstance(pil_image_or_bytes, Image.Image): 
-                    image_objects_for_clip.append(pil_image_or_bytes)
-                    valid_original_urls.append(validated_url)
-                elif not PIL_AVAILABLE: 
-                    logger.warning(f"CLIP filtering attempted but PIL is not available. Cannot process image {validated_url} for CLIP.")
-                else:
-                    logger.debug(f"Downloaded content for {validated_url} is not a PIL Image. Skipping for CLIP.")
-            else: logger.debug(f"Skipping image for CLIP (download/validation failed): {url}")
-
-    if not image_objects_for_clip:
-        logger.warning("No images suitable for CLIP analysis after download/validation. Returning first valid candidate from original list if any.")
-        for img_data_fallback_post_dl in image_results_candidates:
-            url_fallback_post_dl = img_data_fallback_post_dl.get('url')
-            if url_fallback_post_dl:
-                 _, validated_url_fb_post_dl = _download_image(url_fallback_post_dl)
-                 if validated_url_fb_post_dl: return validated_url_fb_post_dl
-        return None
-
     try:
-        logger.debug(f"Encoding {len(image_objects_for_clip)} images and text prompt with CLIP...")
-        image_embeddings: Any = CLIP_MODEL_INSTANCE.encode(image_objects_for_clip, batch_size=8, convert_to_tensor=True, show_progress_bar=False)
-        text_embedding: Any = CLIP_MODEL_INSTANCE.encode([text_prompt], convert_to_tensor=True, show_progress_bar=False)
-        similarities: Any = st_cos_sim(text_embedding, image_embeddings) 
-        scored_images: List[Dict[str, Any]] = [{'score': score.item(), 'url': valid_original_urls[i]} for i, score in enumerate(similarities)]
+        valid_original_urls, image_embeddings = _get_clip_image_embeddings(candidate_urls)
+        if not valid_original_urls:
+            logger.warning("No images suitable for CLIP analysis after download/validation. Returning first valid candidate from original list if any.")
+            for img_data_fallback_post_dl in image_results_candidates:
+                url_fallback_post_dl = img_data_fallback_post_dl.get('url')
+                if url_fallback_post_dl:
+                     _, validated_url_fb_post_dl = _download_image(url_fallback_post_dl, probe_only=True)
+                     if validated_url_fb_post_dl: return validated_url_fb_post_dl
+            return None
+
+        text_embedding: Any = np.asarray(_get_clip_prompt_embedding(text_prompt), dtype=np.float32)
+        image_matrix: Any = np.asarray(image_embeddings, dtype=np.float32)
+        norms: Any = np.linalg.norm(image_matrix, axis=1) * np.linalg.norm(text_embedding)
+        similarities: Any = (image_matrix @ text_embedding) / np.where(norms == 0, 1.0, norms)
+        scored_images: List[Dict[str, Any]] = [{'score': float(score), 'url': valid_original_urls[i]} for i, score in enumerate(similarities)]
         scored_images.sort(key=lambda x: x['score'], reverse=True)
         for i, item in enumerate(scored_images[:3]): logger.debug(f"CLIP Candidate {i+1}: {item['url']}, Score: {item['score']:.4f}")
         best_above_threshold: Optional[Dict[str, Any]] = next((item for item in scored_images if item['score'] >= MIN_CLIP_SCORE), None)
@@ -429,64 +699,210 @@ def _filter_images_with_clip(image_results_candidates: List[Dict[str, str]], tex
         logger.exception(f"Exception during CLIP processing: {e}. Falling back to first valid original URL if available.")
         return valid_original_urls[0] if valid_original_urls else None # Fixed potential list out of bounds if valid_original_urls is empty
 
+def clear_article_page_cache() -> None:
+    with _ARTICLE_PAGE_CACHE_LOCK:
+        _ARTICLE_PAGE_CACHE.clear()
+
+_CHARSET_IN_CONTENT_TYPE_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_CHARSET_IN_META_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+_HEAD_END_RE = re.compile(rb'</head\s*>|<body[\s>]', re.IGNORECASE)
+
+def _looks_like_html(first_bytes: bytes) -> bool:
+    """Sniffs a body whose content-type is missing or generic: HTML markup, not a binary or an image."""
+    if b'\x00' in first_bytes[:1024] or sniff_image_format(first_bytes): return False
+    sample: bytes = first_bytes[:1024].lstrip(b'\xef\xbb\xbf \t\r\n').lower()
+    return sample.startswith((b'<!doctype html', b'<html', b'<head', b'<!--')) or b'<html' in sample
+
+def _detect_html_encoding(content_type: str, first_bytes: bytes) -> str:
+    """Charset from the Content-Type header, then a BOM, then a <meta charset>/http-equiv tag near the top; UTF-8 otherwise."""
+    header_match: Optional[re.Match] = _CHARSET_IN_CONTENT_TYPE_RE.search(content_type)
+    if header_match: return header_match.group(1).lower()
+    if first_bytes.startswith(b'\xef\xbb\xbf'): return 'utf-8-sig'
+    if first_bytes.startswith((b'\xff\xfe', b'\xfe\xff')): return 'utf-16'
+    meta_match: Optional[re.Match] = _CHARSET_IN_META_RE.search(first_bytes[:4096])
+    if meta_match: return meta_match.group(1).decode('ascii', 'ignore').lower()
+    return 'utf-8'
+
+def _decode_html(content: bytes, encoding: str) -> str:
+    try:
+        return content.decode(encoding, errors='replace')
+    except LookupError:
+        return content.decode('utf-8', errors='replace')
+
+def _extract_head_bytes(page: Dict[str, Any]) -> bytes:
+    """The document up to </head> (or the opening <body>), for meta-tag lookups without parsing the whole page."""
+    head_bytes: bytes = page['content'][:ARTICLE_HEAD_MAX_BYTES]
+    head_end: Optional[re.Match] = _HEAD_END_RE.search(head_bytes)
+    if head_end: head_bytes = head_bytes[:head_end.start()]
+    return head_bytes
+
+def _fetch_article_page(article_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the cached page for article_url, fetching it on first use.
+    Failed fetches are cached too, so a page that could not be downloaded for text is not retried for its image.
+
+    The body is streamed: non-HTML responses (by content-type, or by sniffing the first bytes when the type is
+    missing/generic) are dropped after the first chunk, and at most ARTICLE_MAX_BYTES are read from any page.
+    """
+    with _ARTICLE_PAGE_CACHE_LOCK:
+        cached_page: Optional[Dict[str, Any]] = _ARTICLE_PAGE_CACHE.get(article_url)
+    if cached_page is not None:
+        logger.debug(f"Article page cache hit: {article_url}")
+        return cached_page if not cached_page.get('error') else None
+    page: Dict[str, Any] = {'url': article_url, 'final_url': article_url, 'status': None, 'headers': {}, 'content': b'', 'text': '',
+                            'encoding': 'utf-8', 'truncated': False, 'is_html': False, 'error': None, 'soup': None,
+                            'tree': None, 'tree_parsed': False, 'meta_image_url': None, 'meta_image_checked': False,
+                            'canonical_url': None, 'extraction_key': None}
+    try:
+        with http_get(article_url, headers=ARTICLE_REQUEST_HEADERS, timeout=ARTICLE_FETCH_TIMEOUT, allow_redirects=True, stream=True) as response:
+            response.raise_for_status()
+            page['final_url'] = response.url or article_url
+            page['status'] = response.status_code
+            page['headers'] = {k.lower(): v for k, v in response.headers.items()}
+            content_type: str = page['headers'].get('content-type', '').lower()
+            declared_html: bool = any(html_type in content_type for html_type in ARTICLE_HTML_CONTENT_TYPES)
+            generic_type: bool = not content_type or content_type.startswith(('text/plain', 'application/octet-stream'))
+            if declared_html or generic_type:
+                body: bytearray = bytearray()
+                for chunk in response.iter_content(chunk_size=ARTICLE_STREAM_CHUNK_SIZE):
+                    if not body and not declared_html and not _looks_like_html(chunk):
+                        logger.warning(f"Body of {article_url} ({content_type or 'no content-type'}) does not look like HTML. Skipping.")
+                        break
+                    body.extend(chunk)
+                    if len(body) >= ARTICLE_MAX_BYTES:
+                        page['truncated'] = True
+                        logger.warning(f"Article page {article_url} exceeds {ARTICLE_MAX_BYTES} bytes. Using the first {ARTICLE_MAX_BYTES} bytes.")
+                        break
+                if body:
+                    page['is_html'] = True
+                    page['content'] = bytes(body[:ARTICLE_MAX_BYTES])
+                    page['encoding'] = _detect_html_encoding(content_type, page['content'][:4096])
+                    page['text'] = _decode_html(page['content'], page['encoding'])
+    except requests.exceptions.RequestException as e:
+        logger.warning(f"Failed to fetch article page {article_url}: {e}")
+        page['error'] = str(e)
+    with _ARTICLE_PAGE_CACHE_LOCK:
+        _ARTICLE_PAGE_CACHE[article_url] = page
+        if page['final_url'] != article_url:
+            _ARTICLE_PAGE_CACHE.setdefault(page['final_url'], page)
+    return page if not page['error'] else None
+
+def _extract_meta_image_url(soup: Any, page_url: str) -> Optional[str]:
+    meta_selectors: List[Dict[str, str]] = [
+        {'property': 'og:image'}, {'property': 'og:image:secure_url'},
+        {'name': 'twitter:image'}, {'name': 'twitter:image:src'},
+        {'itemprop': 'image'}
+    ]
+    for selector in meta_selectors:
+        tag: Optional[Any] = soup.find('meta', attrs=selector)
+        if tag and tag.get('content'):
+            image_src_candidate = str(tag['content'])
+            if image_src_candidate.startswith('//'): image_src_candidate = "https:" + image_src_candidate
+            if not image_src_candidate.startswith('http'): image_src_candidate = urljoin(page_url, image_src_candidate)
+            if image_src_candidate.startswith('http'):
+                logger.info(f"Found meta image ({selector}): {image_src_candidate}")
+                return image_src_candidate
+    return None
+
+def _get_page_tree(page: Dict[str, Any]) -> Optional[Any]:
+    """Parses a cached page's full document with lxml once; the tree is shared by trafilatura, the selector fallback and meta lookups."""
+    if not page['tree_parsed'] and LXML_AVAILABLE and page['is_html']:
+        page['tree'] = parse_html_document(page['content'], page['encoding'])
+        page['tree_parsed'] = True
+    return page['tree']
+
+def _get_page_soup(page: Dict[str, Any]) -> Optional[Any]:
+    """Parses a cached page's full document once (BeautifulSoup text fallback, used when lxml is unavailable)."""
+    if page['soup'] is None and BeautifulSoup and page['is_html']:
+        page['soup'] = BeautifulSoup(page['text'], 'html.parser')
+    return page['soup']
+
+def _get_page_meta_image(page: Dict[str, Any]) -> Optional[str]:
+    """og:image / twitter:image of a cached page, read from the shared tree if already parsed, else from a parse of its <head> only."""
+    if not page['meta_image_checked'] and page['is_html']:
+        if LXML_AVAILABLE:
+            tree: Optional[Any] = page['tree'] if page['tree_parsed'] else parse_html_document(_extract_head_bytes(page), page['encoding'])
+            page['meta_image_url'] = extract_meta_image_url(tree, page['final_url'])
+        elif BeautifulSoup:
+            head_soup: Any = BeautifulSoup(_decode_html(_extract_head_bytes(page), page['encoding']), 'html.parser')
+            page['meta_image_url'] = _extract_meta_image_url(head_soup, page['final_url'])
+        page['meta_image_checked'] = True
+    return page['meta_image_url']
+
 def _scrape_source_for_image(article_url: str) -> Optional[str]:
-    if not BS4_AVAILABLE: logger.warning("BeautifulSoup not available. Skipping source image scraping."); return None
+    if not LXML_AVAILABLE and not BS4_AVAILABLE: logger.warning("Neither lxml nor BeautifulSoup available. Skipping source image scraping."); return None
     if not article_url or not article_url.startswith('http'): logger.debug(f"Invalid article URL for scraping: {article_url}"); return None
     logger.info(f"Attempting to scrape meta image tag from source: {article_url}")
     try:
-        headers: Dict[str, str] = {
-            'User-Agent': f'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 DacoolaNewsBot/1.0 (+{WEBSITE_URL_FOR_AGENT})',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9'
-        }
-        response: requests.Response = requests.get(article_url, headers=headers, timeout=15, allow_redirects=True)
-        response.raise_for_status()
-        if 'html' not in response.headers.get('content-type', '').lower():
+        page: Optional[Dict[str, Any]] = _fetch_article_page(article_url)
+        if not page: return None
+        if not page['is_html']:
             logger.warning(f"Source URL content type not HTML: {article_url}"); return None
-        soup: Any = BeautifulSoup(response.content, 'html.parser') if BeautifulSoup else None
-        if not soup: return None 
-        meta_selectors: List[Dict[str, str]] = [
-            {'property': 'og:image'}, {'property': 'og:image:secure_url'},
-            {'name': 'twitter:image'}, {'name': 'twitter:image:src'},
-            {'itemprop': 'image'}
-        ]
-        for selector in meta_selectors:
-            tag: Optional[Any] = soup.find('meta', attrs=selector)
-            if tag and tag.get('content'):
-                image_src_candidate = str(tag['content'])
-                if image_src_candidate.startswith('//'): image_src_candidate = "https:" + image_src_candidate
-                if not image_src_candidate.startswith('http'): image_src_candidate = urljoin(article_url, image_src_candidate)
-                if image_src_candidate.startswith('http'):
-                    logger.info(f"Found meta image ({selector}): {image_src_candidate}")
-                    return image_src_candidate
+        meta_image_url: Optional[str] = _get_page_meta_image(page)
+        if meta_image_url:
+            return meta_image_url
         logger.warning(f"No suitable image meta tag found at: {article_url}")
         return None
-    except requests.exceptions.RequestException as e:
-        logger.warning(f"Failed to fetch/scrape source {article_url}: {e}"); return None
     except Exception as e:
         logger.exception(f"Error scraping source image from {article_url}: {e}"); return None
 
-def _search_images_serpapi(query: str, num_results: int = 7) -> Optional[List[Dict[str, str]]]:
+def _normalize_image_search_query(query: str) -> str:
+    """Cache key for a search query: NFKC, case-folded, punctuation dropped, whitespace collapsed."""
+    normalized: str = unicodedata.normalize('NFKC', query).casefold()
+    normalized = re.sub(r"[^\w\s]", ' ', normalized)
+    return ' '.join(normalized.split())
+
+def _serpapi_images_backend(query: str) -> Optional[List[Dict[str, Any]]]:
+    """Live SerpApi Google Images search. Returns the raw images_results list ([] if none), or None on error."""
     if not SERPAPI_AVAILABLE: logger.error("SerpApi client (google-search-results) not available. Cannot perform image search."); return None
     if not SERPAPI_API_KEY: logger.error("SERPAPI_API_KEY not found. Cannot perform image search."); return None
     params: Dict[str, Any] = IMAGE_SEARCH_PARAMS.copy()
     params['q'] = query
     params['api_key'] = SERPAPI_API_KEY
-    try:
-        logger.debug(f"Sending SerpApi request: '{query}'")
-        search: Any = GoogleSearch(params) if GoogleSearch else None 
-        if not search: return None 
-        results: Dict[str, Any] = search.get_dict()
-        if 'error' in results: logger.error(f"SerpApi error for '{query}': {results['error']}"); return None
-        if results.get('images_results'):
-            image_data: List[Dict[str, str]] = [{"url": img.get("original"), "title": img.get("title"), "source": img.get("source")}
-                                                for img in results['images_results'][:num_results] if img.get("original")]
-            if not image_data: logger.warning(f"SerpApi: No results with 'original' URL for '{query}'"); return []
-            logger.info(f"SerpApi found {len(image_data)} image candidates for '{query}'")
-            return image_data
-        logger.warning(f"No image results via SerpApi for '{query}'"); return []
-    except Exception as e:
-        logger.exception(f"SerpApi image search exception for '{query}': {e}"); return None
+    logger.debug(f"Sending SerpApi request: '{query}'")
+    search: Any = GoogleSearch(params) if GoogleSearch else None 
+    if not search: return None 
+    results: Dict[str, Any] = search.get_dict()
+    if 'error' in results:
+        if "hasn't returned any results" in str(results['error']): return []
+        logger.error(f"SerpApi error for '{query}': {results['error']}"); return None
+    return results.get('images_results') or []
+
+def _recorded_images_backend(query: str) -> Optional[List[Dict[str, Any]]]:
+    """Offline stand-in: serves results previously saved with IMAGE_SEARCH_RECORD_RESULTS=true. Unknown queries return []."""
+    recorded_results: Optional[List[Dict[str, Any]]] = IMAGE_SEARCH_RECORDINGS.peek(_normalize_image_search_query(query))
+    if recorded_results is None: logger.debug(f"No recorded image results for '{query}'.")
+    return recorded_results or []
+
+IMAGE_SEARCH_BACKENDS: Dict[str, Any] = {'serpapi': _serpapi_images_backend, 'recorded': _recorded_images_backend}
+
+def _search_images_serpapi(query: str, num_results: int = 7) -> Optional[List[Dict[str, str]]]:
+    backend: Optional[Any] = IMAGE_SEARCH_BACKENDS.get(IMAGE_SEARCH_BACKEND)
+    if not backend: logger.error(f"Unknown IMAGE_SEARCH_BACKEND '{IMAGE_SEARCH_BACKEND}'. Expected one of: {', '.join(IMAGE_SEARCH_BACKENDS)}."); return None
+    cache_key: str = _normalize_image_search_query(query)
+    use_cache: bool = IMAGE_SEARCH_BACKEND != 'recorded' # The stand-in is local already; keep its results out of the live cache
+    images_results: Optional[List[Dict[str, Any]]] = IMAGE_SEARCH_CACHE.get(cache_key) if use_cache else None
+    if images_results is not None:
+        logger.debug(f"Image search cache hit for '{query}' ({len(images_results)} results).")
+    else:
+        try:
+            images_results = backend(query)
+        except Exception as e:
+            logger.exception(f"Image search exception for '{query}' ({IMAGE_SEARCH_BACKEND}): {e}"); return None
+        if images_results is None: return None
+        images_results = [{'original': img.get('original'), 'title': img.get('title'), 'source': img.get('source')}
+                          for img in images_results[:IMAGE_SEARCH_MAX_STORED_RESULTS] if isinstance(img, dict)]
+        if use_cache:
+            IMAGE_SEARCH_CACHE.set(cache_key, images_results, ttl_seconds=(IMAGE_SEARCH_CACHE_TTL_HOURS if images_results else IMAGE_SEARCH_CACHE_EMPTY_TTL_HOURS) * 3600)
+        if IMAGE_SEARCH_RECORD_RESULTS and IMAGE_SEARCH_BACKEND != 'recorded':
+            IMAGE_SEARCH_RECORDINGS.set(cache_key, images_results)
+    if images_results:
+        image_data: List[Dict[str, str]] = [{"url": img.get("original"), "title": img.get("title"), "source": img.get("source")}
+                                            for img in images_results[:num_results] if img.get("original")]
+        if not image_data: logger.warning(f"Image search: No results with 'original' URL for '{query}'"); return []
+        logger.info(f"Image search ({IMAGE_SEARCH_BACKEND}) found {len(image_data)} image candidates for '{query}'")
+        return image_data
+    logger.warning(f"No image results via {IMAGE_SEARCH_BACKEND} for '{query}'"); return []
 
 def _find_best_image(search_query: str, article_url_for_scrape: Optional[str] = None) -> Optional[str]:
     if not search_query: logger.error("Cannot find image: search_query is empty."); return None
@@ -494,7 +910,7 @@ def _find_best_image(search_query: str, article_url_for_scrape: Optional[str] =
     if article_url_for_scrape:
         scraped_image_url: Optional[str] = _scrape_source_for_image(article_url_for_scrape)
         if scraped_image_url:
-            img_obj, validated_url = _download_image(scraped_image_url)
+            img_obj, validated_url = _download_image(scraped_image_url, probe_only=True)
             if img_obj and validated_url:
                 logger.info(f"Using valid image directly scraped from source: {validated_url}")
                 return validated_url
@@ -503,7 +919,7 @@ def _find_best_image(search_query: str, article_url_for_scrape: Optional[str] =
     if not serpapi_results: logger.error(f"SerpApi returned no image results for '{search_query}'. Cannot find image."); return None
     best_image_url: Optional[str] = None
     if ENABLE_CLIP_FILTERING: # Relies on _load_sentence_model_clip and PIL_AVAILABLE being true
-        if _load_sentence_model_clip() and CLIP_MODEL_INSTANCE:
+        if _load_sentence_model_clip():
             best_image_url = _filter_images_with_clip(serpapi_results, search_query)
         else:
             logger.debug("CLIP model loading failed or instance not available. Falling back to first valid SerpApi result.")
@@ -511,7 +927,7 @@ def _find_best_image(search_query: str, article_url_for_scrape: Optional[str] =
             for res in serpapi_results:
                 url: Optional[str] = res.get('url')
                 if url:
-                    img_obj_fb, validated_url_fb = _download_image(url)
+                    img_obj_fb, validated_url_fb = _download_image(url, probe_only=True)
                     if img_obj_fb and validated_url_fb:
                         best_image_url = validated_url_fb
                         logger.info(f"Using first valid SerpApi result (CLIP model load failed): {best_image_url}")
@@ -521,7 +937,7 @@ def _find_best_image(search_query: str, article_url_for_scrape: Optional[str] =
         for res in serpapi_results:
             url = res.get('url')
             if url:
-                img_obj, validated_url = _download_image(url)
+                img_obj, validated_url = _download_image(url, probe_only=True)
                 if img_obj and validated_url:
                     best_image_url = validated_url
                     logger.info(f"Using first valid SerpApi result (CLIP disabled): {best_image_url}")
@@ -531,7 +947,8 @@ def _find_best_image(search_query: str, article_url_for_scrape: Optional[str] =
     else: logger.error(f"Could not determine a best image URL for '{search_query}' after all steps.")
     return best_image_url
 
-def _fetch_full_article_text_with_trafilatura(downloaded_html: str, article_url: str) -> Optional[str]:
+def _fetch_full_article_text_with_trafilatura(downloaded_html: Union[str, Any], article_url: str) -> Optional[str]:
+    """downloaded_html is the page text or a parsed lxml tree; trafilatura prunes trees in place, so pass it a copy."""
     if not TRAFILATURA_AVAILABLE: logger.debug(f"Trafilatura not available for {article_url}."); return None
     try:
         extracted_text: Optional[str] = trafilatura.extract(downloaded_html, # type: ignore
@@ -547,10 +964,24 @@ def _fetch_full_article_text_with_trafilatura(downloaded_html: str, article_url:
         logger.warning(f"Trafilatura extraction failed for {article_url}: {e}")
         return None
 
-def _fetch_full_article_text_bs_fallback(downloaded_html: str, article_url: str) -> Optional[str]:
+def _fetch_full_article_text_lxml_fallback(tree: Any, article_url: str) -> Optional[str]:
+    """Selector strategy (then long body paragraphs) over the shared lxml tree, in a single walk."""
+    try:
+        content_text, strategy = extract_main_text(tree, MIN_FULL_TEXT_LENGTH)
+        if content_text:
+            logger.info(f"Successfully extracted text with lxml fallback ({strategy}) from {article_url} (Length: {len(content_text)})")
+            return content_text
+        logger.warning(f"lxml fallback could not extract substantial content from {article_url}.")
+        return None
+    except Exception as e:
+        logger.error(f"Error extracting full article with lxml fallback from {article_url}: {e}")
+        return None
+
+def _fetch_full_article_text_bs_fallback(downloaded_html: str, article_url: str, soup: Optional[Any] = None) -> Optional[str]:
     if not BS4_AVAILABLE: logger.warning(f"BeautifulSoup not available for {article_url}."); return None
     try:
-        soup: Any = BeautifulSoup(downloaded_html, 'html.parser') if BeautifulSoup else None 
+        if soup is None:
+            soup = BeautifulSoup(downloaded_html, 'html.parser') if BeautifulSoup else None 
         if not soup: return None 
         tags_to_remove: List[str] = ['script', 'style', 'nav', 'footer', 'aside', 'header', 'form', 'button', 'input',
                           '.related-posts', '.comments', '.sidebar', '.ad', '.banner', '.share-buttons',
@@ -597,34 +1028,154 @@ def _fetch_full_article_text_bs_fallback(downloaded_html: str, article_url: str)
         logger.error(f"Error parsing full article with BeautifulSoup fallback from {article_url}: {e}")
         return None
 
-def _get_full_article_content(article_url: str) -> Optional[str]:
+def _get_article_extraction_key(page: Dict[str, Any]) -> str:
+    """Extraction cache key for a fetched page: its canonical URL (from <link rel="canonical">) plus the sha256 of the body."""
+    if page['extraction_key'] is None:
+        page['canonical_url'] = find_canonical_url(_extract_head_bytes(page), page['final_url'])
+        page['extraction_key'] = f"{page['canonical_url']} {hashlib.sha256(page['content']).hexdigest()}"
+    return page['extraction_key']
+
+def _extract_article_text(page: Dict[str, Any], article_url: str) -> Optional[str]:
+    """Trafilatura on (a copy of) the shared tree, then the lxml selector fallback, or BeautifulSoup when lxml is unavailable."""
+    downloaded_html: str = page['text']
+    tree: Optional[Any] = _get_page_tree(page)
+    content_text: Optional[str] = None
+    if TRAFILATURA_AVAILABLE:
+        content_text = _fetch_full_article_text_with_trafilatura(copy_tree(tree) if tree is not None else downloaded_html, article_url)
+    if not content_text and tree is not None:
+        logger.info(f"Trafilatura insufficient or unavailable for {article_url}, trying lxml fallback.")
+        content_text = _fetch_full_article_text_lxml_fallback(tree, article_url)
+    elif not content_text and BS4_AVAILABLE:
+        logger.info(f"Trafilatura insufficient or unavailable for {article_url}, trying BeautifulSoup fallback.")
+        content_text = _fetch_full_article_text_bs_fallback(downloaded_html, article_url, soup=_get_page_soup(page))
+    return content_text
+
+def _get_article_extraction(article_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Extracted text plus page metadata ({'text', 'title', 'image_url', 'published_iso', 'canonical_url'}) for an article URL.
+    The page is always fetched (its body hash is part of the key), but extraction runs only on an ARTICLE_EXTRACTION_CACHE miss.
+    """
     if not article_url or not article_url.startswith('http'):
         logger.debug(f"Invalid article_url for full content fetch: {article_url}"); return None
-    if not BS4_AVAILABLE and not TRAFILATURA_AVAILABLE : 
-        logger.warning("Neither BeautifulSoup nor Trafilatura available. Skipping full article content fetch."); return None
+    if not BS4_AVAILABLE and not TRAFILATURA_AVAILABLE and not LXML_AVAILABLE:
+        logger.warning("Neither lxml, BeautifulSoup nor Trafilatura available. Skipping full article content fetch."); return None
     try:
-        headers: Dict[str, str] = {
-            'User-Agent': f'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 DacoolaNewsBot/1.0 (+{WEBSITE_URL_FOR_AGENT})',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9', 'Referer': 'https://www.google.com/'
-        }
-        response: requests.Response = requests.get(article_url, headers=headers, timeout=ARTICLE_FETCH_TIMEOUT, allow_redirects=True)
-        response.raise_for_status()
-        content_type: str = response.headers.get('Content-Type', '').lower()
-        if 'html' not in content_type:
-            logger.warning(f"Content type for {article_url} is not HTML ({content_type}). Skipping full text extraction."); return None
-        downloaded_html: str = response.text
-        content_text: Optional[str] = None
-        if TRAFILATURA_AVAILABLE:
-            content_text = _fetch_full_article_text_with_trafilatura(downloaded_html, article_url)
-        if not content_text and BS4_AVAILABLE:
-            logger.info(f"Trafilatura insufficient or unavailable for {article_url}, trying BeautifulSoup fallback.")
-            content_text = _fetch_full_article_text_bs_fallback(downloaded_html, article_url)
-        return content_text
+        page: Optional[Dict[str, Any]] = _fetch_article_page(article_url)
+        if not page: return None
+        if not page['is_html']:
+            logger.warning(f"Content type for {article_url} is not HTML ({page['headers'].get('content-type', '')}). Skipping full text extraction."); return None
+        cache_key: str = _get_article_extraction_key(page)
+        extraction: Optional[Dict[str, Any]] = ARTICLE_EXTRACTION_CACHE.get(cache_key)
+        if extraction is not None:
+            logger.info(f"Extraction cache hit for {article_url} (canonical: {extraction.get('canonical_url')}).")
+            if not page['meta_image_checked']:
+                page['meta_image_url'], page['meta_image_checked'] = extraction.get('image_url'), True
+            return extraction
+        content_text: Optional[str] = _extract_article_text(page, article_url)
+        page_metadata: Dict[str, Optional[str]] = extract_page_metadata(_get_page_tree(page))
+        extraction = {'text': content_text, 'title': page_metadata['title'], 'image_url': _get_page_meta_image(page),
+                      'published_iso': page_metadata['published_iso'], 'canonical_url': page['canonical_url']}
+        ARTICLE_EXTRACTION_CACHE.set(cache_key, extraction, ttl_seconds=(ARTICLE_EXTRACTION_CACHE_TTL_HOURS if content_text else ARTICLE_EXTRACTION_CACHE_EMPTY_TTL_HOURS) * 3600)
+        return extraction
+    except Exception as e:
+        logger.error(f"Unexpected error extracting article content for {article_url}: {e}"); return None
+
+def _get_full_article_content(article_url: str) -> Optional[str]:
+    extraction: Optional[Dict[str, Any]] = _get_article_extraction(article_url)
+    return extraction['text'] if extraction else None
+
+def load_feed_state() -> Dict[str, Any]:
+    if not os.path.exists(FEED_STATE_FILE):
+        return {"feeds": {}}
+    try:
+        with open(FEED_STATE_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or not isinstance(data.get('feeds'), dict):
+            logger.warning(f"Feed state file {FEED_STATE_FILE} has invalid format. Resetting.")
+            return {"feeds": {}}
+        return data
+    except json.JSONDecodeError:
+        logger.error(f"Error decoding JSON from feed state file {FEED_STATE_FILE}. Resetting.")
+        return {"feeds": {}}
+    except Exception as e:
+        logger.error(f"Error loading feed state: {e}")
+        return {"feeds": {}}
+
+def save_feed_state(feed_state: Dict[str, Any]) -> None:
+    try:
+        os.makedirs(os.path.dirname(FEED_STATE_FILE), exist_ok=True)
+        with open(FEED_STATE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(feed_state, f, indent=2, sort_keys=True)
+    except Exception as e:
+        logger.error(f"Error saving feed state: {e}")
+
+def _build_conditional_feed_headers(feed_state_entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if not ENABLE_FEED_CONDITIONAL_GET or not feed_state_entry:
+        return headers
+    if feed_state_entry.get('etag'):
+        headers['If-None-Match'] = feed_state_entry['etag']
+    if feed_state_entry.get('last_modified'):
+        headers['If-Modified-Since'] = feed_state_entry['last_modified']
+    return headers
+
+def _fetch_feed(feed_url: str, feed_state_entry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Downloads one feed's raw bytes. Runs on a worker thread, so it never raises."""
+    result: Dict[str, Any] = {'feed_url': feed_url, 'status': None, 'content': None, 'headers': {}, 'error': None, 'elapsed': 0.0,
+                              'content_hash': None, 'not_modified': False, 'unchanged': False}
+    started_at: float = time.monotonic()
+    try:
+        headers: Dict[str, str] = {'User-Agent': FEED_USER_AGENT,
+                                   'Accept': 'application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.8, */*;q=0.5'}
+        headers.update(_build_conditional_feed_headers(feed_state_entry))
+        response: requests.Response = http_get(feed_url, headers=headers, timeout=FEED_FETCH_TIMEOUT, allow_redirects=True) # Per-host limits applied by http_client
+        result['status'] = response.status_code
+        result['headers'] = {k.lower(): v for k, v in response.headers.items()}
+        result['headers']['content-location'] = response.url
+        if response.status_code == 304:
+            result['not_modified'] = True
+        else:
+            result['content'] = response.content
+            result['content_hash'] = hashlib.sha256(response.content).hexdigest()
+            if ENABLE_FEED_CONDITIONAL_GET and feed_state_entry and feed_state_entry.get('content_hash') == result['content_hash']:
+                result['unchanged'] = True
     except requests.exceptions.RequestException as e:
-        logger.warning(f"Failed to fetch HTML for full article from {article_url}: {e}"); return None
+        result['error'] = e
     except Exception as e:
-        logger.error(f"Unexpected error in _get_full_article_content for {article_url}: {e}"); return None
+        result['error'] = e
+    result['elapsed'] = time.monotonic() - started_at
+    return result
+
+def _iter_fetched_feeds(feed_urls: List[str], feed_state: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Downloads all feeds in parallel and yields (feed_url, fetch_result) in the order of feed_urls,
+    so downstream processing (and the max_articles_to_fetch cut-off) stays deterministic.
+    Closing the generator early cancels any downloads that have not started yet.
+    """
+    executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=max(1, FEED_FETCH_MAX_WORKERS), thread_name_prefix='feed-fetch')
+    try:
+        known_feeds: Dict[str, Any] = (feed_state or {}).get('feeds', {})
+        futures: List[Tuple[str, Future]] = [(feed_url, executor.submit(_fetch_feed, feed_url, known_feeds.get(feed_url))) for feed_url in feed_urls]
+        for feed_url, future in futures:
+            yield feed_url, future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _record_feed_state(feed_state: Dict[str, Any], fetch_result: Dict[str, Any]) -> None:
+    """Remembers validators and content hash so the next run can skip an unchanged feed."""
+    entry: Dict[str, Any] = feed_state.setdefault('feeds', {}).setdefault(fetch_result['feed_url'], {})
+    entry['last_checked_iso'] = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    if fetch_result['not_modified']:
+        return
+    response_headers: Dict[str, str] = fetch_result['headers']
+    entry['etag'] = response_headers.get('etag')
+    entry['last_modified'] = response_headers.get('last-modified')
+    entry['content_hash'] = fetch_result['content_hash']
+    entry['content_length'] = len(fetch_result['content'] or b'')
+
+def _parse_fetched_feed(fetch_result: Dict[str, Any]) -> Any:
+    # Handing feedparser the response headers keeps its content-type/encoding checks (bozo) intact.
+    return feedparser.parse(fetch_result['content'], response_headers=fetch_result['headers']) # type: ignore
 
 def _process_feed_entry(entry: Dict[str, Any], feed_url: str, processed_ids_set: Set[str]) -> Optional[Dict[str, Any]]:
     article_id: str = _get_article_id(entry, feed_url)
@@ -670,15 +1221,18 @@ def _process_gyro_pick_entry(gyro_pick_data: Dict[str, Any], processed_ids_set:
     if article_id in processed_ids_set: logger.debug(f"Gyro Pick ID {article_id} already processed. Skipping."); return None
     logger.info(f"RESEARCH: Processing Gyro Pick: {article_id} from {primary_url}")
     raw_scraped_text: Optional[str] = gyro_pick_data.get('raw_scraped_text')
+    page_metadata: Dict[str, Any] = {}
     if not raw_scraped_text:
         logger.info(f"Gyro Pick {article_id}: No manual content, scraping {primary_url}...")
-        raw_scraped_text = _get_full_article_content(primary_url)
+        page_metadata = _get_article_extraction(primary_url) or {}
+        raw_scraped_text = page_metadata.get('text')
         if not raw_scraped_text: logger.error(f"Gyro Pick {article_id}: Failed to scrape content from {primary_url}. Skipping."); return None
+        initial_title = initial_title or page_metadata.get('title')
     title_for_processing: str = initial_title if initial_title else f"Content from {primary_url}"
     if not title_for_processing or len(title_for_processing) < 10: title_for_processing = f"Gyro Pick: {primary_url}"
     selected_image_url: Optional[str] = gyro_pick_data.get('user_provided_image_url_gyro')
     if selected_image_url:
-        img_obj, validated_url = _download_image(selected_image_url)
+        img_obj, validated_url = _download_image(selected_image_url, probe_only=True)
         if not img_obj or not validated_url:
             logger.warning(f"Gyro Pick {article_id}: User-provided image '{selected_image_url}' is invalid. Finding a new one.")
             selected_image_url = _find_best_image(title_for_processing, article_url_for_scrape=primary_url)
@@ -690,7 +1244,7 @@ def _process_gyro_pick_entry(gyro_pick_data: Dict[str, Any], processed_ids_set:
         if not selected_image_url: logger.error(f"Gyro Pick {article_id}: No suitable image found. Skipping."); return None
     article_data: Dict[str, Any] = {
         'id': article_id, 'title': initial_title, 'link': primary_url,
-        'published_iso': gyro_pick_data.get('published_iso', datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')),
+        'published_iso': gyro_pick_data.get('published_iso', page_metadata.get('published_iso') or datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')),
         'summary': gyro_pick_data.get('initial_title_from_web', 'Gyro Pick Content'),
         'raw_scraped_text': raw_scraped_text, 'processed_summary': raw_scraped_text,
         'source_feed': 'Gyro Pick', 'scraped_at_iso': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
@@ -703,67 +1257,306 @@ def _process_gyro_pick_entry(gyro_pick_data: Dict[str, Any], processed_ids_set:
     logger.info(f"RESEARCH: Processed Gyro Pick {article_id[:8]}... ('{initial_title[:50]}...') - Image: {selected_image_url[:40]}...")
     return article_data
 
-def run_research_agent(processed_ids_set: Set[str], max_articles_to_fetch: int, gyro_picks_data_list: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+def _title_match_tokens(title: str) -> Set[str]:
+    return {token for token in _normalize_image_search_query(title).split() if token not in TITLE_MATCH_STOPWORDS}
+
+def _build_title_index(titles: Iterable[str]) -> Dict[str, Any]:
+    """Normalized-title set plus a token -> title-ids inverted index, for exact and near-duplicate title checks."""
+    title_index: Dict[str, Any] = {'exact': set(), 'tokens': [], 'titles': [], 'postings': {}}
+    for title in titles:
+        if title: _add_title_to_index(title_index, title)
+    return title_index
+
+def _add_title_to_index(title_index: Dict[str, Any], title: str) -> None:
+    normalized_title: str = _normalize_image_search_query(title)
+    if not normalized_title or normalized_title in title_index['exact']: return
+    title_index['exact'].add(normalized_title)
+    tokens: Set[str] = _title_match_tokens(title)
+    title_id: int = len(title_index['tokens'])
+    title_index['tokens'].append(tokens)
+    title_index['titles'].append(title)
+    for token in tokens:
+        title_index['postings'].setdefault(token, []).append(title_id)
+
+def _find_duplicate_title(title_index: Dict[str, Any], title: str) -> Optional[Tuple[str, str, float]]:
+    """Returns ('exact'|'near', matched_title, jaccard) if `title` duplicates an indexed title, else None."""
+    if _normalize_image_search_query(title) in title_index['exact']:
+        return 'exact', title, 1.0
+    tokens: Set[str] = _title_match_tokens(title)
+    if len(tokens) < 3: return None # Too short for a meaningful near-duplicate verdict
+    overlap_counts: Dict[int, int] = {}
+    for token in tokens:
+        for title_id in title_index['postings'].get(token, ()):
+            overlap_counts[title_id] = overlap_counts.get(title_id, 0) + 1
+    best_match: Optional[Tuple[str, str, float]] = None
+    for title_id, overlap in overlap_counts.items():
+        jaccard: float = overlap / (len(tokens) + len(title_index['tokens'][title_id]) - overlap)
+        if jaccard >= PRESCREEN_NEAR_DUPLICATE_TITLE_THRESHOLD and (not best_match or jaccard > best_match[2]):
+            best_match = ('near', title_index['titles'][title_id], jaccard)
+    return best_match
+
+def _score_prescreen_candidate(title: str, summary: str, published_dt: Optional[datetime]) -> float:
+    score: float = 0.0
+    if CONTENT_SIGNALS_AVAILABLE and analyze_content_signals:
+        try:
+            signals: Dict[str, Any] = analyze_content_signals(title, summary)
+            score += PRESCREEN_SCORE_WEIGHTS['breaking'] * signals['breaking_score']
+            score += PRESCREEN_SCORE_WEIGHTS['technical'] * signals['technical_score']
+            score += PRESCREEN_SCORE_WEIGHTS['hype'] * signals['hype_score']
+            score += PRESCREEN_SCORE_WEIGHTS['length'] * signals['length_score']
+            for entity_match in signals['entity_matches']:
+                score += PRESCREEN_SCORE_WEIGHTS.get(entity_match['category'], 1.0) * len(entity_match['entities'])
+        except Exception as e:
+            logger.debug(f"Content signal analysis failed for '{title[:50]}': {e}")
+    if published_dt:
+        age_hours: float = (datetime.now(timezone.utc) - published_dt).total_seconds() / 3600
+        score += PRESCREEN_SCORE_WEIGHTS['recency'] * max(0.0, 1.0 - age_hours / PRESCREEN_RECENCY_WINDOW_HOURS)
+    return score
+
+def _prescreen_feed_entry(entry: Dict[str, Any], feed_url: str, processed_ids_set: Set[str], title_index: Dict[str, Any],
+                          prescreen_stats: Dict[str, int]) -> Optional[Dict[str, Any]]:
+    """
+    Cheap checks on feed metadata only: already processed, missing title/link, too old, exact duplicate title.
+    Returns a ranked candidate {'entry', 'feed_url', 'article_id', 'title', 'score', 'published_dt'} or None.
+    A near-duplicate title only lowers the score. Accepted titles are added to title_index so the same title
+    from another feed is dropped too.
+    """
+    article_id: str = _get_article_id(entry, feed_url)
+    if article_id in processed_ids_set:
+        prescreen_stats['already_processed'] += 1; return None
+    title: str = html.unescape(entry.get('title', '').strip())
+    if not title or not entry.get('link', '').strip():
+        prescreen_stats['missing_fields'] += 1; return None
+    published_dt: Optional[datetime] = None
+    published_parsed: Optional[Any] = entry.get('published_parsed')
+    if published_parsed:
+        try: published_dt = datetime(*published_parsed[:6], tzinfo=timezone.utc)
+        except Exception: published_dt = None
+    if published_dt and published_dt < datetime.now(timezone.utc) - timedelta(days=ARTICLE_MAX_AGE_DAYS_FILTER):
+        logger.debug(f"Pre-screen: '{title[:60]}' is too old ({published_dt.date()}). Skipping.")
+        prescreen_stats['too_old'] += 1; return None
+    duplicate: Optional[Tuple[str, str, float]] = _find_duplicate_title(title_index, title)
+    if duplicate and duplicate[0] == 'exact':
+        logger.debug(f"Pre-screen: '{title[:60]}' has the same title as an existing article. Skipping.")
+        prescreen_stats['exact_duplicate_title'] += 1; return None
+    _add_title_to_index(title_index, title)
+    summary_raw: str = entry.get('summary', entry.get('description', '')) or ''
+    summary: str = html.unescape(re.sub(r'<[^>]+>', ' ', summary_raw)).strip()
+    score: float = _score_prescreen_candidate(title, summary, published_dt)
+    if duplicate:
+        logger.debug(f"Pre-screen: '{title[:60]}' resembles '{duplicate[1][:60]}' (Jaccard {duplicate[2]:.2f}). Ranked lower; the similarity check decides.")
+        prescreen_stats['near_duplicate_title'] += 1
+        score += PRESCREEN_SCORE_WEIGHTS['near_duplicate_title']
+    prescreen_stats['accepted'] += 1
+    return {'entry': entry, 'feed_url': feed_url, 'article_id': article_id, 'title': title, 'score': score, 'published_dt': published_dt}
+
+def _rank_prescreen_candidates(candidates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Highest score first; newer entries win ties. Sort is stable, so feed order breaks any remaining ties."""
+    oldest: datetime = datetime.min.replace(tzinfo=timezone.utc)
+    return sorted(candidates, key=lambda c: (c['score'], c['published_dt'] or oldest), reverse=True)
+
+def iter_research_agent(processed_ids_set: Set[str], max_articles_to_fetch: int, gyro_picks_data_list: Optional[List[Dict[str, Any]]] = None,
+                        existing_titles: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yields each enriched article as soon as it is ready. Researches Gyro Picks first, then RSS feed entries.
+    Feed entries go through a metadata-only pre-screen (age, exact duplicate titles against `existing_titles`,
+    content signals) and are enriched best-first, so the max_articles_to_fetch budget is spent on the
+    most promising candidates.
+    Caches, feed state and feed health are saved when the generator finishes or is closed early.
+    """
     logger.info(f"--- Research Agent Starting Run ---")
+    clear_article_page_cache()
     logger.info(f"Current processed IDs count: {len(processed_ids_set)}")
     logger.info(f"Max articles to fetch this run: {max_articles_to_fetch}")
-    newly_researched_articles: List[Dict[str, Any]] = []
     articles_fetched_this_run: int = 0
-    if gyro_picks_data_list:
-        logger.info(f"Processing {len(gyro_picks_data_list)} Gyro Pick(s)...")
-        for gyro_data in gyro_picks_data_list:
-            if articles_fetched_this_run >= max_articles_to_fetch:
-                logger.warning(f"Hit max articles ({max_articles_to_fetch}) while processing Gyro Picks. Stopping.")
-                break
-            processed_gyro_article: Optional[Dict[str, Any]] = _process_gyro_pick_entry(gyro_data, processed_ids_set)
-            if processed_gyro_article:
-                newly_researched_articles.append(processed_gyro_article)
-                processed_ids_set.add(processed_gyro_article['id'])
-                articles_fetched_this_run += 1
-                time.sleep(1)
-    if not FEEDPARSER_AVAILABLE:
-        logger.error("feedparser is not installed. Skipping RSS feed processing.")
-    else:
-        logger.info(f"Processing {len(NEWS_FEED_URLS)} RSS Feeds...")
-        for feed_url in NEWS_FEED_URLS:
-            if articles_fetched_this_run >= max_articles_to_fetch:
-                logger.warning(f"Hit max articles ({max_articles_to_fetch}) while processing RSS feeds. Stopping.")
-                break
-            logger.info(f"Checking feed: {feed_url}")
+    try:
+        if gyro_picks_data_list:
+            logger.info(f"Processing {len(gyro_picks_data_list)} Gyro Pick(s)...")
+            for gyro_data in gyro_picks_data_list:
+                if articles_fetched_this_run >= max_articles_to_fetch:
+                    logger.warning(f"Hit max articles ({max_articles_to_fetch}) while processing Gyro Picks. Stopping.")
+                    break
+                processed_gyro_article: Optional[Dict[str, Any]] = _process_gyro_pick_entry(gyro_data, processed_ids_set)
+                if processed_gyro_article:
+                    processed_ids_set.add(processed_gyro_article['id'])
+                    articles_fetched_this_run += 1
+                    yield processed_gyro_article
+        if not FEEDPARSER_AVAILABLE:
+            logger.error("feedparser is not installed. Skipping RSS feed processing.")
+        else:
+            feed_health: FeedHealthRegistry = FeedHealthRegistry()
+            feeds_to_poll: List[str] = feed_health.select_due_feeds(NEWS_FEED_URLS) if ENABLE_FEED_HEALTH_BACKOFF else list(NEWS_FEED_URLS)
+            if len(feeds_to_poll) < len(NEWS_FEED_URLS):
+                logger.info(f"Feed health: {len(NEWS_FEED_URLS) - len(feeds_to_poll)} backed-off feed(s) not due this run.")
+            logger.info(f"Processing {len(feeds_to_poll)} RSS Feeds (fetching up to {FEED_FETCH_MAX_WORKERS} in parallel)...")
+            feed_state: Dict[str, Any] = load_feed_state()
+            feed_fetch_stats: Dict[str, int] = {'downloaded': 0, 'parsed': 0, 'skipped_not_modified': 0, 'skipped_unchanged_hash': 0,
+                                                'failed': 0, 'bytes_downloaded': 0, 'bytes_saved_estimate': 0}
+            title_index: Dict[str, Any] = _build_title_index(existing_titles or [])
+            prescreen_stats: Dict[str, int] = {'accepted': 0, 'already_processed': 0, 'missing_fields': 0, 'too_old': 0,
+                                               'exact_duplicate_title': 0, 'near_duplicate_title': 0}
+            prescreen_candidates: List[Dict[str, Any]] = []
+            feeds_awaiting_enrichment: Dict[str, Dict[str, Any]] = {} # feed_url -> fetch result, recorded once its candidates are tried
+            fetched_feeds: Iterator[Tuple[str, Dict[str, Any]]] = _iter_fetched_feeds(feeds_to_poll, feed_state)
             try:
-                feed_request_headers: Dict[str, str] = {'User-Agent': 'DacoolaNewsBot/1.0 (+https://dacoolaa.netlify.app) FeedFetcher'}
-                feed_data: Any = feedparser.parse(feed_url, agent=feed_request_headers['User-Agent'], request_headers=feed_request_headers) # type: ignore
-                http_status: Optional[int] = getattr(feed_data, 'status', None)
-                if http_status and (http_status < 200 or http_status >= 400):
-                    logger.error(f"Failed to fetch feed {feed_url}. HTTP Status: {http_status}")
-                    continue
-                if feed_data.bozo:
-                    bozo_reason: Any = feed_data.get('bozo_exception', Exception("Unknown feedparser error"))
-                    bozo_message: str = str(bozo_reason).lower()
-                    if ("content-type" in bozo_message and
-                        ("xml" not in bozo_message and "rss" not in bozo_message and "atom" not in bozo_message)):
-                        logger.error(f"Failed to fetch feed {feed_url}: Content type was not XML/RSS/Atom ({bozo_reason}). Skipping.")
-                        continue
-                    elif "ssl error" in bozo_message:
-                         logger.error(f"Failed to fetch feed {feed_url} due to SSL Error: {bozo_reason}. Skipping.")
-                         continue
-                    else:
-                        logger.warning(f"Feed {feed_url} potentially malformed (bozo). Reason: {bozo_reason}. Attempting to process...")
-                if not feed_data.entries: logger.info(f"No entries found in feed: {feed_url}"); continue
-                logger.info(f"Feed {feed_url} contains {len(feed_data.entries)} entries.")
-                for entry in feed_data.entries:
+                for feed_url, fetch_result in fetched_feeds:
+                    logger.info(f"Checking feed: {feed_url} (fetched in {fetch_result['elapsed']:.2f}s)")
+                    poll_outcome: Dict[str, Any] = {'failed': False, 'error': None, 'parsed': False, 'bozo': False, 'entries': 0, 'new_entries': 0}
+                    try:
+                        if fetch_result['error'] is not None:
+                            poll_outcome.update(failed=True, error=str(fetch_result['error']))
+                            feed_fetch_stats['failed'] += 1
+                            logger.error(f"Failed to fetch feed {feed_url}: {fetch_result['error']}. Skipping.")
+                            continue
+                        previous_length: int = feed_state['feeds'].get(feed_url, {}).get('content_length') or 0
+                        if fetch_result['not_modified']:
+                            feed_fetch_stats['skipped_not_modified'] += 1
+                            feed_fetch_stats['bytes_saved_estimate'] += previous_length
+                            _record_feed_state(feed_state, fetch_result)
+                            logger.info(f"Feed {feed_url} not modified since last run (HTTP 304). Skipping.")
+                            continue
+                        http_status: Optional[int] = fetch_result['status']
+                        if http_status and (http_status < 200 or http_status >= 400):
+                            poll_outcome.update(failed=True, error=f"HTTP {http_status}")
+                            feed_fetch_stats['failed'] += 1
+                            logger.error(f"Failed to fetch feed {feed_url}. HTTP Status: {http_status}")
+                            continue
+                        feed_fetch_stats['downloaded'] += 1
+                        feed_fetch_stats['bytes_downloaded'] += len(fetch_result['content'] or b'')
+                        if fetch_result['unchanged']:
+                            feed_fetch_stats['skipped_unchanged_hash'] += 1
+                            _record_feed_state(feed_state, fetch_result)
+                            logger.info(f"Feed {feed_url} content unchanged since last run (same hash). Skipping parse.")
+                            continue
+                        feed_data: Any = _parse_fetched_feed(fetch_result)
+                        feed_fetch_stats['parsed'] += 1
+                        poll_outcome.update(parsed=True, bozo=bool(feed_data.bozo))
+                        if feed_data.bozo:
+                            bozo_reason: Any = feed_data.get('bozo_exception', Exception("Unknown feedparser error"))
+                            bozo_message: str = str(bozo_reason).lower()
+                            if ("content-type" in bozo_message and
+                                ("xml" not in bozo_message and "rss" not in bozo_message and "atom" not in bozo_message)):
+                                poll_outcome.update(failed=True, error=f"Not a feed: {bozo_reason}")
+                                logger.error(f"Failed to fetch feed {feed_url}: Content type was not XML/RSS/Atom ({bozo_reason}). Skipping.")
+                                continue
+                            elif "ssl error" in bozo_message:
+                                 poll_outcome.update(failed=True, error=f"SSL error: {bozo_reason}")
+                                 logger.error(f"Failed to fetch feed {feed_url} due to SSL Error: {bozo_reason}. Skipping.")
+                                 continue
+                            else:
+                                logger.warning(f"Feed {feed_url} potentially malformed (bozo). Reason: {bozo_reason}. Attempting to process...")
+                        if not feed_data.entries:
+                            _record_feed_state(feed_state, fetch_result)
+                            logger.info(f"No entries found in feed: {feed_url}"); continue
+                        feed_candidates: List[Dict[str, Any]] = [candidate for entry in feed_data.entries
+                                                                 if (candidate := _prescreen_feed_entry(entry, feed_url, processed_ids_set, title_index, prescreen_stats))]
+                        poll_outcome.update(entries=len(feed_data.entries), new_entries=len(feed_candidates))
+                        logger.info(f"Feed {feed_url} contains {len(feed_data.entries)} entries, {len(feed_candidates)} passed pre-screen.")
+                        if feed_candidates:
+                            prescreen_candidates.extend(feed_candidates)
+                            feeds_awaiting_enrichment[feed_url] = fetch_result
+                        else:
+                            _record_feed_state(feed_state, fetch_result)
+                    except Exception as e:
+                        poll_outcome.update(failed=True, error=str(e))
+                        logger.exception(f"Unexpected error processing feed {feed_url}: {e}")
+                    finally:
+                        feed_health.record_poll(feed_url, fetch_result['status'], fetch_result['elapsed'], **poll_outcome)
+                fetched_feeds.close()
+
+                ranked_candidates: List[Dict[str, Any]] = _rank_prescreen_candidates(prescreen_candidates)
+                logger.info(f"Pre-screen: {prescreen_stats['accepted']} candidates ranked for enrichment. Rejected: {prescreen_stats['already_processed']} already processed, "
+                            f"{prescreen_stats['too_old']} older than {ARTICLE_MAX_AGE_DAYS_FILTER} days, {prescreen_stats['exact_duplicate_title']} duplicate titles, "
+                            f"{prescreen_stats['missing_fields']} missing title/link. {prescreen_stats['near_duplicate_title']} near-duplicate titles ranked lower.")
+                attempted_article_ids: Set[str] = set()
+                for candidate in ranked_candidates:
                     if articles_fetched_this_run >= max_articles_to_fetch:
-                        logger.warning(f"Hit max articles ({max_articles_to_fetch}) while processing {feed_url}. Stopping.")
+                        logger.warning(f"Hit max articles ({max_articles_to_fetch}). {len(ranked_candidates) - len(attempted_article_ids)} lower-ranked candidates left for later runs.")
                         break
-                    processed_article: Optional[Dict[str, Any]] = _process_feed_entry(entry, feed_url, processed_ids_set)
+                    attempted_article_ids.add(candidate['article_id'])
+                    logger.debug(f"Enriching candidate (pre-screen score {candidate['score']:.2f}): '{candidate['title'][:60]}'")
+                    processed_article: Optional[Dict[str, Any]] = _process_feed_entry(candidate['entry'], candidate['feed_url'], processed_ids_set)
                     if processed_article:
-                        newly_researched_articles.append(processed_article)
                         processed_ids_set.add(processed_article['id'])
                         articles_fetched_this_run += 1
-                        time.sleep(1)
-            except Exception as e: logger.exception(f"Unexpected error processing feed {feed_url}: {e}")
-    logger.info(f"--- Research Agent Finished. Total new articles fetched and enriched: {len(newly_researched_articles)} ---")
-    return newly_researched_articles
+                        feed_health.record_article_produced(candidate['feed_url'])
+                        yield processed_article
+                # Only remember a feed version once every candidate from it has been tried; otherwise the
+                # entries left behind by the max_articles_to_fetch cut-off would be skipped next run.
+                for feed_url, fetch_result in feeds_awaiting_enrichment.items():
+                    if all(c['article_id'] in attempted_article_ids for c in prescreen_candidates if c['feed_url'] == feed_url):
+                        _record_feed_state(feed_state, fetch_result)
+            finally:
+                fetched_feeds.close()
+                save_feed_state(feed_state)
+                feed_health.save()
+            logger.info(f"Feed fetch stats: {feed_fetch_stats['downloaded']} downloaded ({feed_fetch_stats['bytes_downloaded']} bytes), "
+                        f"{feed_fetch_stats['parsed']} parsed, {feed_fetch_stats['skipped_not_modified']} skipped (304 Not Modified), "
+                        f"{feed_fetch_stats['skipped_unchanged_hash']} skipped (unchanged hash), {feed_fetch_stats['failed']} failed. "
+                        f"Estimated bytes saved: {feed_fetch_stats['bytes_saved_estimate']}.")
+    finally:
+        IMAGE_VALIDATION_CACHE.save()
+        IMAGE_SEARCH_CACHE.save()
+        ARTICLE_EXTRACTION_CACHE.save()
+        if IMAGE_SEARCH_RECORD_RESULTS: IMAGE_SEARCH_RECORDINGS.save()
+        logger.info(f"Image validation cache: {IMAGE_VALIDATION_CACHE.stats['hits']} hits, {IMAGE_VALIDATION_CACHE.stats['misses']} misses this run.")
+        logger.info(f"Image search cache: {IMAGE_SEARCH_CACHE.stats['hits']} hits, {IMAGE_SEARCH_CACHE.stats['misses']} misses this run.")
+        logger.info(f"Article extraction cache: {ARTICLE_EXTRACTION_CACHE.stats['hits']} hits, {ARTICLE_EXTRACTION_CACHE.stats['misses']} misses, "
+                    f"{ARTICLE_EXTRACTION_CACHE.stats['evicted']} evicted this run.")
+        host_schedule_summary: Dict[str, Any] = get_host_scheduler().summary()
+        logger.info(f"Host scheduler: {int(host_schedule_summary['requests'])} requests to {host_schedule_summary['hosts']} hosts, "
+                    f"{int(host_schedule_summary['delayed'])} delayed for politeness ({host_schedule_summary['wait_seconds']:.1f}s total), "
+                    f"{int(host_schedule_summary['retry_after_blocks'])} Retry-After holds.")
+        if CLIP_IMAGE_EMBEDDINGS is not None and any(clip_embedding_stats.values()):
+            logger.info(f"CLIP embedding cache: {clip_embedding_stats['image_hits']} image hits ({clip_embedding_stats['downloads_skipped']} downloads skipped), "
+                        f"{clip_embedding_stats['image_encoded']} encoded; {clip_embedding_stats['prompt_hits']} prompt hits, {clip_embedding_stats['prompt_encoded']} encoded.")
+        logger.info(f"--- Research Agent Finished. Total new articles fetched and enriched: {articles_fetched_this_run} ---")
+
+def run_research_agent(processed_ids_set: Set[str], max_articles_to_fetch: int, gyro_picks_data_list: Optional[List[Dict[str, Any]]] = None,
+                       existing_titles: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+    """Batch interface: runs iter_research_agent to completion and returns every enriched article."""
+    return list(iter_research_agent(processed_ids_set, max_articles_to_fetch, gyro_picks_data_list, existing_titles))
+
+def stream_research_agent(processed_ids_set: Set[str], max_articles_to_fetch: int, gyro_picks_data_list: Optional[List[Dict[str, Any]]] = None,
+                          existing_titles: Optional[Iterable[str]] = None, queue_maxsize: int = RESEARCH_QUEUE_MAXSIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Runs iter_research_agent on a background thread and yields its articles through a bounded queue, so the caller
+    can process one article while the next is being researched. When `queue_maxsize` articles are waiting, research
+    pauses until the caller catches up. Closing the iterator early stops research after the article in progress.
+    """
+    handoff: queue.Queue = queue.Queue(maxsize=max(1, queue_maxsize))
+    stop_event: threading.Event = threading.Event()
+
+    def _hand_over(item: Any) -> bool:
+        while not stop_event.is_set():
+            try:
+                handoff.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce() -> None:
+        research_iterator: Iterator[Dict[str, Any]] = iter_research_agent(processed_ids_set, max_articles_to_fetch, gyro_picks_data_list, existing_titles)
+        try:
+            for article in research_iterator:
+                if not _hand_over(article): break
+        except Exception as e:
+            logger.exception(f"Research Agent run critically failed: {e}")
+        finally:
+            research_iterator.close()
+            _hand_over(_RESEARCH_STREAM_DONE)
+
+    producer: threading.Thread = threading.Thread(target=_produce, name='research-producer', daemon=True)
+    producer.start()
+    try:
+        while True:
+            item: Any = handoff.get()
+            if item is _RESEARCH_STREAM_DONE: break
+            yield item
+    finally:
+        stop_event.set()
+        producer.join()
 
 if __name__ == "__main__":
     logger.info("--- Running Research Agent Standalone Test ---")
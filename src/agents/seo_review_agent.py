@@ -4,7 +4,6 @@ import os
 import sys
 import json
 import logging
-import modal # Added for Modal integration
 import re
 import time
 
@@ -20,6 +19,9 @@ dotenv_path = os.path.join(PROJECT_ROOT, '.env')
 load_dotenv(dotenv_path=dotenv_path)
 # --- End Path Setup ---
 
+from src.utils.lazy_import import LazyModule
+modal = LazyModule('modal') # Imported on the first Modal call, not when this module is imported
+
 # --- Setup Logging ---
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -5,6 +5,8 @@ import sys
 import json
 import logging
 import glob
+import hashlib
+import threading
 import numpy as np
 
 # --- Path Setup ---
@@ -15,18 +17,17 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 # --- End Path Setup ---
 
+from src.utils.embedding_store import EmbeddingStore
+from src.utils.ann_index import IVFFlatIndex
+from src.utils.minhash_lsh import MinHashLSHIndex, estimate_jaccard
+from src.utils.model_registry import get_model_registry, SENTENCE_TRANSFORMER
+
 # --- Sentence Transformer Setup ---
 SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
-sentence_model = None
-st_util = None # For sentence_transformers.util
-
-try:
-    from sentence_transformers import SentenceTransformer, util as sentence_transformers_util
-    st_util = sentence_transformers_util
-    # Model will be loaded lazily by _load_sentence_model()
-    SENTENCE_MODEL_AVAILABLE = True
-except ImportError:
-    SENTENCE_MODEL_AVAILABLE = False
+
+# The model itself is loaded on first use and shared with the other agents through the model registry
+SENTENCE_MODEL_AVAILABLE = get_model_registry().is_available(SENTENCE_TRANSFORMER)
+if not SENTENCE_MODEL_AVAILABLE:
     logging.warning(
         f"sentence-transformers library not found. Text similarity checks will be basic (title match only). "
         f"Install with: pip install sentence-transformers"
@@ -39,25 +40,206 @@ EXACT_TITLE_SIMILARITY_THRESHOLD = 0.98 # If titles are extremely similar, conte
 CONTENT_SIMILARITY_FOR_EXACT_TITLE = 0.80
 MIN_CONTENT_LENGTH_FOR_EMBEDDING = 50 # Minimum characters to attempt embedding
 
+# Persistent embedding index of processed articles (normalized vectors, so a dot product is the cosine similarity).
+# Appended by save_processed_data() in main.py; anything in processed_json that is missing is backfilled on the next check.
+# Title embeddings live next to it in a 'titles' store keyed by title fingerprint, so each distinct title is encoded once.
+SIMILARITY_INDEX_DIR = os.path.join(PROJECT_ROOT, 'data', 'similarity_index')
+SIMILARITY_ENCODE_BATCH_SIZE = int(os.getenv('SIMILARITY_ENCODE_BATCH_SIZE', '64'))
+SIMILARITY_BACKFILL_CHUNK_SIZE = 256 # Historical JSON files loaded and encoded per backfill step
+SIMILARITY_DOT_BLOCK_ROWS = 65536 # Rows of the (float16) index converted to float32 per matrix-product block
+# Optional IVF-flat ANN search over the index (src/utils/ann_index.py): 'auto' switches it on once the index holds
+# SIMILARITY_ANN_MIN_VECTORS rows, 'on' whenever it can be trained, 'off' always scans the whole index exactly.
+SIMILARITY_ANN = os.getenv('SIMILARITY_ANN', 'auto').lower()
+SIMILARITY_ANN_MIN_VECTORS = int(os.getenv('SIMILARITY_ANN_MIN_VECTORS', '20000'))
+SIMILARITY_ANN_NPROBE = int(os.getenv('SIMILARITY_ANN_NPROBE', '8'))
+SIMILARITY_ANN_TOP_K = int(os.getenv('SIMILARITY_ANN_TOP_K', '32')) # Exact-rescored neighbours kept per candidate
+# MinHash/LSH prefilter (src/utils/minhash_lsh.py, stored in SIMILARITY_INDEX_DIR): candidates whose 5-word shingles overlap a
+# known article's at or above this estimated Jaccard are rejected as copies before any model call.
+SIMILARITY_MINHASH_THRESHOLD = float(os.getenv('SIMILARITY_MINHASH_THRESHOLD', '0.8'))
+
 # --- Setup Logging ---
 logger = logging.getLogger(__name__)
 if not logging.getLogger().hasHandlers():
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-def _load_sentence_model():
-    global sentence_model
+def _get_sentence_model():
+    """The shared sentence model (loaded on first use), or None when it is unavailable. Fetch it per call, don't keep it."""
     if not SENTENCE_MODEL_AVAILABLE:
+        return None
+    return get_model_registry().sentence_transformer(SENTENCE_MODEL_NAME)
+
+_content_index = None
+_title_index = None
+_minhash_index = None
+_ann_index = None
+_content_index_lock = threading.Lock()
+_title_lookup_cache = {'rows': -1, 'titles': {}}
+
+def _get_content_index():
+    global _content_index
+    with _content_index_lock:
+        if _content_index is None:
+            _content_index = EmbeddingStore(SIMILARITY_INDEX_DIR, 'content', model_name=SENTENCE_MODEL_NAME, normalize=True)
+        return _content_index
+
+def _get_title_index():
+    global _title_index
+    with _content_index_lock:
+        if _title_index is None:
+            _title_index = EmbeddingStore(SIMILARITY_INDEX_DIR, 'titles', model_name=SENTENCE_MODEL_NAME, normalize=True)
+        return _title_index
+
+def _get_minhash_index():
+    global _minhash_index
+    with _content_index_lock:
+        if _minhash_index is None:
+            _minhash_index = MinHashLSHIndex(SIMILARITY_INDEX_DIR, 'content')
+        return _minhash_index
+
+def _title_needs_embedding(title):
+    return len(title) >= MIN_CONTENT_LENGTH_FOR_EMBEDDING
+
+def _get_ann_index(index):
+    """The IVF index over the content index when ANN search is enabled and worthwhile, else None (exact blockwise scan)."""
+    global _ann_index
+    if SIMILARITY_ANN == 'off' or (SIMILARITY_ANN == 'auto' and len(index) < SIMILARITY_ANN_MIN_VECTORS):
+        return None
+    with _content_index_lock:
+        if _ann_index is None or _ann_index.store is not index:
+            _ann_index = IVFFlatIndex(index, nprobe=SIMILARITY_ANN_NPROBE)
+    try:
+        return _ann_index if _ann_index.sync() else None
+    except Exception as e:
+        logger.error(f"IVF index sync failed, falling back to an exact scan: {e}")
+        return None
+
+def _iter_index_hits(index, candidate_vectors, candidate_rows, min_score):
+    """Yields (candidate row, comp_id, score) for every index vector scoring >= min_score against a candidate vector."""
+    ann_index = _get_ann_index(index)
+    if ann_index is not None:
+        for k, neighbours in zip(candidate_rows, ann_index.search(candidate_vectors[candidate_rows], k=SIMILARITY_ANN_TOP_K)):
+            for comp_id, score in neighbours:
+                if score >= min_score:
+                    yield k, comp_id, score
+        return
+    index_keys, index_matrix = index.matrix()
+    if not len(index_keys):
+        return
+    for block_start, block in _iter_matrix_blocks(index_matrix):
+        block_scores = block @ candidate_vectors.T
+        for row, k in zip(*np.nonzero(block_scores >= min_score)):
+            yield int(k), index_keys[block_start + row], float(block_scores[row, k])
+
+def _text_fingerprint(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+def _encode_texts(model, texts):
+    """Encodes texts in one batched call. Returns an L2-normalized float32 matrix (one row per text)."""
+    vectors = model.encode(list(texts), batch_size=SIMILARITY_ENCODE_BATCH_SIZE, convert_to_numpy=True,
+                                    normalize_embeddings=True, show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+def _iter_matrix_blocks(matrix):
+    """Yields (first_row, float32 block) over a (possibly memory-mapped, float16) matrix, so only one block is upcast at a time."""
+    for start in range(0, matrix.shape[0], SIMILARITY_DOT_BLOCK_ROWS):
+        yield start, np.asarray(matrix[start:start + SIMILARITY_DOT_BLOCK_ROWS], dtype=np.float32)
+
+def _index_minhash_signatures(articles_data_list):
+    """Adds (or refreshes, when their comparison text changed) MinHash signatures for processed articles. No model needed."""
+    minhash_index = _get_minhash_index()
+    items = []
+    for article_data in articles_data_list:
+        article_id = article_data.get('id') if isinstance(article_data, dict) else None
+        if not article_id:
+            continue
+        _, text = _get_text_to_compare(article_data)
+        fingerprint = _text_fingerprint(text)
+        if minhash_index.get_fingerprint(article_id) != fingerprint:
+            items.append((article_id, minhash_index.signature(text), fingerprint))
+    return minhash_index.add_many(items)
+
+def index_articles(articles_data_list):
+    """
+    Adds (or refreshes, when their comparison text changed) index rows for processed articles: MinHash signatures first,
+    then embeddings, encoded in one batch. Articles whose text is too short to embed get a zero vector so their titles
+    still take part in title matching. Returns the number of embedding rows written.
+    """
+    _index_minhash_signatures(articles_data_list)
+    index = _get_content_index()
+    pending = []
+    for article_data in articles_data_list:
+        article_id = article_data.get('id') if isinstance(article_data, dict) else None
+        if not article_id:
+            continue
+        title, text = _get_text_to_compare(article_data)
+        fingerprint = _text_fingerprint(text)
+        indexed_metadata = index.get_metadata(article_id)
+        if article_id in index and indexed_metadata and indexed_metadata.get('text_fp') == fingerprint:
+            continue
+        pending.append((article_id, title, text, fingerprint))
+    model = _get_sentence_model() if pending else None
+    if model is None:
+        return 0
+    embeddable = [item for item in pending if len(item[2]) >= MIN_CONTENT_LENGTH_FOR_EMBEDDING]
+    title_index = _get_title_index()
+    new_titles = sorted({title for _, title, _, _ in pending if _title_needs_embedding(title) and _text_fingerprint(title) not in title_index})
+    texts_to_encode = [item[2] for item in embeddable] + new_titles
+    encoded = _encode_texts(model, texts_to_encode) if texts_to_encode else None
+    vectors = dict(zip((item[0] for item in embeddable), encoded[:len(embeddable)])) if embeddable else {}
+    if new_titles:
+        title_index.add_many([(_text_fingerprint(title), vector) for title, vector in zip(new_titles, encoded[len(embeddable):])])
+    zero_vector = np.zeros(model.get_sentence_embedding_dimension(), dtype=np.float32)
+    items = [(article_id, vectors.get(article_id, zero_vector)) for article_id, _, _, _ in pending]
+    metadata = {article_id: {'title': title, 'text_fp': fingerprint, 'has_content': article_id in vectors}
+                for article_id, title, _, fingerprint in pending}
+    return _get_content_index().add_many(items, metadata)
+
+def index_processed_article(article_data):
+    """Called when a processed article is saved. Never raises: a missing row is backfilled by the next similarity check."""
+    try:
+        return index_articles([article_data]) > 0
+    except Exception as e:
+        logger.error(f"Failed to add article {article_data.get('id', 'N/A')} to the similarity index: {e}")
         return False
-    if sentence_model is None:
-        try:
-            logger.info(f"Loading sentence transformer model: {SENTENCE_MODEL_NAME}...")
-            sentence_model = SentenceTransformer(SENTENCE_MODEL_NAME)
-            logger.info("Sentence transformer model loaded successfully.")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to load sentence transformer model '{SENTENCE_MODEL_NAME}': {e}")
-            return False
-    return True
+
+def sync_similarity_index(processed_json_dir, embeddings=True):
+    """
+    Backfills index rows for processed JSON files that are not indexed yet (only MinHash signatures when embeddings=False).
+    Returns the set of article ids on disk.
+    """
+    index = _get_content_index()
+    minhash_index = _get_minhash_index()
+    on_disk_ids = {os.path.basename(f_path)[:-len('.json')] for f_path in glob.glob(os.path.join(processed_json_dir, '*.json'))}
+    missing_ids = sorted(article_id for article_id in on_disk_ids if article_id not in minhash_index or (embeddings and article_id not in index))
+    if missing_ids:
+        logger.info(f"Backfilling similarity index with {len(missing_ids)} processed articles...")
+    for start in range(0, len(missing_ids), SIMILARITY_BACKFILL_CHUNK_SIZE):
+        chunk_data = []
+        for article_id in missing_ids[start:start + SIMILARITY_BACKFILL_CHUNK_SIZE]:
+            try:
+                with open(os.path.join(processed_json_dir, f"{article_id}.json"), 'r', encoding='utf-8') as f:
+                    historical_article_data = json.load(f)
+                if historical_article_data.get('id'):
+                    chunk_data.append(historical_article_data)
+            except Exception as e:
+                logger.warning(f"Could not load or parse historical JSON for {article_id} for similarity index: {e}")
+        if embeddings:
+            index_articles(chunk_data)
+        else:
+            _index_minhash_signatures(chunk_data)
+    return on_disk_ids
+
+def _indexed_titles_lookup(index):
+    """Lower-cased title -> indexed article ids, rebuilt only when the index has grown."""
+    index_rows = len(index)
+    if _title_lookup_cache['rows'] != index_rows:
+        titles = {}
+        for article_id in index.keys():
+            title = ((index.get_metadata(article_id) or {}).get('title') or '').strip().lower()
+            if title:
+                titles.setdefault(title, []).append(article_id)
+        _title_lookup_cache.update({'rows': index_rows, 'titles': titles})
+    return _title_lookup_cache['titles']
 
 def _get_text_to_compare(article_data_dict):
     """Extracts relevant text for comparison from article data."""
@@ -87,128 +269,289 @@ def run_similarity_check_agent(current_article_data, processed_json_dir, current
     Returns:
         dict: The current_article_data, updated with 'similarity_verdict' and 'similar_article_id'.
     """
-    article_id = current_article_data.get('id', 'N/A')
-    current_title, current_text_for_comparison = _get_text_to_compare(current_article_data)
+    return run_similarity_check_batch([current_article_data], processed_json_dir, current_run_processed_articles_data_list)[0]
 
-    if not current_title and not current_text_for_comparison:
-        logger.warning(f"Article {article_id} has no title or content for similarity check. Marking as OKAY.")
-        current_article_data['similarity_verdict'] = "OKAY_NO_CONTENT"
-        return current_article_data
 
-    # Attempt to load sentence model if available and not already loaded
-    model_loaded_successfully = _load_sentence_model() if SENTENCE_MODEL_AVAILABLE and sentence_model is None else (sentence_model is not None)
+def _needs_title_embedding(current_title, comp_title, content_sim_score):
+    """Title similarity only matters when it would lower the content threshold for this pair."""
+    return (content_sim_score is not None and CONTENT_SIMILARITY_FOR_EXACT_TITLE <= content_sim_score < SIMILARITY_THRESHOLD
+            and current_title.lower() != comp_title.lower()
+            and _title_needs_embedding(current_title) and _title_needs_embedding(comp_title))
 
-    current_embedding = None
-    if model_loaded_successfully and len(current_text_for_comparison) >= MIN_CONTENT_LENGTH_FOR_EMBEDDING:
-        try:
-            current_embedding = sentence_model.encode(current_text_for_comparison, convert_to_tensor=True)
-        except Exception as e:
-            logger.error(f"Error encoding current article {article_id} text: {e}")
-            model_loaded_successfully = False # Fallback to basic check for this article
-
-    comparison_sources = []
-    # 1. Articles processed earlier in the current run
-    if current_run_processed_articles_data_list:
-        for prev_article_data in current_run_processed_articles_data_list:
-            if prev_article_data.get('id') != article_id : # Don't compare to self if somehow in list
-                 comparison_sources.append(prev_article_data)
-
-    # 2. Historically processed articles from PROCESSED_JSON_DIR
-    # Avoid re-reading files if their data is already in current_run_processed_articles_data_list
-    current_run_ids = {art.get('id') for art in (current_run_processed_articles_data_list or [])}
-    
-    historical_files = glob.glob(os.path.join(processed_json_dir, '*.json'))
-    for f_path in historical_files:
-        hist_article_id = os.path.basename(f_path).replace('.json', '')
-        if hist_article_id == article_id or hist_article_id in current_run_ids:
-            continue # Skip self or already considered from current run
+def _title_embedding_similarities(model, title_pairs):
+    """
+    {(title_a, title_b): cosine similarity} in one vectorized pass over stored title embeddings. Titles not in the
+    title store yet (new candidates, articles indexed before titles were stored) are encoded in one batch and added.
+    """
+    distinct_titles = sorted({title for pair in title_pairs for title in pair})
+    if not distinct_titles:
+        return {}
+    title_index = _get_title_index()
+    fingerprints = {title: _text_fingerprint(title) for title in distinct_titles}
+    stored_vectors = title_index.get_many(fingerprints.values())
+    missing_titles = [title for title in distinct_titles if fingerprints[title] not in stored_vectors]
+    if missing_titles:
         try:
-            with open(f_path, 'r', encoding='utf-8') as f:
-                historical_article_data = json.load(f)
-            if historical_article_data.get('id'): # Basic check
-                comparison_sources.append(historical_article_data)
+            encoded = _encode_texts(model, missing_titles)
+            title_index.add_many([(fingerprints[title], vector) for title, vector in zip(missing_titles, encoded)])
+            stored_vectors.update((fingerprints[title], vector) for title, vector in zip(missing_titles, encoded))
         except Exception as e:
-            logger.warning(f"Could not load or parse historical JSON {f_path} for similarity: {e}")
-
-    if not comparison_sources:
-        logger.info(f"No historical or current-run articles to compare against for {article_id}. Marking as OKAY.")
-        current_article_data['similarity_verdict'] = "OKAY_NO_COMPARISON_DATA"
-        return current_article_data
-
-    logger.info(f"Checking similarity for article {article_id} ('{current_title[:50]}...') against {len(comparison_sources)} other articles.")
-
-    for comp_article_data in comparison_sources:
-        comp_article_id = comp_article_data.get('id')
-        comp_title, comp_text_for_comparison = _get_text_to_compare(comp_article_data)
-
-        # Basic check: Exact or very similar title (case-insensitive)
-        # This is a quick check before potentially expensive embedding
+            logger.warning(f"Error encoding {len(missing_titles)} titles for similarity: {e}")
+            return {}
+    row_of = {title: row for row, title in enumerate(distinct_titles)}
+    title_matrix = np.stack([stored_vectors[fingerprints[title]] for title in distinct_titles])
+    pairs = sorted(title_pairs)
+    left = title_matrix[[row_of[a] for a, _ in pairs]]
+    right = title_matrix[[row_of[b] for _, b in pairs]]
+    return dict(zip(pairs, np.einsum('ij,ij->i', left, right).tolist()))
+
+def _judge_comparisons(article_id, current_title, comparisons, title_similarities):
+    """
+    Applies the SIMILARITY_THRESHOLD / CONTENT_SIMILARITY_FOR_EXACT_TITLE rules to (comp_id, comp_title, content similarity or None)
+    comparisons. Returns the strongest (score, verdict, comp_id) match, or None.
+    """
+    best_match = None
+    for comp_article_id, comp_title, content_sim_score in comparisons:
+        # Exact or very similar title (case-insensitive)
         is_title_very_similar = False
         if current_title.lower() == comp_title.lower():
             is_title_very_similar = True
             logger.info(f"Article {article_id} has EXACT title match with {comp_article_id}.")
-        elif model_loaded_successfully and len(current_title) >= MIN_CONTENT_LENGTH_FOR_EMBEDDING and len(comp_title) >= MIN_CONTENT_LENGTH_FOR_EMBEDDING:
-            # If titles are not exact, check their embedding similarity
-            try:
-                title_embeddings = sentence_model.encode([current_title, comp_title], convert_to_tensor=True)
-                title_sim_score = st_util.pytorch_cos_sim(title_embeddings[0], title_embeddings[1]).item()
-                if title_sim_score >= EXACT_TITLE_SIMILARITY_THRESHOLD:
-                    is_title_very_similar = True
-                    logger.info(f"Article {article_id} title similarity with {comp_article_id} is {title_sim_score:.4f} (>= {EXACT_TITLE_SIMILARITY_THRESHOLD}).")
-            except Exception as e:
-                logger.warning(f"Error encoding titles for {article_id} vs {comp_article_id}: {e}")
-
+        elif title_similarities.get((current_title, comp_title), 0.0) >= EXACT_TITLE_SIMILARITY_THRESHOLD:
+            is_title_very_similar = True
+            logger.info(f"Article {article_id} title similarity with {comp_article_id} is {title_similarities[(current_title, comp_title)]:.4f} (>= {EXACT_TITLE_SIMILARITY_THRESHOLD}).")
 
-        # Semantic similarity check for content if sentence model is available
-        if model_loaded_successfully and current_embedding is not None and len(comp_text_for_comparison) >= MIN_CONTENT_LENGTH_FOR_EMBEDDING:
-            try:
-                comp_embedding = sentence_model.encode(comp_text_for_comparison, convert_to_tensor=True)
-                content_sim_score = st_util.pytorch_cos_sim(current_embedding, comp_embedding).item()
-
-                threshold_to_use = SIMILARITY_THRESHOLD
-                if is_title_very_similar:
-                    threshold_to_use = CONTENT_SIMILARITY_FOR_EXACT_TITLE
-                    logger.debug(f"Using lower content similarity threshold ({threshold_to_use}) due to very similar titles.")
-
-                if content_sim_score >= threshold_to_use:
-                    verdict = "DUPLICATE_SEMANTIC" if is_title_very_similar else "HIGHLY_SIMILAR_CONTENT"
-                    logger.warning(
-                        f"Article {article_id} ('{current_title[:30]}...') is {verdict} to "
-                        f"{comp_article_id} ('{comp_title[:30]}...'). "
-                        f"Content Similarity: {content_sim_score:.4f} (Threshold: {threshold_to_use:.2f})"
-                    )
-                    current_article_data['similarity_verdict'] = verdict
-                    current_article_data['similar_article_id'] = comp_article_id
-                    current_article_data['similarity_score'] = content_sim_score
-                    return current_article_data
-            except Exception as e:
-                logger.error(f"Error calculating content similarity between {article_id} and {comp_article_id}: {e}")
-                # Fallback to only title check if embedding fails for comparison article
-
-        # If content similarity check wasn't performed (e.g. model failed, short content) but titles were exact matches
-        elif is_title_very_similar: # and content check didn't run or didn't find similarity above its threshold
-            # This path is usually for when content sim is below CONTENT_SIMILARITY_FOR_EXACT_TITLE
-            # or if one of the contents was too short for embedding.
-            # An exact title match is a strong signal. For now, we let the content similarity be the decider
-            # if embeddings were possible. If embeddings were *not* possible (e.g. short content for one),
-            # an exact title match might be enough to flag as duplicate.
-            # Let's refine: if titles are exact and content check could not be performed reliably, consider it a duplicate.
-            if not model_loaded_successfully or current_embedding is None or len(comp_text_for_comparison) < MIN_CONTENT_LENGTH_FOR_EMBEDDING:
+        if content_sim_score is not None:
+            threshold_to_use = CONTENT_SIMILARITY_FOR_EXACT_TITLE if is_title_very_similar else SIMILARITY_THRESHOLD
+            if content_sim_score >= threshold_to_use:
+                verdict = "DUPLICATE_SEMANTIC" if is_title_very_similar else "HIGHLY_SIMILAR_CONTENT"
                 logger.warning(
-                    f"Article {article_id} ('{current_title[:30]}...') has EXACT title match with "
-                    f"{comp_article_id} ('{comp_title[:30]}...') and full content similarity check was not conclusive/possible. "
-                    f"Marking as DUPLICATE_BY_TITLE."
+                    f"Article {article_id} ('{current_title[:30]}...') is {verdict} to "
+                    f"{comp_article_id} ('{comp_title[:30]}...'). "
+                    f"Content Similarity: {content_sim_score:.4f} (Threshold: {threshold_to_use:.2f})"
                 )
-                current_article_data['similarity_verdict'] = "DUPLICATE_BY_TITLE_ONLY"
-                current_article_data['similar_article_id'] = comp_article_id
-                current_article_data['similarity_score'] = 1.0 # For title
-                return current_article_data
+                if best_match is None or content_sim_score > best_match[0]:
+                    best_match = (content_sim_score, verdict, comp_article_id)
+        elif is_title_very_similar:
+            # Titles match and a content comparison was not possible (one of the texts is too short to embed, or no model).
+            logger.warning(
+                f"Article {article_id} ('{current_title[:30]}...') has EXACT title match with "
+                f"{comp_article_id} ('{comp_title[:30]}...') and full content similarity check was not conclusive/possible. "
+                f"Marking as DUPLICATE_BY_TITLE."
+            )
+            if best_match is None:
+                best_match = (1.0, "DUPLICATE_BY_TITLE_ONLY", comp_article_id)
+    return best_match
+
+def _apply_verdict(article_data, best_match):
+    if best_match:
+        article_data['similarity_verdict'] = best_match[1]
+        article_data['similar_article_id'] = best_match[2]
+        article_data['similarity_score'] = best_match[0]
+    else:
+        logger.info(f"Article {article_data.get('id', 'N/A')} passed similarity checks.")
+        article_data['similarity_verdict'] = "OKAY"
+    return article_data
 
+def _minhash_prefilter(candidates, processed_json_dir, current_run_processed_articles_data_list=None):
+    """
+    Rejects candidates whose text is a near-copy (estimated shingle Jaccard >= SIMILARITY_MINHASH_THRESHOLD) of a processed
+    article, an article from the current run or an earlier candidate. Returns the candidates left for the embedding check.
+    Index entries of articles no longer in processed_json_dir are ignored.
+    """
+    try:
+        comparable_ids = sync_similarity_index(processed_json_dir, embeddings=False)
+    except Exception as e:
+        logger.error(f"Failed to sync MinHash index from {processed_json_dir}: {e}")
+        comparable_ids = set()
+    minhash_index = _get_minhash_index()
+    extra_signatures = [] # (comp_id, signature) for current-run articles not indexed with their current text, then passed candidates
+    for prev_article_data in (current_run_processed_articles_data_list or []):
+        prev_id = prev_article_data.get('id')
+        if not prev_id:
+            continue
+        comparable_ids.add(prev_id)
+        _, prev_text = _get_text_to_compare(prev_article_data)
+        if minhash_index.get_fingerprint(prev_id) != _text_fingerprint(prev_text):
+            prev_signature = minhash_index.signature(prev_text)
+            if prev_signature is not None:
+                extra_signatures.append((prev_id, prev_signature))
+    remaining = []
+    for candidate in candidates:
+        article_data, article_id, title, text = candidate
+        signature = minhash_index.signature(text)
+        if signature is None:
+            remaining.append(candidate)
+            continue
+        matches = [(comp_id, jaccard) for comp_id, jaccard in minhash_index.query(signature, SIMILARITY_MINHASH_THRESHOLD, exclude=(article_id,))
+                   if comp_id in comparable_ids]
+        if extra_signatures:
+            extra_similarities = estimate_jaccard(signature, np.stack([extra_signature for _, extra_signature in extra_signatures]))
+            matches.extend((comp_id, float(similarity)) for (comp_id, _), similarity in zip(extra_signatures, extra_similarities)
+                           if similarity >= SIMILARITY_MINHASH_THRESHOLD and comp_id != article_id)
+        if matches:
+            comp_id, jaccard = max(matches, key=lambda match: match[1])
+            logger.warning(f"Article {article_id} ('{title[:30]}...') is NEAR_DUPLICATE_TEXT of {comp_id}. "
+                           f"Estimated shingle Jaccard: {jaccard:.3f} (Threshold: {SIMILARITY_MINHASH_THRESHOLD:.2f})")
+            _apply_verdict(article_data, (jaccard, "NEAR_DUPLICATE_TEXT", comp_id))
+        else:
+            remaining.append(candidate)
+            extra_signatures.append((article_id, signature))
+    return remaining
+
+def run_similarity_check_batch(candidate_articles_data_list, processed_json_dir, current_run_processed_articles_data_list=None):
+    """
+    Similarity verdicts for a whole research run's candidates at once.
 
-    logger.info(f"Article {article_id} passed similarity checks.")
-    current_article_data['similarity_verdict'] = "OKAY"
-    return current_article_data
+    Near-copies are rejected first by the MinHash/LSH prefilter. The remaining candidates are encoded in one batched call;
+    candidate x history scores come from one blockwise matrix product against the persistent index (or an IVF search of
+    it, see SIMILARITY_ANN), candidate x current-run and candidate x candidate scores from small dense products.
+    Candidates are judged in list order with the same rules as a single check, and a candidate that comes out OKAY joins
+    the comparison set of the candidates after it (intra-run duplicates keep the first occurrence).
 
+    Returns:
+        list: The candidate dicts, each updated in place with 'similarity_verdict' (and 'similar_article_id' /
+              'similarity_score' when flagged).
+    """
+    candidates = [] # (article_data, article_id, title, text)
+    for article_data in candidate_articles_data_list:
+        article_id = article_data.get('id', 'N/A')
+        title, text = _get_text_to_compare(article_data)
+        if not title and not text:
+            logger.warning(f"Article {article_id} has no title or content for similarity check. Marking as OKAY.")
+            article_data['similarity_verdict'] = "OKAY_NO_CONTENT"
+            continue
+        candidates.append((article_data, article_id, title, text))
+    # 0. Exact and near-exact copies are caught from MinHash signatures; only the rest reach the model
+    candidates = _minhash_prefilter(candidates, processed_json_dir, current_run_processed_articles_data_list)
+    if not candidates:
+        return candidate_articles_data_list
+
+    model = _get_sentence_model()
+    if model is None:
+        _run_title_only_batch(candidates, processed_json_dir, current_run_processed_articles_data_list)
+        return candidate_articles_data_list
+
+    # 1. Encode every candidate in one call (zero rows for texts too short to embed)
+    embedding_dim = model.get_sentence_embedding_dimension()
+    candidate_vectors = np.zeros((len(candidates), embedding_dim), dtype=np.float32)
+    candidate_has_vector = np.zeros(len(candidates), dtype=bool)
+    embeddable_rows = [k for k, candidate in enumerate(candidates) if len(candidate[3]) >= MIN_CONTENT_LENGTH_FOR_EMBEDDING]
+    if embeddable_rows:
+        try:
+            candidate_vectors[embeddable_rows] = _encode_texts(model, [candidates[k][3] for k in embeddable_rows])
+            candidate_has_vector[embeddable_rows] = True
+        except Exception as e:
+            logger.error(f"Error encoding {len(embeddable_rows)} candidate articles: {e}")
+
+    # 2. Articles processed earlier in the current run (from memory; encoded here unless already indexed with the same text)
+    index = _get_content_index()
+    run_entries = [] # (comp_id, comp_title, vector or None)
+    run_to_encode = []
+    for prev_article_data in (current_run_processed_articles_data_list or []):
+        prev_id = prev_article_data.get('id')
+        if not prev_id:
+            continue
+        prev_title, prev_text = _get_text_to_compare(prev_article_data)
+        indexed_metadata = index.get_metadata(prev_id)
+        if len(prev_text) < MIN_CONTENT_LENGTH_FOR_EMBEDDING:
+            run_entries.append((prev_id, prev_title, None))
+        elif prev_id in index and indexed_metadata and indexed_metadata.get('text_fp') == _text_fingerprint(prev_text):
+            run_entries.append((prev_id, prev_title, index.get(prev_id)))
+        else:
+            run_to_encode.append((prev_id, prev_title, prev_text))
+    if run_to_encode:
+        try:
+            run_entries.extend((prev_id, prev_title, vector) for (prev_id, prev_title, _), vector in zip(run_to_encode, _encode_texts(model, [item[2] for item in run_to_encode])))
+        except Exception as e:
+            logger.error(f"Error encoding {len(run_to_encode)} current-run articles for comparison: {e}")
+            run_entries.extend((prev_id, prev_title, None) for prev_id, prev_title, _ in run_to_encode)
+    run_ids = {entry[0] for entry in run_entries}
+    run_scores = np.stack([entry[2] if entry[2] is not None else np.zeros(embedding_dim, dtype=np.float32) for entry in run_entries]) @ candidate_vectors.T \
+        if run_entries else np.zeros((0, len(candidates)), dtype=np.float32) # (current-run x candidates)
+
+    # 3. Historically processed articles: candidate x history scores in one blockwise pass over the index
+    try:
+        historical_ids = sync_similarity_index(processed_json_dir) - run_ids
+    except Exception as e:
+        logger.error(f"Failed to sync similarity index from {processed_json_dir}: {e}")
+        historical_ids = set()
+    historical_hits = [{} for _ in candidates] # per candidate: comp_id -> (comp_title, content similarity or None)
+    if historical_ids:
+        if candidate_has_vector.any():
+            min_score = min(SIMILARITY_THRESHOLD, CONTENT_SIMILARITY_FOR_EXACT_TITLE)
+            for k, comp_id, score in _iter_index_hits(index, candidate_vectors, np.flatnonzero(candidate_has_vector), min_score):
+                comp_metadata = index.get_metadata(comp_id) or {}
+                if comp_id in historical_ids and comp_id != candidates[k][1] and comp_metadata.get('has_content'):
+                    historical_hits[k][comp_id] = (comp_metadata.get('title', ''), score)
+        indexed_titles = _indexed_titles_lookup(index)
+        for k, (_, article_id, title, _) in enumerate(candidates):
+            for comp_id in indexed_titles.get(title.lower(), []):
+                if comp_id in historical_ids and comp_id != article_id and comp_id not in historical_hits[k]:
+                    comp_metadata = index.get_metadata(comp_id) or {}
+                    content_score = float(index.get(comp_id) @ candidate_vectors[k]) if (candidate_has_vector[k] and comp_metadata.get('has_content')) else None
+                    historical_hits[k][comp_id] = (comp_metadata.get('title', ''), content_score)
+
+    # 4. Candidate x candidate scores, and title similarities for every pair whose verdict could depend on them
+    intra_scores = candidate_vectors @ candidate_vectors.T
+    comparisons_per_candidate = []
+    title_pairs = set()
+    for k, (_, article_id, title, _) in enumerate(candidates):
+        comparisons = [(comp_id, comp_title, float(run_scores[r, k]) if (vector is not None and candidate_has_vector[k]) else None)
+                       for r, (comp_id, comp_title, vector) in enumerate(run_entries) if comp_id != article_id]
+        comparisons.extend((comp_id, comp_title, score) for comp_id, (comp_title, score) in historical_hits[k].items())
+        comparisons_per_candidate.append(comparisons)
+        title_pairs.update((title, comp_title) for _, comp_title, score in comparisons if _needs_title_embedding(title, comp_title, score))
+        title_pairs.update((title, candidates[i][2]) for i in range(k)
+                           if candidate_has_vector[i] and candidate_has_vector[k] and _needs_title_embedding(title, candidates[i][2], float(intra_scores[i, k])))
+    title_similarities = _title_embedding_similarities(model, title_pairs)
+
+    # 5. Verdicts, in order; OKAY candidates become comparison targets for later ones
+    accepted_rows = []
+    for k, (article_data, article_id, title, _) in enumerate(candidates):
+        comparisons = comparisons_per_candidate[k] + [
+            (candidates[i][1], candidates[i][2], float(intra_scores[i, k]) if (candidate_has_vector[i] and candidate_has_vector[k]) else None)
+            for i in accepted_rows if candidates[i][1] != article_id]
+        historical_count = len(historical_ids) - (article_id in historical_ids)
+        if not comparisons and not historical_count:
+            logger.info(f"No historical or current-run articles to compare against for {article_id}. Marking as OKAY.")
+            article_data['similarity_verdict'] = "OKAY_NO_COMPARISON_DATA"
+            accepted_rows.append(k)
+            continue
+        logger.info(f"Checking similarity for article {article_id} ('{title[:50]}...') against {historical_count + len(comparisons) - len(historical_hits[k])} "
+                    f"other articles ({len(comparisons)} candidates after the index pass).")
+        _apply_verdict(article_data, _judge_comparisons(article_id, title, comparisons, title_similarities))
+        if article_data['similarity_verdict'].startswith("OKAY"):
+            accepted_rows.append(k)
+    return candidate_articles_data_list
+
+
+def _run_title_only_batch(candidates, processed_json_dir, current_run_processed_articles_data_list=None):
+    """Fallback without a sentence model: exact (case-insensitive) title matches against the current run, processed_json and earlier candidates."""
+    run_sources = [(prev.get('id'), (prev.get('title') or '').strip()) for prev in (current_run_processed_articles_data_list or []) if prev.get('id')]
+    run_ids = {comp_id for comp_id, _ in run_sources}
+    historical_sources = []
+    for f_path in glob.glob(os.path.join(processed_json_dir, '*.json')):
+        hist_article_id = os.path.basename(f_path).replace('.json', '')
+        if hist_article_id in run_ids:
+            continue
+        try:
+            with open(f_path, 'r', encoding='utf-8') as f:
+                historical_article_data = json.load(f)
+            if historical_article_data.get('id'):
+                historical_sources.append((historical_article_data['id'], (historical_article_data.get('title') or '').strip()))
+        except Exception as e:
+            logger.warning(f"Could not load or parse historical JSON {f_path} for similarity: {e}")
+    accepted_sources = []
+    for article_data, article_id, title, _ in candidates:
+        comparisons = [(comp_id, comp_title, None) for comp_id, comp_title in run_sources + historical_sources + accepted_sources if comp_id != article_id]
+        if not comparisons:
+            logger.info(f"No historical or current-run articles to compare against for {article_id}. Marking as OKAY.")
+            article_data['similarity_verdict'] = "OKAY_NO_COMPARISON_DATA"
+        else:
+            _apply_verdict(article_data, _judge_comparisons(article_id, title, comparisons, {}))
+        if article_data['similarity_verdict'].startswith("OKAY"):
+            accepted_sources.append((article_id, title))
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG) # Enable DEBUG for standalone test
@@ -221,6 +564,9 @@ if __name__ == "__main__":
     # Create dummy processed_json directory and files for testing
     test_processed_dir = os.path.join(PROJECT_ROOT, 'data', 'test_processed_json_sim')
     os.makedirs(test_processed_dir, exist_ok=True)
+    _content_index = EmbeddingStore(os.path.join(test_processed_dir, 'similarity_index'), 'content', model_name=SENTENCE_MODEL_NAME, normalize=True)
+    _title_index = EmbeddingStore(os.path.join(test_processed_dir, 'similarity_index'), 'titles', model_name=SENTENCE_MODEL_NAME, normalize=True)
+    _minhash_index = MinHashLSHIndex(os.path.join(test_processed_dir, 'similarity_index'), 'content')
 
     dummy_article_1 = {
         "id": "hist001", "title": "Old Tech Advances",
@@ -285,9 +631,15 @@ if __name__ == "__main__":
     result4 = run_similarity_check_agent(current_article_intra_run_dup.copy(), test_processed_dir, current_run_processed_list_updated) # Pass original data of run001
     print(f"Verdict: {result4.get('similarity_verdict')}, Similar ID: {result4.get('similar_article_id')}, Score: {result4.get('similarity_score')}")
 
+    print("\n--- Test 5: Whole Run Checked as One Batch ---")
+    batch_results = run_similarity_check_batch(
+        [current_article_new.copy(), current_article_duplicate.copy(), current_article_similar_content.copy(), current_article_intra_run_dup.copy()],
+        test_processed_dir, current_run_processed_list)
+    for batch_result in batch_results:
+        print(f"{batch_result['id']}: {batch_result.get('similarity_verdict')}, Similar ID: {batch_result.get('similar_article_id')}, Score: {batch_result.get('similarity_score')}")
+
 
     # Cleanup test files
-    for f_name in ["hist001.json", "hist002.json"]:
-        os.remove(os.path.join(test_processed_dir, f_name))
-    os.rmdir(test_processed_dir)
+    import shutil
+    shutil.rmtree(test_processed_dir)
     print("\n--- Similarity Check Agent Standalone Test Complete ---")
\ No newline at end of file
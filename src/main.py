@@ -35,9 +35,11 @@ except ImportError as e:
 
 # --- Import Agent and Scraper Functions ---
 try:
-    from src.agents.research_agent import run_research_agent
+    from src.utils.http_client import http_post
+    from src.utils.model_registry import get_model_registry
+    from src.agents.research_agent import stream_research_agent
     from src.agents.filter_news_agent import run_filter_agent
-    from src.agents.similarity_check_agent import run_similarity_check_agent
+    from src.agents.similarity_check_agent import run_similarity_check_agent, index_processed_article
     from src.agents.keyword_generator_agent import run_keyword_generator_agent
     from src.agents.title_generator_agent import run_title_generator_agent
     from src.agents.description_generator_agent import run_description_generator_agent
@@ -142,7 +144,7 @@ PUBLIC_DIR = os.path.join(PROJECT_ROOT_FOR_PATH, 'public')
 OUTPUT_HTML_DIR = os.path.join(PUBLIC_DIR, 'articles')
 TEMPLATE_DIR = os.path.join(PROJECT_ROOT_FOR_PATH, 'templates')
 ALL_ARTICLES_FILE = os.path.join(PUBLIC_DIR, 'all_articles.json')
-ARTICLE_MAX_AGE_DAYS_FILTER = 30
+ARTICLE_MAX_AGE_DAYS_FILTER = int(os.getenv('ARTICLE_MAX_AGE_DAYS_FILTER', '30'))
 TWITTER_DAILY_LIMIT_FILE = os.path.join(DATA_DIR_MAIN, 'twitter_daily_limit.json')
 POST_TEMPLATE_FILE = os.path.join(TEMPLATE_DIR, 'post_template.html')
 
@@ -234,6 +236,8 @@ def save_processed_data(filepath, article_data_to_save):
          with open(filepath, 'w', encoding='utf-8') as f:
              json.dump(article_data_to_save, f, indent=4, ensure_ascii=False)
          logger.info(f"Successfully saved processed data: {os.path.basename(filepath)}")
+         if os.path.dirname(os.path.abspath(filepath)) == os.path.abspath(PROCESSED_JSON_DIR):
+             index_processed_article(article_data_to_save) # Keeps the similarity index current; no-op if the text is unchanged
          return True
     except Exception as e:
         logger.error(f"Failed to save processed data to {os.path.basename(filepath)}: {e}")
@@ -305,7 +309,7 @@ def send_make_webhook(webhook_url, data_payload):
     payload_to_send = {"articles": data_payload} if isinstance(data_payload, list) else data_payload
     log_id_info_str = f"batch of {len(data_payload)} articles" if isinstance(data_payload, list) else f"article ID: {data_payload.get('id', 'N/A')}"
     try:
-        response = requests.post(webhook_url, headers={'Content-Type': 'application/json'}, json=payload_to_send, timeout=30)
+        response = http_post(webhook_url, headers={'Content-Type': 'application/json'}, json=payload_to_send, timeout=30)
         response.raise_for_status() 
         logger.info(f"Successfully sent {log_id_info_str} to Make.com webhook.")
         return True
@@ -780,10 +784,12 @@ if __name__ == "__main__":
     logger.info("--- Stage 1: Checking/Regenerating HTML from Existing Processed Data ---")
     all_processed_json_files = glob.glob(os.path.join(PROCESSED_JSON_DIR, '*.json'))
     html_regenerated_count = 0
+    existing_article_titles = [] # Source titles of processed articles, for the research agent's duplicate pre-screen
     for proc_json_filepath in all_processed_json_files:
         try:
             article_data_from_file = load_article_data(proc_json_filepath)
             if article_data_from_file:
+                if article_data_from_file.get('title'): existing_article_titles.append(article_data_from_file['title'])
                 # The regenerate_article_html_if_needed function now expects section content to be
                 # within article_data_from_file['article_plan']['sections'][i]['generated_content_for_section']
                 # If this key is missing (e.g., older JSONs), it will log a warning and might skip sections.
@@ -794,12 +800,12 @@ if __name__ == "__main__":
             logger.exception(f"Error during HTML regeneration check for {os.path.basename(proc_json_filepath)}: {regen_exc}")
     logger.info(f"--- HTML Regeneration Stage Complete. Regenerated/Verified {html_regenerated_count} files based on template hash. ---")
 
-    logger.info("--- Stage 2: Running Research Agent (Feeds & Gyro Picks) ---")
-    newly_researched_articles_data_list = []
+    logger.info("--- Stage 2: Preparing Research Agent (Feeds & Gyro Picks) ---")
     MAX_ARTICLES_PER_RUN = int(os.getenv('MAX_ARTICLES_PER_RUN', '5')) 
+    all_articles_summary_data_for_run = load_all_articles_data_from_json() 
+    gyro_picks_to_process = []
     try:
         gyro_pick_files = glob.glob(os.path.join(RAW_WEB_RESEARCH_OUTPUT_DIR, 'gyro-*.json'))
-        gyro_picks_to_process = []
         for gyro_file in gyro_pick_files:
             try:
                 with open(gyro_file, 'r', encoding='utf-8') as gf:
@@ -814,24 +820,25 @@ if __name__ == "__main__":
                         os.rename(gyro_file, os.path.join(processed_gyro_dir, os.path.basename(gyro_file)))
             except Exception as e_gyro_load:
                 logger.error(f"Error loading Gyro Pick file {gyro_file}: {e_gyro_load}")
-        
-        newly_researched_articles_data_list = run_research_agent(
-            processed_ids_set=fully_processed_article_ids_set.copy(), 
-            max_articles_to_fetch=MAX_ARTICLES_PER_RUN,
-            gyro_picks_data_list=gyro_picks_to_process 
-        )
-    except Exception as research_e:
-        logger.exception(f"Research Agent run critically failed: {research_e}")
-    logger.info(f"Research Agent run completed. Returned {len(newly_researched_articles_data_list)} new raw articles for processing.")
+    except Exception as gyro_e:
+        logger.exception(f"Gyro Pick collection failed: {gyro_e}")
 
-    logger.info("--- Stage 3: Processing Newly Researched Articles ---")
-    all_articles_summary_data_for_run = load_all_articles_data_from_json() 
+    # Research runs on a background thread and hands articles over through a bounded queue, so each
+    # article is processed as soon as it has been researched while the next one is being fetched.
+    logger.info("--- Stage 3: Processing Newly Researched Articles (as the Research Agent yields them) ---")
     current_run_fully_processed_data_accumulator = [] 
-    successfully_processed_count = 0; failed_or_skipped_count = 0
+    successfully_processed_count = 0; failed_or_skipped_count = 0; researched_articles_count = 0
     social_media_payloads_for_posting_queue = []
 
-    if newly_researched_articles_data_list:
-        for new_article_raw_data in newly_researched_articles_data_list:
+    researched_articles_stream = stream_research_agent(
+        processed_ids_set=fully_processed_article_ids_set.copy(), 
+        max_articles_to_fetch=MAX_ARTICLES_PER_RUN,
+        gyro_picks_data_list=gyro_picks_to_process,
+        existing_titles=existing_article_titles
+    )
+    try:
+        for new_article_raw_data in researched_articles_stream:
+            researched_articles_count += 1
             if not new_article_raw_data or not isinstance(new_article_raw_data, dict):
                 logger.warning("Research agent returned an invalid item (not a dict or None). Skipping.")
                 failed_or_skipped_count +=1
@@ -862,7 +869,10 @@ if __name__ == "__main__":
                                 logger.error(f"Could not move processed Gyro Pick source {gyro_source_file}: {e_mv_gyro}")
             else:
                 failed_or_skipped_count += 1
-    logger.info(f"Newly researched articles processing cycle complete. Successfully processed: {successfully_processed_count}, Failed/Skipped: {failed_or_skipped_count}")
+    finally:
+        researched_articles_stream.close() # Stops the research thread if processing bailed out early
+    logger.info(f"Newly researched articles processing cycle complete. Researched: {researched_articles_count}, Successfully processed: {successfully_processed_count}, Failed/Skipped: {failed_or_skipped_count}")
+    get_model_registry().log_metrics() # Load time / memory of the models shared by the agents this run
 
     logger.info(f"--- Stage 3.5: Queuing Unposted Processed Articles (Last {MAX_AGE_FOR_SOCIAL_POST_HOURS}h) for Social Media ---")
     social_post_history_data = load_social_post_history()
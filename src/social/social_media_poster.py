@@ -10,47 +10,35 @@ import requests
 
 from dotenv import load_dotenv
 
+# --- Path Setup & Logging ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.dirname(SCRIPT_DIR)
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.utils.http_client import http_get
+from src.utils.lazy_import import lazy_module
+
+# The platform SDKs are only located here; each is imported when clients are initialized or a post is made.
 # --- For Bluesky ---
-try:
-    from atproto import Client as BskyClient, models as bsky_models
-    # For TextBuilder if used for manual facet creation:
-    # from atproto.client_utils import TextBuilder
-    # For specific exceptions if needed:
-    # from atproto.exceptions import SomeSpecificBskyException
-    BskyAPIError = Exception # General exception for now
-except ImportError:
-    BskyClient = None
-    bsky_models = None
-    # TextBuilder = None
-    BskyAPIError = None
+BskyClient = lazy_module('atproto', 'Client')
+bsky_models = lazy_module('atproto', 'models')
+BskyAPIError = Exception if BskyClient else None # General exception for now
+if not BskyClient:
     logging.warning("atproto SDK not found. Bluesky posting will be disabled. Run: pip install atproto")
 
 # --- For Reddit ---
-try:
-    import praw
-    from prawcore.exceptions import Forbidden, NotFound
-except ImportError:
-    praw = None
-    Forbidden = None
-    NotFound = None
+praw = lazy_module('praw')
+if not praw:
     logging.warning("praw library not found. Reddit posting will be disabled. Run: pip install praw")
 
 # --- For Twitter ---
-try:
-    import tweepy
-except ImportError:
-    tweepy = None
+tweepy = lazy_module('tweepy')
+if not tweepy:
     logging.warning("tweepy library not found. Twitter posting will be disabled. Run: pip install 'tweepy>=4.0.0'")
 
-
-# --- Path Setup & Logging ---
-SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
-SRC_DIR = os.path.dirname(SCRIPT_DIR)
-PROJECT_ROOT = os.path.dirname(SRC_DIR)
-
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
-
 logger = logging.getLogger(__name__)
 if not logging.getLogger().hasHandlers():
     logging.basicConfig(
@@ -249,7 +237,7 @@ def post_to_bluesky(client_instance, title, article_url, summary_short=None, ima
     if image_url:
         try:
             logger.debug(f"Attempting to download image for Bluesky card: {image_url}")
-            img_response = requests.get(image_url, timeout=15)
+            img_response = http_get(image_url, timeout=15)
             img_response.raise_for_status()
             image_bytes = img_response.content
 
@@ -314,6 +302,7 @@ def post_to_reddit(reddit_instance, title, article_url, image_url=None):
     if not TARGET_SUBREDDITS_WITH_FLAIRS:
         logger.warning("No target subreddits configured for Reddit. Skipping.")
         return False
+    from prawcore.exceptions import Forbidden, NotFound
 
     success_count = 0
     for sub_config in TARGET_SUBREDDITS_WITH_FLAIRS:
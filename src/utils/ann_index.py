@@ -0,0 +1,236 @@
+# src/utils/ann_index.py
+
+"""
+Inverted-file (IVF-flat) approximate nearest-neighbour index over an EmbeddingStore, in pure NumPy.
+
+The store's rows are partitioned into `nlist` cells by spherical k-means. A query is compared with
+the cell centroids, the `nprobe` closest cells are opened, and every row in them is scored with an
+exact dot product against the stored vector; the top-k of those exact scores is returned. nprobe is
+the recall/latency knob: 1 scans ~N/nlist rows, nlist degenerates into brute force.
+
+Files, next to the store's own (`<name>` = the store name):
+    <name>.ivf.npy     centroids, float32 (nlist x dim)
+    <name>.ivf.assign  int32 cell id per store row, appended as rows are added
+    <name>.ivf.json    {"nlist", "dim", "model", "trained_rows", "assigned_rows"}
+
+`sync()` brings the index up to date with the store: trains it once the store has enough rows,
+assigns rows added since the last sync to their nearest centroid (incremental insert), and retrains
+from scratch when the store has grown IVF_RETRAIN_GROWTH times past the size it was trained on.
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.embedding_store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+IVF_MIN_TRAIN_ROWS: int = int(os.getenv('IVF_MIN_TRAIN_ROWS', '1000')) # Below this, brute force is as fast and exact
+IVF_DEFAULT_NPROBE: int = int(os.getenv('IVF_DEFAULT_NPROBE', '8'))
+IVF_RETRAIN_GROWTH: float = float(os.getenv('IVF_RETRAIN_GROWTH', '4')) # Retrain when rows > trained_rows * this
+IVF_TRAIN_SAMPLE_PER_LIST: int = 64 # k-means training sample size per cell
+IVF_TRAIN_MAX_SAMPLE: int = 131072
+IVF_TRAIN_ITERATIONS: int = 12
+IVF_ASSIGN_BLOCK_ROWS: int = 65536
+
+
+def default_nlist(n_rows: int) -> int:
+    """~sqrt(N) cells, clamped to [16, 4096]."""
+    return int(np.clip(round(np.sqrt(max(1, n_rows))), 16, 4096))
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+def _nearest_centroids(matrix: Any, centroids: np.ndarray) -> np.ndarray:
+    """Cell id (max dot product) for every row, computed one float32 block at a time."""
+    assignments = np.empty(matrix.shape[0], dtype=np.int32)
+    for start in range(0, matrix.shape[0], IVF_ASSIGN_BLOCK_ROWS):
+        block = np.asarray(matrix[start:start + IVF_ASSIGN_BLOCK_ROWS], dtype=np.float32)
+        assignments[start:start + block.shape[0]] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+def train_centroids(sample: np.ndarray, nlist: int, iterations: int = IVF_TRAIN_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Spherical k-means (dot-product assignment, normalised mean update). Empty cells are re-seeded from random sample rows."""
+    rng = np.random.default_rng(seed)
+    sample = _normalize_rows(np.asarray(sample, dtype=np.float32))
+    nlist = min(nlist, sample.shape[0])
+    centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignments = _nearest_centroids(sample, centroids)
+        order = np.argsort(assignments, kind='stable')
+        counts = np.bincount(assignments, minlength=nlist)
+        sums = np.zeros_like(centroids)
+        non_empty = np.flatnonzero(counts)
+        sums[non_empty] = np.add.reduceat(sample[order], np.concatenate(([0], np.cumsum(counts)[:-1]))[non_empty], axis=0)
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = sample[rng.choice(sample.shape[0], len(empty), replace=False)]
+        centroids = _normalize_rows(sums)
+    return centroids
+
+
+class IVFFlatIndex:
+    """Thread-safe IVF-flat index persisted next to the EmbeddingStore it indexes."""
+
+    def __init__(self, store: EmbeddingStore, nlist: Optional[int] = None, nprobe: int = IVF_DEFAULT_NPROBE,
+                 min_train_rows: int = IVF_MIN_TRAIN_ROWS, seed: int = 0):
+        self.store = store
+        self.requested_nlist = nlist
+        self.nprobe = max(1, nprobe)
+        self.min_train_rows = min_train_rows
+        self.seed = seed
+        base_path = os.path.join(store.directory, f"{store.name}.ivf")
+        self.centroids_path = f"{base_path}.npy"
+        self.assign_path = f"{base_path}.assign"
+        self.meta_path = f"{base_path}.json"
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._centroids: Optional[np.ndarray] = None
+        self._meta: Dict[str, Any] = {}
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None # Cell id -> store rows, rebuilt lazily after inserts
+        self.stats: Dict[str, int] = {'queries': 0, 'rows_scored': 0, 'trainings': 0, 'rows_inserted': 0}
+
+    # --- Persistence ---
+    def _reset(self) -> None:
+        self._centroids = None
+        self._meta = {}
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists = None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not (os.path.exists(self.meta_path) and os.path.exists(self.centroids_path)):
+            return
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            centroids = np.load(self.centroids_path)
+            assigned_rows = int(meta.get('assigned_rows', 0))
+            assignments = np.fromfile(self.assign_path, dtype=np.int32, count=assigned_rows) if os.path.exists(self.assign_path) else np.zeros(0, dtype=np.int32)
+            if len(assignments) < assigned_rows:
+                raise ValueError(f"assignment file holds {len(assignments)} rows, expected {assigned_rows}")
+            self._centroids, self._meta, self._assignments = centroids.astype(np.float32), meta, assignments
+        except Exception as e:
+            logger.error(f"Failed to load IVF index for '{self.store.name}': {e}. It will be retrained.")
+            self._reset()
+
+    def _write_meta(self) -> None:
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    # --- Building ---
+    def _train(self, row_keys: List[str], matrix: Any) -> None:
+        n_rows = len(row_keys)
+        nlist = self.requested_nlist or default_nlist(n_rows)
+        rng = np.random.default_rng(self.seed)
+        live_rows = np.flatnonzero(np.asarray([bool(key) for key in row_keys]))
+        sample_size = min(len(live_rows), max(nlist, min(IVF_TRAIN_MAX_SAMPLE, nlist * IVF_TRAIN_SAMPLE_PER_LIST)))
+        sample_rows = np.sort(rng.choice(live_rows, sample_size, replace=False))
+        self._centroids = train_centroids(np.asarray(matrix[sample_rows], dtype=np.float32), nlist, seed=self.seed)
+        self._assignments = _nearest_centroids(matrix, self._centroids)
+        self._meta = {'nlist': int(self._centroids.shape[0]), 'dim': int(self._centroids.shape[1]), 'model': self.store.model_name,
+                      'trained_rows': n_rows, 'assigned_rows': n_rows}
+        os.makedirs(self.store.directory, exist_ok=True)
+        np.save(self.centroids_path, self._centroids)
+        with open(self.assign_path, 'wb') as f:
+            f.write(self._assignments.tobytes())
+        self._write_meta()
+        self._lists = None
+        self.stats['trainings'] += 1
+        logger.info(f"Trained IVF index for '{self.store.name}': {n_rows} rows in {self._meta['nlist']} cells.")
+
+    def sync(self) -> bool:
+        """Trains, extends or retrains the index to cover every store row. Returns False while the store is too small to index."""
+        with self._lock:
+            self._load()
+            row_keys, matrix = self.store.raw_matrix()
+            n_rows = len(row_keys)
+            if matrix is None or n_rows < self.min_train_rows:
+                return False
+            stale = (self._centroids is None or self._meta.get('dim') != matrix.shape[1] or self._meta.get('model') != self.store.model_name
+                     or len(self._assignments) > n_rows # Store was reset/rebuilt underneath us
+                     or n_rows > self._meta.get('trained_rows', 0) * IVF_RETRAIN_GROWTH)
+            if stale:
+                self._train(row_keys, matrix)
+            elif len(self._assignments) < n_rows:
+                new_assignments = _nearest_centroids(matrix[len(self._assignments):n_rows], self._centroids)
+                with open(self.assign_path, 'ab') as f:
+                    if f.tell() != len(self._assignments) * 4: # Drop a tail left by an interrupted append
+                        f.truncate(len(self._assignments) * 4)
+                        f.seek(len(self._assignments) * 4)
+                    f.write(new_assignments.tobytes())
+                self._assignments = np.concatenate([self._assignments, new_assignments])
+                self._meta['assigned_rows'] = n_rows
+                self._write_meta()
+                self._lists = None
+                self.stats['rows_inserted'] += len(new_assignments)
+            return True
+
+    def _cell_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            order = np.argsort(self._assignments, kind='stable')
+            bounds = np.cumsum(np.bincount(self._assignments, minlength=self._centroids.shape[0]))
+            self._lists = np.split(order.astype(np.int64), bounds[:-1])
+        return self._lists
+
+    # --- Queries ---
+    def search(self, queries: np.ndarray, k: int = 10, nprobe: Optional[int] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k (key, exact score) per query row, best first. Call sync() first; rows added to the store since the
+        last sync are not searched.
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        with self._lock:
+            self._load()
+            if self._centroids is None:
+                raise RuntimeError(f"IVF index for '{self.store.name}' is not trained; call sync() first.")
+            row_keys, matrix = self.store.raw_matrix()
+            cell_lists = self._cell_lists()
+            probe_count = min(nprobe or self.nprobe, len(cell_lists))
+            probed_cells = np.argpartition(-(queries @ self._centroids.T), probe_count - 1, axis=1)[:, :probe_count]
+            # Score cell by cell, so each cell's rows are gathered and upcast once for all the queries probing it
+            queries_per_cell: Dict[int, List[int]] = {}
+            for query_row, cells in enumerate(probed_cells):
+                for cell in cells:
+                    queries_per_cell.setdefault(int(cell), []).append(query_row)
+            rows_per_query: List[List[np.ndarray]] = [[] for _ in range(len(queries))]
+            scores_per_query: List[List[np.ndarray]] = [[] for _ in range(len(queries))]
+            for cell, query_rows in queries_per_cell.items():
+                cell_rows = cell_lists[cell]
+                if not len(cell_rows):
+                    continue
+                cell_scores = np.asarray(matrix[cell_rows], dtype=np.float32) @ queries[query_rows].T
+                for column, query_row in enumerate(query_rows):
+                    rows_per_query[query_row].append(cell_rows)
+                    scores_per_query[query_row].append(cell_scores[:, column])
+                self.stats['rows_scored'] += len(cell_rows) * len(query_rows)
+            results: List[List[Tuple[str, float]]] = []
+            for query_rows, query_scores in zip(rows_per_query, scores_per_query):
+                if not query_rows:
+                    results.append([])
+                    continue
+                candidate_rows, scores = np.concatenate(query_rows), np.concatenate(query_scores)
+                top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+                top = top[np.argsort(-scores[top])]
+                results.append([(row_keys[candidate_rows[i]], float(scores[i])) for i in top if row_keys[candidate_rows[i]]])
+            self.stats['queries'] += len(queries)
+            return results
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            self._load()
+            return {**self.stats, 'nlist': self._meta.get('nlist'), 'assigned_rows': len(self._assignments), 'nprobe': self.nprobe}
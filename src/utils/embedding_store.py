@@ -0,0 +1,234 @@
+# src/utils/embedding_store.py
+
+"""
+Append-only, memory-mapped store of embedding vectors keyed by string ids.
+
+Layout inside `directory` for a store called `name`:
+    <name>.vectors      raw row-major matrix (float16 by default), one row per stored vector
+    <name>.index.json   snapshot {"dim", "dtype", "model", "keys": [...], "metadata": {key: {...}}, "seq"}
+    <name>.index.jsonl  journal of inserts since the snapshot, one {"keys": [...], "metadata": {...}, "seq"} per line
+
+Vectors are appended to the end of the matrix file and the insert is then appended to the journal,
+so a crash between the two only leaves unused rows at the tail. The snapshot is rewritten only when
+the journal is compacted (see src/utils/json_journal.py), which keeps inserts amortised O(1).
+Reads go through a read-only `np.memmap`, so a large store costs almost no RSS until rows
+are actually touched. Re-adding an existing key appends a new row and repoints the key.
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.json_journal import JsonJournal
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+class EmbeddingStore:
+    """
+    A thread-safe embedding store persisted as a raw matrix plus a JSON snapshot and journal.
+
+    `model_name` is recorded in the sidecar; a store built with a different model is ignored (and
+    overwritten on the next write). With normalize=True vectors are L2-normalised before storage,
+    so a dot product against the matrix is a cosine similarity.
+    """
+
+    def __init__(self, directory: str, name: str, model_name: Optional[str] = None, dtype: str = 'float16', normalize: bool = False):
+        self.directory = directory
+        self.name = name
+        self.model_name = model_name
+        self.dtype = np.dtype(dtype)
+        self.normalize = normalize
+        self.vectors_path = os.path.join(directory, f"{name}.vectors")
+        self.index_path = os.path.join(directory, f"{name}.index.json")
+        self.journal_path = os.path.join(directory, f"{name}.index.jsonl")
+        self._journal = JsonJournal(self.index_path, self.journal_path)
+        self._snapshot_stale = True # The next write must rewrite the snapshot (none on disk, or it belongs to another model)
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dim: Optional[int] = None
+        self._keys: List[str] = [] # Row -> key ('' for rows orphaned by a re-add)
+        self._key_to_row: Dict[str, int] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._memmap: Optional[np.memmap] = None
+        self._memmap_rows = 0
+
+    # --- Loading ---
+    def _reset(self) -> None:
+        self._dim = None
+        self._keys = []
+        self._key_to_row = {}
+        self._metadata = {}
+        self._memmap = None
+        self._memmap_rows = 0
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            index, records = self._journal.load()
+            if index is None:
+                return
+            if self.model_name and index.get('model') and index['model'] != self.model_name:
+                logger.warning(f"Embedding store '{self.name}' was built with model '{index['model']}', expected '{self.model_name}'. Starting empty.")
+                return
+            if np.dtype(index.get('dtype', 'float16')) != self.dtype:
+                logger.warning(f"Embedding store '{self.name}' has dtype {index.get('dtype')}, expected {self.dtype}. Starting empty.")
+                return
+            dim = int(index.get('dim') or 0)
+            self._keys = list(index.get('keys', []))
+            self._key_to_row = {key: row for row, key in enumerate(self._keys) if key}
+            self._metadata = index.get('metadata', {}) or {}
+            for record in records:
+                self._append_keys(record.get('keys', []))
+                self._metadata.update(record.get('metadata') or {})
+            file_rows = (os.path.getsize(self.vectors_path) // (dim * self.dtype.itemsize)) if dim and os.path.exists(self.vectors_path) else 0
+            if file_rows < len(self._keys):
+                logger.error(f"Embedding store '{self.name}' is truncated ({file_rows} rows on disk, {len(self._keys)} indexed). Starting empty.")
+                self._reset()
+                return
+            self._dim = dim or None
+            self._snapshot_stale = False
+            logger.debug(f"Loaded embedding store '{self.name}' with {len(self._key_to_row)} vectors (dim={self._dim}).")
+        except Exception as e:
+            logger.error(f"Failed to load embedding store '{self.name}' from {self.directory}: {e}. Starting empty.")
+            self._reset()
+
+    def _matrix_view(self) -> Optional[np.ndarray]:
+        rows = len(self._keys)
+        if not rows or not self._dim:
+            return None
+        if self._memmap is None or self._memmap_rows != rows:
+            self._memmap = np.memmap(self.vectors_path, dtype=self.dtype, mode='r', shape=(rows, self._dim))
+            self._memmap_rows = rows
+        return self._memmap
+
+    # --- Reads ---
+    @property
+    def dim(self) -> Optional[int]:
+        with self._lock:
+            self._load()
+            return self._dim
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._key_to_row)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._load()
+            return key in self._key_to_row
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            self._load()
+            return list(self._key_to_row)
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Returns the stored vector as float32, or None."""
+        with self._lock:
+            self._load()
+            row = self._key_to_row.get(key)
+            if row is None:
+                return None
+            return np.asarray(self._matrix_view()[row], dtype=np.float32)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            self._load()
+            matrix = self._matrix_view()
+            found = {key: self._key_to_row[key] for key in keys if key in self._key_to_row}
+            return {key: np.asarray(matrix[row], dtype=np.float32) for key, row in found.items()}
+
+    def get_metadata(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._load()
+            return self._metadata.get(key)
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """
+        Returns (keys, matrix) for every live key, in insertion order. The matrix rows are float32 copies
+        only when orphaned rows exist; otherwise it is the read-only memmap itself.
+        """
+        with self._lock:
+            self._load()
+            matrix = self._matrix_view()
+            if matrix is None:
+                return [], np.zeros((0, self._dim or 0), dtype=np.float32)
+            if len(self._key_to_row) == len(self._keys):
+                return list(self._keys), matrix
+            live_rows = sorted(self._key_to_row.values())
+            return [self._keys[row] for row in live_rows], np.asarray(matrix[live_rows])
+
+    def raw_matrix(self) -> Tuple[List[str], Optional[np.ndarray]]:
+        """
+        (row_keys, memmap) over every stored row, orphaned rows included (their key is ''). Row numbers never change,
+        so indexes built on top of the store (see ann_index.IVFFlatIndex) can refer to rows by position.
+        """
+        with self._lock:
+            self._load()
+            return list(self._keys), self._matrix_view()
+
+    # --- Writes ---
+    def add_many(self, items: Sequence[Tuple[str, Any]], metadata: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """Appends (key, vector) pairs and persists them. Returns the number of vectors written."""
+        if not items:
+            return 0
+        with self._lock:
+            self._load()
+            vectors = np.asarray([np.asarray(vector, dtype=np.float32).reshape(-1) for _, vector in items], dtype=np.float32)
+            if self._dim is None:
+                self._dim = int(vectors.shape[1])
+            if vectors.shape[1] != self._dim:
+                raise ValueError(f"Embedding store '{self.name}' expects dim {self._dim}, got {vectors.shape[1]}")
+            if self.normalize:
+                norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                vectors = vectors / np.where(norms == 0, 1.0, norms)
+            os.makedirs(self.directory, exist_ok=True)
+            expected_bytes = len(self._keys) * self._dim * self.dtype.itemsize
+            with open(self.vectors_path, 'ab') as f:
+                if f.tell() != expected_bytes: # Drop rows left behind by an interrupted write
+                    f.truncate(expected_bytes)
+                    f.seek(expected_bytes)
+                f.write(vectors.astype(self.dtype).tobytes())
+            keys = [key for key, _ in items]
+            self._append_keys(keys)
+            if metadata:
+                self._metadata.update(metadata)
+            self._memmap = None
+            if self._snapshot_stale or self._journal.needs_compaction(len(self._key_to_row)):
+                self._compact()
+            else:
+                self._journal.append({'keys': keys, 'metadata': metadata or {}})
+            return len(items)
+
+    def add(self, key: str, vector: Any, metadata: Optional[Dict[str, Any]] = None) -> None:
+        self.add_many([(key, vector)], {key: metadata} if metadata else None)
+
+    def _append_keys(self, keys: Iterable[str]) -> None:
+        """Points each key at a new row at the end of the matrix, orphaning its previous row."""
+        for key in keys:
+            old_row = self._key_to_row.get(key)
+            if old_row is not None:
+                self._keys[old_row] = ''
+            self._key_to_row[key] = len(self._keys)
+            self._keys.append(key)
+
+    def _compact(self) -> None:
+        self._journal.compact({'dim': self._dim, 'dtype': self.dtype.name, 'model': self.model_name,
+                               'keys': self._keys, 'metadata': self._metadata})
+        self._snapshot_stale = False
+
+    def compact(self) -> None:
+        """Folds the journal into the snapshot now (it is also done automatically as the journal grows)."""
+        with self._lock:
+            self._load()
+            if self._keys:
+                self._compact()
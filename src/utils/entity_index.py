@@ -0,0 +1,162 @@
+# src/utils/entity_index.py
+
+"""
+Hot-reloadable index of the important people and companies/products in data/important_entities.json.
+
+EntityIndex.snapshot() returns an immutable EntitySnapshot: the validated entity lists, the derived
+categories (top-tier people/companies, AI companies, all people/companies), O(1) lookups in both
+directions and a compiled PhraseMatcher over every category plus any extra phrase groups the caller
+registers (the filter agent's indicator lists).
+
+The file is re-checked at most every `check_interval` seconds. A changed (mtime, size) triggers a read,
+and the snapshot is only rebuilt when the content hash differs, so touching the file costs one read. An
+edit that does not parse or validate is logged and the previous snapshot stays in service; a long-lived
+worker picks up a new entity list without a restart (and without reloading its models).
+
+Settings (environment):
+    ENTITY_INDEX_CHECK_SECONDS  minimum seconds between file checks; 0 = check on every snapshot() call
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from src.utils.entity_matcher import PhraseMatcher
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+ENTITY_INDEX_CHECK_SECONDS: float = float(os.getenv('ENTITY_INDEX_CHECK_SECONDS', '2'))
+REQUIRED_KEYS: Tuple[str, ...] = ("people", "companies_products")
+# Derived categories: (category, source list, substrings that put an entity of that list in the category)
+CATEGORY_RULES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ("top_tier_people", "people", ("elon musk", "sam altman", "satya nadella", "jensen huang", "sundar pichai")),
+    ("top_tier_companies", "companies_products", ("openai", "google", "microsoft", "nvidia", "tesla", "meta", "apple", "amazon")),
+    ("ai_companies", "companies_products", ("ai", "anthropic", "deepmind", "stability")),
+)
+
+
+class EntitySnapshot:
+    """One parsed version of the entities file. Never mutated after construction; share it freely across threads."""
+
+    def __init__(self, people: List[str], companies_products: List[str], extra_groups: Mapping[str, Iterable[str]],
+                 content_hash: Optional[str] = None):
+        self.people = people
+        self.companies_products = companies_products
+        self.all_entities = list(set(people + companies_products))
+        self.content_hash = content_hash
+        self.categories: Dict[str, List[str]] = _derive_categories(people, companies_products)
+        self._category_sets: Dict[str, FrozenSet[str]] = {category: frozenset(entities) for category, entities in self.categories.items()}
+        entity_categories: Dict[str, List[str]] = {}
+        for category, entities in self.categories.items():
+            for entity in entities:
+                entity_categories.setdefault(entity, []).append(category)
+        self._entity_categories: Dict[str, Tuple[str, ...]] = {entity: tuple(dict.fromkeys(categories)) for entity, categories in entity_categories.items()}
+        self.matcher = PhraseMatcher({**extra_groups, **self.categories}, whole_word_groups=self.categories.keys())
+
+    def category(self, category: str) -> List[str]:
+        """The category's entities in file order ([] for an unknown category)."""
+        return self.categories.get(category, [])
+
+    def in_category(self, entity: str, category: str) -> bool:
+        return entity.strip().lower() in self._category_sets.get(category, frozenset())
+
+    def categories_of(self, entity: str) -> Tuple[str, ...]:
+        """Every category containing `entity` (case-insensitive), in category order."""
+        return self._entity_categories.get(entity.strip().lower(), ())
+
+
+def _derive_categories(people: List[str], companies_products: List[str]) -> Dict[str, List[str]]:
+    """Applies CATEGORY_RULES with one substring automaton per source list instead of nested any(name in entity) scans."""
+    sources = {"people": people, "companies_products": companies_products}
+    categories: Dict[str, List[str]] = {category: [] for category, _, _ in CATEGORY_RULES}
+    for source, entities in sources.items():
+        rules = {category: names for category, rule_source, names in CATEGORY_RULES if rule_source == source}
+        if not rules:
+            continue
+        rule_matcher = PhraseMatcher(rules, whole_word_groups=())
+        for entity in entities:
+            for category, matched_names in rule_matcher.find(entity).items():
+                if matched_names:
+                    categories[category].append(entity)
+    categories["all_people"] = people
+    categories["all_companies"] = companies_products
+    return categories
+
+def parse_entities(data: object, source: str) -> Tuple[List[str], List[str]]:
+    """Validated, lower-cased (people, companies_products) from the decoded JSON. Raises ValueError on a bad structure."""
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid structure in {source}: top level is not an object")
+    for key in REQUIRED_KEYS:
+        if key not in data or not isinstance(data[key], list):
+            raise ValueError(f"Invalid structure in {source}: missing or invalid '{key}' field")
+    people = [p.strip().lower() for p in data["people"] if isinstance(p, str) and p.strip()]
+    companies_products = [cp.strip().lower() for cp in data["companies_products"] if isinstance(cp, str) and cp.strip()]
+    return people, companies_products
+
+
+class EntityIndex:
+    """Watches an entities JSON file and serves the current EntitySnapshot, rebuilding it only when the content changes."""
+
+    def __init__(self, path: str, extra_groups: Optional[Mapping[str, Iterable[str]]] = None,
+                 check_interval: float = ENTITY_INDEX_CHECK_SECONDS):
+        self.path = path
+        self.check_interval = check_interval
+        self._extra_groups = {group: list(phrases) for group, phrases in (extra_groups or {}).items()}
+        self._lock = threading.Lock()
+        self._snapshot = EntitySnapshot([], [], self._extra_groups)
+        self._file_state: Optional[Tuple[int, int]] = None # (mtime_ns, size) of the last file read
+        self._next_check = 0.0
+        self.loads = 0
+        self.refresh(force=True)
+
+    def snapshot(self) -> EntitySnapshot:
+        """The current snapshot, after re-checking the file if `check_interval` has elapsed."""
+        if time.monotonic() >= self._next_check:
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self, force: bool = False) -> bool:
+        """Re-reads the file if it changed (or always, with force). Returns True when a new snapshot was installed."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                if force or self._file_state is not None:
+                    logger.error(f"CRITICAL: {self.path} not found. Entity-based filtering will use {'the last loaded entities' if self._snapshot.content_hash else 'no entities'}.")
+                self._file_state = None
+                return False
+            file_state = (stat.st_mtime_ns, stat.st_size)
+            if not force and file_state == self._file_state:
+                return False
+            self._file_state = file_state
+            try:
+                with open(self.path, 'rb') as f:
+                    raw = f.read()
+                content_hash = hashlib.sha256(raw).hexdigest()
+                if content_hash == self._snapshot.content_hash:
+                    return False
+                people, companies_products = parse_entities(json.loads(raw.decode('utf-8')), self.path)
+                snapshot = EntitySnapshot(people, companies_products, self._extra_groups, content_hash)
+            except json.JSONDecodeError as e:
+                logger.error(f"CRITICAL: JSON decode error in {self.path}: {e}. Keeping the previous entities.")
+                return False
+            except ValueError as e:
+                logger.error(f"{e}. Keeping the previous entities.")
+                return False
+            except Exception as e:
+                logger.error(f"CRITICAL: Unexpected error loading {self.path}: {e}. Keeping the previous entities.")
+                return False
+            reloaded = self._snapshot.content_hash is not None
+            self._snapshot = snapshot
+            self.loads += 1
+            logger.info(f"{'Reloaded' if reloaded else 'Loaded'} {len(people)} people, {len(companies_products)} companies/products. "
+                        f"Top tier: {len(snapshot.category('top_tier_people'))} people, {len(snapshot.category('top_tier_companies'))} companies.")
+            return True
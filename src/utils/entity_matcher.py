@@ -0,0 +1,112 @@
+# src/utils/entity_matcher.py
+
+"""
+Multi-phrase matcher (Aho-Corasick) that finds every phrase of every group in one pass over a text.
+
+Groups are named phrase lists, e.g. the entity categories from data/important_entities.json or the
+breaking/technical/hype indicator lists. A phrase that appears in several groups is matched once.
+Per group, phrases are either plain substrings (`phrase in text`) or whole words with exactly the
+semantics of `re.search(r'\b' + re.escape(phrase) + r'\b', text)`: a word boundary must hold at both
+ends of at least one occurrence, where a word character is what `\w` matches on str (alphanumeric or '_').
+
+The automaton is compiled into a full transition table over the phrases' alphabet, so the scan is one
+dict lookup per character; characters outside the alphabet reset to the root. Matching is case-sensitive:
+callers lower-case both the phrases and the text, as the filter agent already does.
+"""
+
+import logging
+from collections import deque
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class PhraseMatcher:
+    """Compiled once from {group: [phrases]}; find() returns each group's matched phrases in the group's order."""
+
+    def __init__(self, groups: Mapping[str, Iterable[str]], whole_word_groups: Optional[Iterable[str]] = None):
+        """`whole_word_groups`: groups whose phrases must match on word boundaries (default: all of them)."""
+        self._groups: Dict[str, List[int]] = {}
+        self._phrases: List[str] = []
+        self._whole_word: List[bool] = []
+        whole_word = set(groups) if whole_word_groups is None else set(whole_word_groups)
+        pattern_ids: Dict[Tuple[str, bool], int] = {}
+        for group, phrases in groups.items():
+            ids = []
+            for phrase in phrases:
+                if not phrase:
+                    continue
+                key = (phrase, group in whole_word)
+                if key not in pattern_ids:
+                    pattern_ids[key] = len(self._phrases)
+                    self._phrases.append(phrase)
+                    self._whole_word.append(key[1])
+                ids.append(pattern_ids[key])
+            self._groups[group] = ids
+        self._lengths = [len(phrase) for phrase in self._phrases]
+        self._delta, self._outputs = self._compile()
+        logger.debug(f"Compiled phrase matcher: {len(self._phrases)} distinct phrases in {len(self._groups)} groups, {len(self._delta)} states.")
+
+    def _compile(self) -> Tuple[List[Dict[str, int]], List[Tuple[int, ...]]]:
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[int, ...]] = [()]
+        for pattern_id, phrase in enumerate(self._phrases):
+            state = 0
+            for char in phrase:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append(())
+                state = next_state
+            outputs[state] += (pattern_id,)
+
+        # Breadth-first: a state's failure target is shallower, so its row of the transition table is already complete
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(char, 0) if state else 0
+                outputs[child] += outputs[fail[child]]
+                queue.append(child)
+            delta[state] = {**delta[fail[state]], **goto[state]}
+        return delta, outputs
+
+    def _matched_pattern_ids(self, text: str) -> Set[int]:
+        delta, outputs, lengths, whole_word = self._delta, self._outputs, self._lengths, self._whole_word
+        found: Set[int] = set()
+        text_length = len(text)
+        state = 0
+        for end, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            for pattern_id in outputs[state]:
+                if pattern_id in found:
+                    continue
+                if whole_word[pattern_id]:
+                    start = end - lengths[pattern_id] + 1
+                    before_is_word = start > 0 and _is_word_char(text[start - 1])
+                    after_is_word = end + 1 < text_length and _is_word_char(text[end + 1])
+                    if before_is_word == _is_word_char(text[start]) or after_is_word == _is_word_char(char):
+                        continue
+                found.add(pattern_id)
+        return found
+
+    def find(self, text: str) -> Dict[str, List[str]]:
+        """{group: matched phrases, in the group's original order} for every group (empty lists included)."""
+        found = self._matched_pattern_ids(text)
+        return {group: [self._phrases[pattern_id] for pattern_id in ids if pattern_id in found] for group, ids in self._groups.items()}
+
+    def __len__(self) -> int:
+        return len(self._phrases)
@@ -0,0 +1,237 @@
+# src/utils/feed_health.py
+
+"""
+Persisted per-feed health statistics and adaptive polling schedule.
+
+For every RSS/Atom feed the research agent polls, the registry keeps running counters
+(polls, failures, bozo parses, latency, HTTP status codes, entries seen, new entries,
+articles produced, last new item) in data/feed_health.json. From these it derives when a
+feed should next be polled:
+    - feeds that yield new entries are polled every run,
+    - failing feeds (network errors, HTTP >= 400, non-feed bodies) back off exponentially,
+    - feeds that keep returning nothing new back off exponentially after a short grace period.
+
+Run `python -m src.utils.feed_health` (or the Dacoola Tools menu) for a cost/yield report.
+"""
+
+import os
+import sys
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+# --- Path Setup ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.dirname(SCRIPT_DIR)
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from dotenv import load_dotenv
+dotenv_path = os.path.join(PROJECT_ROOT, '.env')
+load_dotenv(dotenv_path=dotenv_path)
+# --- End Path Setup ---
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+FEED_HEALTH_FILE: str = os.path.join(PROJECT_ROOT, 'data', 'feed_health.json')
+FEED_HEALTH_FAILURE_BACKOFF_BASE_HOURS: float = float(os.getenv('FEED_HEALTH_FAILURE_BACKOFF_BASE_HOURS', '1'))
+FEED_HEALTH_FAILURE_BACKOFF_MAX_HOURS: float = float(os.getenv('FEED_HEALTH_FAILURE_BACKOFF_MAX_HOURS', '48'))
+FEED_HEALTH_LOW_YIELD_GRACE_POLLS: int = int(os.getenv('FEED_HEALTH_LOW_YIELD_GRACE_POLLS', '3')) # Empty polls before backing off
+FEED_HEALTH_LOW_YIELD_BACKOFF_MAX_HOURS: float = float(os.getenv('FEED_HEALTH_LOW_YIELD_BACKOFF_MAX_HOURS', '12'))
+FEED_HEALTH_DUE_TOLERANCE_MINUTES: float = float(os.getenv('FEED_HEALTH_DUE_TOLERANCE_MINUTES', '10')) # Hourly cron start times drift
+FEED_HEALTH_LATENCY_EWMA_ALPHA: float = 0.3
+
+ISO_FORMAT: str = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+def _to_iso(dt: datetime) -> str:
+    return dt.strftime(ISO_FORMAT)
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, ISO_FORMAT).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+def _new_feed_record() -> Dict[str, Any]:
+    return {
+        'polls': 0, 'failures': 0, 'consecutive_failures': 0, 'consecutive_empty_polls': 0,
+        'bozo_parses': 0, 'parses': 0, 'latency_ewma': None, 'total_seconds': 0.0,
+        'status_counts': {}, 'last_status': None, 'last_error': None,
+        'entries_seen': 0, 'new_entries': 0, 'articles_produced': 0, 'skipped_polls': 0,
+        'last_polled_at': None, 'last_new_item_at': None, 'next_poll_at': None,
+    }
+
+
+class FeedHealthRegistry:
+    """Thread-safe per-feed stats registry persisted to a JSON file."""
+
+    def __init__(self, file_path: str = FEED_HEALTH_FILE):
+        self.file_path = file_path
+        self._feeds: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            feeds = data.get('feeds') if isinstance(data, dict) else None
+            if isinstance(feeds, dict):
+                for feed_url, record in feeds.items():
+                    if isinstance(record, dict):
+                        self._feeds[feed_url] = {**_new_feed_record(), **record}
+            else:
+                logger.warning(f"Feed health file {self.file_path} has invalid format. Starting fresh.")
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding JSON from {self.file_path}. Starting fresh.")
+        except Exception as e:
+            logger.error(f"Error loading feed health file {self.file_path}: {e}")
+
+    def save(self) -> bool:
+        with self._lock:
+            tmp_path = f"{self.file_path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'feeds': self._feeds}, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_path, self.file_path)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to save feed health to {self.file_path}: {e}")
+                return False
+
+    def _record(self, feed_url: str) -> Dict[str, Any]:
+        record = self._feeds.get(feed_url)
+        if record is None:
+            record = _new_feed_record()
+            self._feeds[feed_url] = record
+        return record
+
+    # --- Scheduling ---
+    def is_due(self, feed_url: str, now: Optional[datetime] = None) -> bool:
+        with self._lock:
+            record = self._feeds.get(feed_url)
+            next_poll_at = _from_iso(record.get('next_poll_at')) if record else None
+            if next_poll_at is None:
+                return True
+            return next_poll_at <= (now or _now()) + timedelta(minutes=FEED_HEALTH_DUE_TOLERANCE_MINUTES)
+
+    def select_due_feeds(self, feed_urls: List[str]) -> List[str]:
+        """Returns the feeds due this run (in the given order) and counts a skipped poll for the rest."""
+        now = _now()
+        due: List[str] = []
+        with self._lock:
+            for feed_url in feed_urls:
+                if self.is_due(feed_url, now):
+                    due.append(feed_url)
+                else:
+                    self._record(feed_url)['skipped_polls'] += 1
+        return due
+
+    def _schedule_next_poll(self, record: Dict[str, Any], now: datetime) -> None:
+        delay_hours = 0.0
+        if record['consecutive_failures']:
+            delay_hours = min(FEED_HEALTH_FAILURE_BACKOFF_BASE_HOURS * (2 ** (record['consecutive_failures'] - 1)),
+                              FEED_HEALTH_FAILURE_BACKOFF_MAX_HOURS)
+        elif record['consecutive_empty_polls'] > FEED_HEALTH_LOW_YIELD_GRACE_POLLS:
+            excess_empty_polls = record['consecutive_empty_polls'] - FEED_HEALTH_LOW_YIELD_GRACE_POLLS
+            delay_hours = min(FEED_HEALTH_FAILURE_BACKOFF_BASE_HOURS * (2 ** (excess_empty_polls - 1)),
+                              FEED_HEALTH_LOW_YIELD_BACKOFF_MAX_HOURS)
+        record['next_poll_at'] = _to_iso(now + timedelta(hours=delay_hours)) if delay_hours else None
+
+    # --- Recording ---
+    def record_poll(self, feed_url: str, status: Optional[int], elapsed: float, failed: bool, error: Optional[str] = None,
+                    parsed: bool = False, bozo: bool = False, entries: int = 0, new_entries: int = 0) -> None:
+        """
+        Records one poll. `failed` marks polls that produced no usable feed (network error, HTTP >= 400,
+        non-feed body); `new_entries` counts entries that were not processed before and passed pre-screen.
+        """
+        now = _now()
+        with self._lock:
+            record = self._record(feed_url)
+            record['polls'] += 1
+            record['total_seconds'] = round(record['total_seconds'] + elapsed, 3)
+            record['latency_ewma'] = round(elapsed if record['latency_ewma'] is None else
+                                           FEED_HEALTH_LATENCY_EWMA_ALPHA * elapsed + (1 - FEED_HEALTH_LATENCY_EWMA_ALPHA) * record['latency_ewma'], 3)
+            status_key = str(status) if status is not None else 'error'
+            record['status_counts'][status_key] = record['status_counts'].get(status_key, 0) + 1
+            record['last_status'] = status
+            record['last_polled_at'] = _to_iso(now)
+            if parsed:
+                record['parses'] += 1
+                record['bozo_parses'] += int(bozo)
+            record['entries_seen'] += entries
+            record['new_entries'] += new_entries
+            if failed:
+                record['failures'] += 1
+                record['consecutive_failures'] += 1
+                record['last_error'] = error
+            else:
+                record['consecutive_failures'] = 0
+                if new_entries:
+                    record['consecutive_empty_polls'] = 0
+                    record['last_new_item_at'] = _to_iso(now)
+                else:
+                    record['consecutive_empty_polls'] += 1
+            self._schedule_next_poll(record, now)
+            if record['next_poll_at']:
+                logger.info(f"Feed health: backing off {feed_url} until {record['next_poll_at']} "
+                            f"({record['consecutive_failures']} consecutive failures, {record['consecutive_empty_polls']} empty polls).")
+
+    def record_article_produced(self, feed_url: str) -> None:
+        with self._lock:
+            self._record(feed_url)['articles_produced'] += 1
+
+    # --- Reporting ---
+    def report_rows(self) -> List[Dict[str, Any]]:
+        """One summary row per feed, costliest time-per-new-entry first."""
+        rows: List[Dict[str, Any]] = []
+        with self._lock:
+            for feed_url, record in self._feeds.items():
+                polls = record['polls'] or 0
+                rows.append({
+                    'feed_url': feed_url, 'polls': polls, 'skipped_polls': record['skipped_polls'],
+                    'failure_rate': (record['failures'] / polls) if polls else 0.0,
+                    'bozo_rate': (record['bozo_parses'] / record['parses']) if record['parses'] else 0.0,
+                    'latency_ewma': record['latency_ewma'], 'total_seconds': record['total_seconds'],
+                    'new_entries': record['new_entries'], 'articles_produced': record['articles_produced'],
+                    'seconds_per_new_entry': record['total_seconds'] / max(1, record['new_entries']),
+                    'last_status': record['last_status'], 'last_new_item_at': record['last_new_item_at'],
+                    'next_poll_at': record['next_poll_at'],
+                })
+        rows.sort(key=lambda row: (row['seconds_per_new_entry'], row['total_seconds']), reverse=True)
+        return rows
+
+
+def format_feed_health_report(registry: FeedHealthRegistry) -> str:
+    rows = registry.report_rows()
+    if not rows:
+        return "No feed health data recorded yet."
+    lines = [f"{'Feed':<60} {'Polls':>5} {'Skip':>5} {'Fail%':>6} {'Bozo%':>6} {'Lat(s)':>7} {'Total(s)':>9} "
+             f"{'New':>5} {'Arts':>5} {'s/New':>7} {'Last':>5}  {'Last new item':<20}  Next poll"]
+    for row in rows:
+        feed_label = row['feed_url'] if len(row['feed_url']) <= 60 else row['feed_url'][:57] + '...'
+        latency = f"{row['latency_ewma']:.2f}" if row['latency_ewma'] is not None else '-'
+        lines.append(f"{feed_label:<60} {row['polls']:>5} {row['skipped_polls']:>5} {row['failure_rate'] * 100:>5.0f}% "
+                     f"{row['bozo_rate'] * 100:>5.0f}% {latency:>7} {row['total_seconds']:>9.1f} {row['new_entries']:>5} "
+                     f"{row['articles_produced']:>5} {row['seconds_per_new_entry']:>7.1f} {str(row['last_status'] or '-'):>5}  "
+                     f"{row['last_new_item_at'] or 'never':<20}  {row['next_poll_at'] or 'every run'}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_feed_health_report(FeedHealthRegistry()))
@@ -0,0 +1,182 @@
+# src/utils/host_scheduler.py
+
+"""
+Per-host politeness scheduler for outbound HTTP requests.
+
+Each host gets its own token bucket (steady request rate plus a small burst) and a cap on
+simultaneous requests. A 429/503 response carrying Retry-After blocks that host until the
+given time. Only requests to the *same* host ever wait for each other; requests to different
+hosts go straight through, so worker threads fetching from many publishers/CDNs stay busy
+instead of sitting in fixed global sleeps.
+
+`http_client.http_request` runs every request through `get_host_scheduler().slot(url)`.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+# --- Path Setup ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.dirname(SCRIPT_DIR)
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from dotenv import load_dotenv
+dotenv_path = os.path.join(PROJECT_ROOT, '.env')
+load_dotenv(dotenv_path=dotenv_path)
+# --- End Path Setup ---
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+HOST_RATE_PER_SECOND: float = float(os.getenv('HOST_RATE_PER_SECOND', '1.0')) # Steady requests/second per host
+HOST_BURST: float = float(os.getenv('HOST_BURST', '2')) # Requests a host may receive back-to-back after being idle
+HOST_MAX_CONCURRENCY: int = int(os.getenv('HOST_MAX_CONCURRENCY', '2')) # Simultaneous requests per host
+HOST_RETRY_AFTER_MAX_SECONDS: float = float(os.getenv('HOST_RETRY_AFTER_MAX_SECONDS', '120')) # Cap on honoured Retry-After
+HOST_RETRY_AFTER_STATUS_CODES = (429, 503)
+# Optional per-host overrides, "host:rate[:concurrency]", e.g. "reddit.com:0.5:1,i.ytimg.com:10:8"
+HOST_LIMIT_OVERRIDES: Dict[str, Tuple[float, int]] = {}
+for _item in os.getenv('HOST_LIMIT_OVERRIDES', '').split(','):
+    _parts = [part.strip() for part in _item.split(':')]
+    if len(_parts) < 2 or not _parts[0]:
+        continue
+    try:
+        HOST_LIMIT_OVERRIDES[_parts[0].lower().removeprefix('www.')] = (float(_parts[1]), int(_parts[2]) if len(_parts) > 2 else HOST_MAX_CONCURRENCY)
+    except ValueError:
+        logger.warning(f"Ignoring invalid HOST_LIMIT_OVERRIDES entry: '{_item}'")
+
+
+def host_key(url: str) -> str:
+    """Scheduling key for a URL: lower-cased host without port or a leading 'www.'."""
+    return (urlparse(url).hostname or '').lower().removeprefix('www.')
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at: datetime = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _HostState:
+    def __init__(self, rate: float, burst: float, concurrency: int):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.semaphore = threading.BoundedSemaphore(max(1, concurrency))
+        self.lock = threading.Lock()
+
+
+class HostScheduler:
+    """Token bucket + concurrency cap per host, with Retry-After back-off."""
+
+    def __init__(self, rate_per_second: float = HOST_RATE_PER_SECOND, burst: float = HOST_BURST,
+                 max_concurrency: int = HOST_MAX_CONCURRENCY, overrides: Optional[Mapping[str, Tuple[float, int]]] = None):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.overrides: Dict[str, Tuple[float, int]] = dict(overrides or {})
+        self._hosts: Dict[str, _HostState] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, float] = {'requests': 0, 'delayed': 0, 'wait_seconds': 0.0, 'retry_after_blocks': 0}
+
+    def _state(self, host: str) -> _HostState:
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None:
+                rate, concurrency = self.overrides.get(host, (self.rate_per_second, self.max_concurrency))
+                state = _HostState(rate, self.burst, concurrency)
+                self._hosts[host] = state
+            return state
+
+    def _reserve_token(self, state: _HostState) -> float:
+        """Takes one token (possibly going into debt) and returns how long the caller must wait before sending."""
+        with state.lock:
+            now = time.monotonic()
+            if state.rate > 0:
+                state.tokens = min(state.burst, state.tokens + (now - state.updated_at) * state.rate)
+            state.updated_at = now
+            state.tokens -= 1
+            wait_seconds = (-state.tokens / state.rate) if (state.tokens < 0 and state.rate > 0) else 0.0
+            return max(wait_seconds, state.blocked_until - now)
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Blocks until a request to url's host may be sent, and holds one of that host's concurrency slots meanwhile."""
+        host = host_key(url)
+        if not host:
+            yield
+            return
+        state = self._state(host)
+        started_at = time.monotonic()
+        with state.semaphore:
+            wait_seconds = self._reserve_token(state)
+            if wait_seconds > 0:
+                time.sleep(wait_seconds)
+            waited = time.monotonic() - started_at
+            with self._lock:
+                self.stats['requests'] += 1
+                if waited > 0.01:
+                    self.stats['delayed'] += 1
+                    self.stats['wait_seconds'] += waited
+            if waited > 1:
+                logger.debug(f"Waited {waited:.2f}s for a request slot on {host}.")
+            yield
+
+    def note_response(self, url: str, status_code: Optional[int], headers: Optional[Mapping[str, str]] = None) -> None:
+        """Blocks the host for Retry-After seconds when it answers 429/503 (or 429 without the header: one refill period)."""
+        if status_code not in HOST_RETRY_AFTER_STATUS_CODES:
+            return
+        host = host_key(url)
+        if not host:
+            return
+        state = self._state(host)
+        retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+        if retry_after is None:
+            if status_code != 429:
+                return
+            retry_after = (1.0 / state.rate) if state.rate > 0 else 1.0
+        retry_after = min(retry_after, HOST_RETRY_AFTER_MAX_SECONDS)
+        with state.lock:
+            state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+        with self._lock:
+            self.stats['retry_after_blocks'] += 1
+        logger.info(f"{host} answered HTTP {status_code}; holding further requests to it for {retry_after:.1f}s.")
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, 'hosts': len(self._hosts)}
+
+
+_SCHEDULER: Optional[HostScheduler] = None
+_SCHEDULER_LOCK: threading.Lock = threading.Lock()
+
+def get_host_scheduler() -> HostScheduler:
+    """Returns the process-wide scheduler, creating it on first use."""
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        with _SCHEDULER_LOCK:
+            if _SCHEDULER is None:
+                _SCHEDULER = HostScheduler(overrides=HOST_LIMIT_OVERRIDES)
+    return _SCHEDULER
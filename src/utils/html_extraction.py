@@ -0,0 +1,280 @@
+# src/utils/html_extraction.py
+
+"""
+Single-parse HTML extraction engine used by the research agent.
+
+A page is parsed once with lxml (`parse_html_document`) and the same tree is shared by:
+    - the og:image / twitter:image lookup (`extract_meta_image_url`, reads <head> only),
+    - trafilatura (handed a copy of the tree, since it prunes in place),
+    - the selector-strategy fallback (`extract_main_text`).
+
+`extract_main_text` reproduces the old BeautifulSoup fallback (strip boilerplate elements, pick
+the longest of the known article containers, else join the body's long paragraphs) in ONE walk
+over the tree: boilerplate subtrees are skipped rather than decomposed, and every container
+selector is matched as the walk passes, instead of ~30 `select` removals plus ~13 container
+`select_one`/`find_all` passes. The tree is never modified.
+
+`find_canonical_url` and `extract_page_metadata` (title, published time) feed the research agent's
+persistent extraction cache, which is keyed by canonical URL plus body hash.
+"""
+
+import re
+import copy
+import logging
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+LXML_AVAILABLE: bool
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+    logger.warning("lxml not found. Research agent will fall back to BeautifulSoup html.parser extraction. Install with: pip install lxml")
+
+# --- Boilerplate (skipped subtrees) ---
+REMOVED_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'nav', 'footer', 'aside', 'header', 'form', 'button', 'input', 'figcaption'})
+REMOVED_CLASSES = frozenset({'related-posts', 'comments', 'sidebar', 'ad', 'banner', 'share-buttons', 'newsletter-signup', 'cookie-banner',
+                             'site-header', 'site-footer', 'navigation', 'menu', 'social-links', 'author-bio', 'pagination',
+                             'print-button', 'breadcrumbs'})
+REMOVED_IDS = frozenset({'comments', 'sidebar', 'header', 'footer', 'navigation'})
+
+# --- Article containers, in the old fallback's selector order: (label, predicate(tag, class_attr, id_attr)) ---
+CONTAINER_SELECTORS: Tuple[Tuple[str, Callable[[str, str, str], bool]], ...] = (
+    ('article[class*="content"]', lambda tag, cls, el_id: tag == 'article' and 'content' in cls),
+    ('article[class*="post"]', lambda tag, cls, el_id: tag == 'article' and 'post' in cls),
+    ('article[class*="article"]', lambda tag, cls, el_id: tag == 'article' and 'article' in cls),
+    ('main[id*="content"]', lambda tag, cls, el_id: tag == 'main' and 'content' in el_id),
+    ('main[class*="content"]', lambda tag, cls, el_id: tag == 'main' and 'content' in cls),
+    ('div[class*="article-body"]', lambda tag, cls, el_id: tag == 'div' and 'article-body' in cls),
+    ('div[class*="post-body"]', lambda tag, cls, el_id: tag == 'div' and 'post-body' in cls),
+    ('div[class*="entry-content"]', lambda tag, cls, el_id: tag == 'div' and 'entry-content' in cls),
+    ('div[class*="story-content"]', lambda tag, cls, el_id: tag == 'div' and 'story-content' in cls),
+    ('div[id*="article"]', lambda tag, cls, el_id: tag == 'div' and 'article' in el_id),
+    ('div#content', lambda tag, cls, el_id: tag == 'div' and el_id == 'content'),
+    ('div#main', lambda tag, cls, el_id: tag == 'div' and el_id == 'main'),
+    ('.article-content', lambda tag, cls, el_id: 'article-content' in cls.split()),
+)
+TEXT_BLOCK_TAGS = frozenset({'p', 'h1', 'h2', 'h3', 'h4', 'li', 'blockquote', 'pre'})
+BODY_PARAGRAPH_MIN_LENGTH: int = 50 # Paragraphs shorter than this are ignored by the body fallback
+LINK_ONLY_PARAGRAPH_MIN_LENGTH: int = 20 # A paragraph that is just one link is kept only if the link text is longer
+MAX_WALK_DEPTH: int = 400
+
+META_IMAGE_XPATHS: Tuple[Tuple[str, str], ...] = (
+    ("og:image", ".//meta[@property='og:image']/@content"),
+    ("og:image:secure_url", ".//meta[@property='og:image:secure_url']/@content"),
+    ("twitter:image", ".//meta[@name='twitter:image']/@content"),
+    ("twitter:image:src", ".//meta[@name='twitter:image:src']/@content"),
+    ("itemprop=image", ".//meta[@itemprop='image']/@content"),
+)
+
+PUBLISHED_TIME_XPATHS: Tuple[str, ...] = (
+    ".//meta[@property='article:published_time']/@content",
+    ".//meta[@property='og:published_time']/@content",
+    ".//meta[@itemprop='datePublished']/@content",
+    ".//meta[@name='pubdate']/@content",
+    ".//meta[@name='publishdate']/@content",
+    ".//meta[@name='date']/@content",
+    ".//meta[@name='dc.date.issued']/@content",
+)
+_JSON_LD_DATE_PUBLISHED_RE = re.compile(r'"datePublished"\s*:\s*"([^"]+)"')
+_LINK_TAG_RE = re.compile(rb'<link\b[^>]*>', re.IGNORECASE)
+_REL_CANONICAL_RE = re.compile(rb'\brel\s*=\s*["\']?canonical\b', re.IGNORECASE)
+_HREF_RE = re.compile(rb'\bhref\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+TRACKING_QUERY_PARAMS = frozenset({'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid', 'ocid', 'cmpid', 'guccounter'})
+ISO_FORMAT: str = '%Y-%m-%dT%H:%M:%SZ'
+
+
+def canonicalize_url(url: str) -> str:
+    """Lower-cased scheme/host, no fragment, no utm_*/click-id query parameters, no trailing slash on the path."""
+    parts = urlsplit(url.strip())
+    query = urlencode([(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not name.lower().startswith('utm_') and name.lower() not in TRACKING_QUERY_PARAMS])
+    path = parts.path.rstrip('/') if parts.path not in ('', '/') else ''
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ''))
+
+def find_canonical_url(head_html: bytes, page_url: str) -> str:
+    """
+    Canonical form of the page's <link rel="canonical"> (found with a regex over the raw <head>, no parse needed),
+    falling back to page_url. A canonical pointing at a site's front page from a deeper page is ignored.
+    """
+    for link_tag in _LINK_TAG_RE.findall(head_html):
+        if not _REL_CANONICAL_RE.search(link_tag):
+            continue
+        href_match = _HREF_RE.search(link_tag)
+        href = next((group for group in href_match.groups() if group), b'') if href_match else b''
+        canonical = urljoin(page_url, href.decode('utf-8', 'replace').strip()) if href.strip() else ''
+        if canonical.startswith('http') and (urlsplit(canonical).path.strip('/') or not urlsplit(page_url).path.strip('/')):
+            return canonicalize_url(canonical)
+        break
+    return canonicalize_url(page_url)
+
+def _normalize_published_time(value: str) -> Optional[str]:
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00').replace('z', '+00:00'))
+    except ValueError:
+        try:
+            parsed = datetime.strptime(value[:10], '%Y-%m-%d')
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).strftime(ISO_FORMAT)
+
+def extract_page_metadata(tree: Any) -> Dict[str, Optional[str]]:
+    """Title (og:title, else <title>) and published time (meta tags, JSON-LD, first <time datetime>) as ISO UTC."""
+    metadata: Dict[str, Optional[str]] = {'title': None, 'published_iso': None}
+    if tree is None:
+        return metadata
+    head = tree.find('head')
+    scope = head if head is not None else tree
+    og_title = scope.xpath(".//meta[@property='og:title']/@content")
+    title_text = tree.findtext('.//title')
+    metadata['title'] = next((str(value).strip() for value in og_title if str(value).strip()), None) or ((title_text or '').strip() or None)
+    candidates: List[str] = [str(value) for xpath in PUBLISHED_TIME_XPATHS for value in scope.xpath(xpath)]
+    for script_text in tree.xpath(".//script[@type='application/ld+json']/text()"):
+        candidates.extend(_JSON_LD_DATE_PUBLISHED_RE.findall(str(script_text)))
+    candidates.extend(str(value) for value in tree.xpath(".//time/@datetime")[:1])
+    metadata['published_iso'] = next((iso for iso in map(_normalize_published_time, candidates) if iso), None)
+    return metadata
+
+
+def parse_html_document(content: bytes, encoding: Optional[str] = None) -> Optional[Any]:
+    """Parses raw page bytes into an lxml HTML tree (root <html> element), or None if lxml is missing or parsing fails."""
+    if not LXML_AVAILABLE or not content:
+        return None
+    try:
+        parser = lxml.html.HTMLParser(encoding=encoding, remove_comments=True) if encoding else lxml.html.HTMLParser(remove_comments=True)
+        return lxml.html.document_fromstring(content, parser=parser)
+    except LookupError: # Unknown charset label from the page; let libxml2 detect it
+        return parse_html_document(content, None) if encoding else None
+    except (etree.ParserError, ValueError) as e:
+        logger.debug(f"lxml could not parse document: {e}")
+        return None
+
+def copy_tree(tree: Any) -> Any:
+    """Deep copy for consumers that prune the tree in place (trafilatura)."""
+    return copy.deepcopy(tree)
+
+def extract_meta_image_url(tree: Any, page_url: str) -> Optional[str]:
+    """og:image / twitter:image / itemprop=image from the document's <head>, resolved against page_url."""
+    head = tree.find('head') if tree is not None else None
+    if head is None:
+        return None
+    for label, xpath in META_IMAGE_XPATHS:
+        for value in head.xpath(xpath):
+            image_src_candidate = str(value).strip()
+            if not image_src_candidate:
+                continue
+            if image_src_candidate.startswith('//'): image_src_candidate = "https:" + image_src_candidate
+            if not image_src_candidate.startswith('http'): image_src_candidate = urljoin(page_url, image_src_candidate)
+            if image_src_candidate.startswith('http'):
+                logger.info(f"Found meta image ({label}): {image_src_candidate}")
+                return image_src_candidate
+    return None
+
+def _is_boilerplate(tag: str, classes: List[str], el_id: str, parent_tag: Optional[str]) -> bool:
+    if tag in REMOVED_TAGS or el_id in REMOVED_IDS:
+        return True
+    if tag == 'div' and parent_tag == 'figure':
+        return True
+    return any(cls in REMOVED_CLASSES for cls in classes)
+
+
+class _WalkState:
+    __slots__ = ('containers', 'claimed_selectors', 'open_containers', 'block', 'body_paragraphs', 'in_body')
+
+    def __init__(self) -> None:
+        self.containers: List[Dict[str, Any]] = [] # One per selector, in selector order of first match
+        self.claimed_selectors: set = set()
+        self.open_containers: List[Dict[str, Any]] = []
+        self.block: Optional[Dict[str, Any]] = None
+        self.body_paragraphs: List[str] = []
+        self.in_body: bool = False
+
+
+def _walk(element: Any, state: _WalkState, parent_tag: Optional[str], depth: int) -> None:
+    tag = element.tag
+    if not isinstance(tag, str) or depth > MAX_WALK_DEPTH: # Comments / processing instructions
+        return
+    tag = tag.lower()
+    class_attr = element.get('class') or ''
+    el_id = element.get('id') or ''
+    if _is_boilerplate(tag, class_attr.split(), el_id, parent_tag):
+        return
+
+    opened: List[Dict[str, Any]] = []
+    for selector_index, (label, predicate) in enumerate(CONTAINER_SELECTORS):
+        if selector_index not in state.claimed_selectors and predicate(tag, class_attr, el_id):
+            state.claimed_selectors.add(selector_index)
+            container = {'selector': label, 'order': selector_index, 'parts': []}
+            state.containers.append(container)
+            opened.append(container)
+    state.open_containers.extend(opened)
+
+    entered_body = tag == 'body' and not state.in_body
+    if entered_body:
+        state.in_body = True
+    starts_block = tag in TEXT_BLOCK_TAGS and state.block is None
+    if starts_block:
+        state.block = {'tag': tag, 'fragments': [], 'has_direct_text': False, 'link_texts': []}
+    block = state.block
+    link_fragments_start = len(block['fragments']) if (block is not None and tag == 'a') else None
+
+    if block is not None and element.text and element.text.strip():
+        block['fragments'].append(element.text.strip())
+        if starts_block: block['has_direct_text'] = True
+    for child in element:
+        _walk(child, state, tag, depth + 1)
+        if block is not None and child.tail and child.tail.strip():
+            block['fragments'].append(child.tail.strip())
+            if starts_block: block['has_direct_text'] = True
+    if link_fragments_start is not None:
+        block['link_texts'].append(' '.join(block['fragments'][link_fragments_start:]))
+
+    if starts_block:
+        text = ' '.join(block['fragments'])
+        if tag == 'p' and not block['has_direct_text'] and len(block['link_texts']) == 1:
+            # A paragraph that is only a link (e.g. "Read more: ...") is kept only for long link texts.
+            text = block['link_texts'][0] if len(block['link_texts'][0]) > LINK_ONLY_PARAGRAPH_MIN_LENGTH else ''
+        if text:
+            for container in state.open_containers:
+                container['parts'].append(text)
+            if tag == 'p' and state.in_body and len(text) > BODY_PARAGRAPH_MIN_LENGTH:
+                state.body_paragraphs.append(text)
+        state.block = None
+
+    if entered_body:
+        state.in_body = False
+    if opened:
+        del state.open_containers[-len(opened):]
+
+def extract_main_text(tree: Any, min_length: int) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Selector-strategy extraction in a single walk. Returns (text, strategy) where strategy is the winning
+    container selector or 'body-paragraphs'; (None, None) if nothing reaches min_length characters.
+    """
+    if tree is None:
+        return None, None
+    state = _WalkState()
+    _walk(tree, state, None, 0)
+    best_text, best_selector = "", None
+    for container in sorted(state.containers, key=lambda c: c['order']):
+        container_text = "\n\n".join(container['parts']).strip()
+        if len(container_text) > len(best_text):
+            best_text, best_selector = container_text, container['selector']
+    if best_text and len(best_text) >= min_length:
+        return best_text, best_selector
+    body_text = "\n\n".join(state.body_paragraphs).strip()
+    if body_text and len(body_text) >= min_length:
+        return body_text, 'body-paragraphs'
+    return None, None
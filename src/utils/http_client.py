@@ -0,0 +1,134 @@
+# src/utils/http_client.py
+
+"""
+Shared HTTP client for all outbound requests made by the pipeline.
+
+Every agent used to call `requests.get`/`requests.post` directly, which opens a fresh
+TCP+TLS connection per request. This module keeps one pooled `requests.Session` per
+process instead, so repeated requests to the same feed host, publisher or image CDN
+reuse keep-alive connections. It also centralises:
+    - connection pool sizing (globally and per host),
+    - the retry/backoff policy for transient failures (500/502/504, connection resets),
+    - default timeouts,
+    - the DacoolaNewsBot user agent,
+    - per-host politeness (rate limit, concurrency cap, Retry-After) via src/utils/host_scheduler.py.
+
+Call sites use `http_get` / `http_post`, which accept the same keyword arguments as
+`requests.get` / `requests.post` and return a regular `requests.Response`.
+"""
+
+import os
+import sys
+import logging
+import threading
+from typing import Dict, Optional, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# --- Path Setup ---
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.dirname(SCRIPT_DIR)
+PROJECT_ROOT = os.path.dirname(SRC_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from dotenv import load_dotenv
+dotenv_path = os.path.join(PROJECT_ROOT, '.env')
+load_dotenv(dotenv_path=dotenv_path)
+# --- End Path Setup ---
+
+from src.utils.host_scheduler import get_host_scheduler
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+WEBSITE_URL_FOR_CLIENT: str = os.getenv('YOUR_SITE_BASE_URL', 'https://dacoolaa.netlify.app')
+DEFAULT_USER_AGENT: str = f'DacoolaNewsBot/1.0 (+{WEBSITE_URL_FOR_CLIENT})'
+HTTP_DEFAULT_TIMEOUT: float = float(os.getenv('HTTP_DEFAULT_TIMEOUT', '15'))
+HTTP_POOL_CONNECTIONS: int = int(os.getenv('HTTP_POOL_CONNECTIONS', '64')) # Number of distinct hosts kept pooled
+HTTP_POOL_MAXSIZE: int = int(os.getenv('HTTP_POOL_MAXSIZE', '8')) # Keep-alive connections kept per host
+HTTP_MAX_RETRIES: int = int(os.getenv('HTTP_MAX_RETRIES', '2'))
+HTTP_BACKOFF_FACTOR: float = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5'))
+# 429/503 are not retried here: re-sending to a throttling host within a second only makes it worse. The
+# response goes back to HostScheduler.note_response, which holds the host for the capped Retry-After.
+HTTP_RETRY_STATUS_CODES = (500, 502, 504)
+# Optional per-host pool sizes, e.g. "techcrunch.com:4,i.ytimg.com:12"
+HTTP_HOST_POOL_SIZES: Dict[str, int] = {}
+for _item in os.getenv('HTTP_HOST_POOL_SIZES', '').split(','):
+    _item = _item.strip()
+    if ':' in _item:
+        _host, _size = _item.rsplit(':', 1)
+        try:
+            HTTP_HOST_POOL_SIZES[_host.strip().lower()] = int(_size)
+        except ValueError:
+            logger.warning(f"Ignoring invalid HTTP_HOST_POOL_SIZES entry: '{_item}'")
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK: threading.Lock = threading.Lock()
+
+
+def _build_retry_policy() -> Retry:
+    # Only idempotent methods are retried; POSTs (webhooks) are sent exactly once.
+    # Retry-After is not honoured here: urllib3 would sleep for the full (uncapped) value inside the host's
+    # concurrency slot. Throttling statuses are not retried at all (see HTTP_RETRY_STATUS_CODES).
+    return Retry(
+        total=HTTP_MAX_RETRIES, connect=HTTP_MAX_RETRIES, read=HTTP_MAX_RETRIES, status=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR, status_forcelist=HTTP_RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+        respect_retry_after_header=False, raise_on_status=False
+    )
+
+def _build_session() -> requests.Session:
+    session = requests.Session()
+    session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+    default_adapter = HTTPAdapter(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=_build_retry_policy())
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+    for host, pool_size in HTTP_HOST_POOL_SIZES.items():
+        host_adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=_build_retry_policy())
+        session.mount(f'https://{host}/', host_adapter)
+        session.mount(f'http://{host}/', host_adapter)
+    logger.debug(f"HTTP session created (pool_connections={HTTP_POOL_CONNECTIONS}, pool_maxsize={HTTP_POOL_MAXSIZE}, "
+                 f"retries={HTTP_MAX_RETRIES}, host overrides={len(HTTP_HOST_POOL_SIZES)})")
+    return session
+
+def get_session() -> requests.Session:
+    """Returns the process-wide pooled session, creating it on first use."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+    return _SESSION
+
+def close_session() -> None:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+            _SESSION = None
+
+def http_request(method: str, url: str, polite: bool = True, **kwargs: Any) -> requests.Response:
+    """
+    Sends a request on the shared session. With polite=True (the default) the request waits for its host's
+    rate limit / concurrency slot first; the slot is held until the response headers (or, without stream=True,
+    the whole body) have arrived.
+    """
+    kwargs.setdefault('timeout', HTTP_DEFAULT_TIMEOUT)
+    if not polite:
+        return get_session().request(method, url, **kwargs)
+    scheduler = get_host_scheduler()
+    with scheduler.slot(url):
+        response = get_session().request(method, url, **kwargs)
+    scheduler.note_response(response.url or url, response.status_code, response.headers)
+    return response
+
+def http_get(url: str, **kwargs: Any) -> requests.Response:
+    return http_request('GET', url, **kwargs)
+
+def http_post(url: str, **kwargs: Any) -> requests.Response:
+    return http_request('POST', url, **kwargs)
@@ -0,0 +1,102 @@
+# src/utils/image_headers.py
+
+"""
+Reads image dimensions straight from the first bytes of a JPEG, PNG, GIF or WebP file.
+
+Used by the research agent to validate candidate images (minimum width/height) from a
+few KB of a streamed response, instead of downloading and decoding the whole file with PIL.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+# JPEG start-of-frame markers that carry the frame size (C4, C8 and CC are not SOF markers).
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+# JPEG markers without a length field.
+_JPEG_STANDALONE_MARKERS = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9}
+
+
+def sniff_image_format(data: bytes) -> Optional[str]:
+    """Returns 'jpeg', 'png', 'gif' or 'webp' from the magic bytes, or None if unrecognised."""
+    if data[:3] == b'\xff\xd8\xff':
+        return 'jpeg'
+    if data[:8] == b'\x89PNG\r\n\x1a\n':
+        return 'png'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    return None
+
+def looks_like_markup(data: bytes) -> bool:
+    """True for bodies that are clearly HTML/XML/JSON (error pages served with an image content-type)."""
+    stripped = data[:64].lstrip(b'\xef\xbb\xbf \t\r\n')
+    return stripped[:1] in (b'<', b'{', b'[')
+
+def _jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    i = 2
+    data_len = len(data)
+    while i < data_len:
+        if data[i] != 0xFF:
+            i += 1 # Not at a marker; skip stray byte
+            continue
+        while i < data_len and data[i] == 0xFF: # Fill bytes
+            i += 1
+        if i >= data_len:
+            return None
+        marker = data[i]
+        i += 1
+        if marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        if i + 2 > data_len:
+            return None
+        segment_length = struct.unpack('>H', data[i:i + 2])[0]
+        if marker in _JPEG_SOF_MARKERS:
+            if i + 7 > data_len:
+                return None
+            height, width = struct.unpack('>HH', data[i + 3:i + 7])
+            return width, height
+        i += segment_length
+    return None
+
+def _webp_size(data: bytes) -> Optional[Tuple[int, int]]:
+    if len(data) < 30:
+        return None
+    chunk_type = data[12:16]
+    if chunk_type == b'VP8 ':
+        if data[23:26] != b'\x9d\x01\x2a':
+            return None
+        width, height = struct.unpack('<HH', data[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk_type == b'VP8L':
+        if data[20] != 0x2F:
+            return None
+        bits = struct.unpack('<I', data[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk_type == b'VP8X':
+        width = int.from_bytes(data[24:27], 'little') + 1
+        height = int.from_bytes(data[27:30], 'little') + 1
+        return width, height
+    return None
+
+def probe_image_size(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """
+    Returns (format, width, height) if the header in `data` is complete enough to read the size.
+    Returns None when the format is unknown or more bytes are needed; use sniff_image_format
+    to tell the two apart.
+    """
+    image_format = sniff_image_format(data)
+    size: Optional[Tuple[int, int]] = None
+    if image_format == 'png':
+        if len(data) >= 24 and data[12:16] == b'IHDR':
+            size = struct.unpack('>II', data[16:24])
+    elif image_format == 'gif':
+        if len(data) >= 10:
+            size = struct.unpack('<HH', data[6:10])
+    elif image_format == 'webp':
+        size = _webp_size(data)
+    elif image_format == 'jpeg':
+        size = _jpeg_size(data)
+    if image_format and size:
+        return image_format, size[0], size[1]
+    return None
@@ -0,0 +1,102 @@
+# src/utils/json_journal.py
+
+"""
+JSON snapshot + append-only JSONL journal, for indexes that grow by small inserts (embedding store keys,
+MinHash keys/fingerprints).
+
+Rewriting a whole JSON sidecar on every insert makes each insert O(size of the index) and rewrites
+the file on every run. Instead, each insert here is one line appended to `<journal>`. The full state is
+written to `<snapshot>` only on compaction. Compaction happens once the journal holds more than
+max(min_records, ratio x live entries) records, so the cost per insert stays amortised O(1).
+
+Every journal record carries a sequence number and the snapshot records the last one it contains.
+Replay skips records the snapshot already covers, so a crash between writing the snapshot and truncating
+the journal does not apply records twice. A torn last line (crash mid-append) is ignored on load and cut
+off before the next append.
+"""
+
+import os
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+JOURNAL_COMPACT_MIN_RECORDS: int = int(os.getenv('JOURNAL_COMPACT_MIN_RECORDS', '256'))
+JOURNAL_COMPACT_RATIO: float = float(os.getenv('JOURNAL_COMPACT_RATIO', '0.25')) # Journal records per live entry that trigger compaction
+
+
+class JsonJournal:
+    """Not thread-safe on its own; callers hold their index lock around load/append/compact."""
+
+    def __init__(self, snapshot_path: str, journal_path: str, min_records: int = JOURNAL_COMPACT_MIN_RECORDS,
+                 ratio: float = JOURNAL_COMPACT_RATIO):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.min_records = min_records
+        self.ratio = ratio
+        self._seq = 0 # Last sequence number written or replayed
+        self._journal_records = 0 # Records in the journal file that the snapshot does not cover
+        self._journal_bytes = 0 # Length of the journal's valid prefix
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """(snapshot or None, journal records newer than the snapshot, in order). Raises if the snapshot is unreadable."""
+        snapshot: Optional[Dict[str, Any]] = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        snapshot_seq = int((snapshot or {}).get('seq', 0))
+        self._seq = snapshot_seq
+        self._journal_records = 0
+        self._journal_bytes = 0
+        records: List[Dict[str, Any]] = []
+        if not os.path.exists(self.journal_path):
+            return snapshot, records
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring torn record at the end of {self.journal_path}.")
+                    break
+                if not line.endswith(b'\n'):
+                    break # Complete JSON but no newline: the append was cut off, drop it as well
+                self._journal_bytes += len(line)
+                seq = int(record.get('seq', 0))
+                if seq <= snapshot_seq:
+                    continue
+                self._seq = seq
+                self._journal_records += 1
+                records.append(record)
+        return snapshot, records
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Appends one record (a sequence number is added) as a single JSONL line."""
+        self._seq += 1
+        line = (json.dumps({**record, 'seq': self._seq}, ensure_ascii=False) + '\n').encode('utf-8')
+        os.makedirs(os.path.dirname(self.journal_path) or '.', exist_ok=True)
+        with open(self.journal_path, 'ab') as f:
+            if f.tell() != self._journal_bytes: # Cut off a torn tail before appending after it
+                f.truncate(self._journal_bytes)
+                f.seek(self._journal_bytes)
+            f.write(line)
+        self._journal_bytes += len(line)
+        self._journal_records += 1
+
+    def needs_compaction(self, live_entries: int) -> bool:
+        return self._journal_records > max(self.min_records, self.ratio * live_entries)
+
+    def compact(self, snapshot: Dict[str, Any]) -> None:
+        """Writes `snapshot` (the full current state) atomically, then empties the journal."""
+        os.makedirs(os.path.dirname(self.snapshot_path) or '.', exist_ok=True)
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({**snapshot, 'seq': self._seq}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.snapshot_path)
+        with open(self.journal_path, 'wb'):
+            pass
+        self._journal_records = 0
+        self._journal_bytes = 0
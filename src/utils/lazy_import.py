@@ -0,0 +1,64 @@
+# src/utils/lazy_import.py
+
+"""
+Deferred imports for heavy optional dependencies (modal, feedparser, trafilatura, serpapi, the social SDKs).
+
+module_available() answers "is it installed?" from importlib's finder without executing the package, so
+modules can keep their `*_AVAILABLE` flags at import time. lazy_module() returns a stand-in whose first
+attribute access performs the real import, so existing `feedparser.parse(...)` style call sites keep
+working while the import cost moves to the stage that actually uses the library.
+"""
+
+import logging
+import importlib
+import importlib.util
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+def module_available(module_name: str) -> bool:
+    """True if `module_name` can be imported. Only the finder runs (parent packages of a dotted name are imported)."""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+class LazyModule:
+    """
+    Stand-in for `module_name` (or one of its attributes) that imports it on first attribute access or call.
+    An ImportError surfaces at that first use, not at definition time.
+    """
+
+    def __init__(self, module_name: str, attribute: Optional[str] = None):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target: Any = None
+        self._lock = threading.Lock()
+
+    def _resolve(self) -> Any:
+        if self._target is None:
+            with self._lock:
+                if self._target is None:
+                    module = importlib.import_module(self._module_name)
+                    self._target = getattr(module, self._attribute) if self._attribute else module
+                    logger.debug(f"Deferred import of {self!r} resolved.")
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<lazy {self._module_name}{'.' + self._attribute if self._attribute else ''}>"
+
+
+def lazy_module(module_name: str, attribute: Optional[str] = None) -> Optional[LazyModule]:
+    """A LazyModule for an installed module, or None when it is not installed (matching the `x = None` fallbacks)."""
+    return LazyModule(module_name, attribute) if module_available(module_name) else None
@@ -0,0 +1,234 @@
+# src/utils/minhash_lsh.py
+
+"""
+MinHash signatures over word shingles plus a persistent LSH (banding) index, for catching exact and
+near-exact copies (syndicated wire stories, lightly reworded press releases) without a model call.
+
+A signature is `num_perm` minimums of universal hashes over the text's k-word shingles; the share of
+equal positions between two signatures estimates their Jaccard similarity. The LSH index splits each
+signature into `bands` bands of num_perm/bands rows: two texts share at least one band bucket with
+high probability when their Jaccard is above ~(1/bands)^(bands/num_perm) (0.71 with the defaults), and
+bucket hits are then confirmed with the signature estimate.
+
+Layout inside `directory` for an index called `name`:
+    <name>.minhash        raw uint32 matrix, one signature row per inserted key (append-only)
+    <name>.minhash.json   snapshot {"num_perm", "bands", "shingle_size", "seed", "keys": [...], "fingerprints": {key: fp}, "seq"}
+    <name>.minhash.jsonl  journal of inserts since the snapshot (see src/utils/json_journal.py)
+
+Re-inserting a key appends a new row and orphans the old one (its key becomes ''), like EmbeddingStore,
+and like it each insert is one journal line; the snapshot is only rewritten when the journal is compacted.
+Buckets are kept in memory and rebuilt from the signature file on load.
+"""
+
+import os
+import re
+import zlib
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.utils.json_journal import JsonJournal
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+MINHASH_NUM_PERM: int = 128
+MINHASH_BANDS: int = 16
+MINHASH_SHINGLE_SIZE: int = 5 # Words per shingle
+MINHASH_MIN_SHINGLES: int = 20 # Shorter texts get no signature: a few shared phrases would look like a copy
+MERSENNE_PRIME: int = (1 << 61) - 1
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def shingle_hashes(text: str, shingle_size: int = MINHASH_SHINGLE_SIZE) -> np.ndarray:
+    """Distinct crc32 hashes of the lower-cased text's `shingle_size`-word shingles (uint64 array)."""
+    words = WORD_PATTERN.findall(text.lower())
+    if len(words) < shingle_size:
+        return np.zeros(0, dtype=np.uint64)
+    shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """Computes uint32 MinHash signatures with `num_perm` hashes of the form (a*x + b) mod (2^61 - 1)."""
+
+    def __init__(self, num_perm: int = MINHASH_NUM_PERM, shingle_size: int = MINHASH_SHINGLE_SIZE,
+                 min_shingles: int = MINHASH_MIN_SHINGLES, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+        rng = np.random.default_rng(seed)
+        # a < 2^31 and x < 2^32 keep a*x + b below 2^64, so uint64 arithmetic is exact before the modulo
+        self._a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)[:, None]
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """The text's signature, or None when it has fewer than `min_shingles` distinct shingles."""
+        hashes = shingle_hashes(text, self.shingle_size)
+        if len(hashes) < self.min_shingles:
+            return None
+        permuted = (self._a * hashes[None, :] + self._b) % np.uint64(MERSENNE_PRIME)
+        return (permuted.min(axis=1) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+def estimate_jaccard(signature: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of one signature against each row of a signature matrix."""
+    return np.mean(np.atleast_2d(signatures) == signature, axis=1)
+
+
+class MinHashLSHIndex:
+    """A thread-safe, append-only LSH index of MinHash signatures persisted as a raw matrix plus a JSON sidecar."""
+
+    def __init__(self, directory: str, name: str, num_perm: int = MINHASH_NUM_PERM, bands: int = MINHASH_BANDS,
+                 shingle_size: int = MINHASH_SHINGLE_SIZE, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.directory = directory
+        self.name = name
+        self.bands = bands
+        self.hasher = MinHasher(num_perm, shingle_size, seed=seed)
+        self.signatures_path = os.path.join(directory, f"{name}.minhash")
+        self.index_path = os.path.join(directory, f"{name}.minhash.json")
+        self.journal_path = os.path.join(directory, f"{name}.minhash.jsonl")
+        self._journal = JsonJournal(self.index_path, self.journal_path)
+        self._snapshot_stale = True # The next write must rewrite the snapshot (none on disk, or built with other parameters)
+        self._params = {'num_perm': num_perm, 'bands': bands, 'shingle_size': shingle_size, 'seed': seed}
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._keys: List[str] = [] # Row -> key ('' for rows orphaned by a re-insert)
+        self._key_to_row: Dict[str, int] = {}
+        self._fingerprints: Dict[str, str] = {}
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+
+    # --- Loading ---
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            index, records = self._journal.load()
+            if index is None:
+                return
+            if any(index.get(param) != value for param, value in self._params.items()):
+                logger.warning(f"MinHash index '{self.name}' was built with different parameters. Starting empty.")
+                return
+            self._keys = list(index.get('keys', []))
+            self._key_to_row = {key: row for row, key in enumerate(self._keys) if key}
+            self._fingerprints = index.get('fingerprints', {}) or {}
+            for record in records:
+                self._apply_insert(record.get('fingerprints') or {}, record.get('dropped', []), record.get('keys', []))
+            num_perm = self._params['num_perm']
+            signatures = np.fromfile(self.signatures_path, dtype=np.uint32) if os.path.exists(self.signatures_path) else np.zeros(0, dtype=np.uint32)
+            if len(signatures) < len(self._keys) * num_perm:
+                logger.error(f"MinHash index '{self.name}' is truncated ({len(signatures) // num_perm} rows on disk, {len(self._keys)} indexed). Starting empty.")
+                self._keys, self._key_to_row, self._fingerprints = [], {}, {}
+                return
+            self._signatures = signatures[:len(self._keys) * num_perm].reshape(len(self._keys), num_perm)
+            for row in self._key_to_row.values():
+                self._add_to_buckets(row)
+            self._snapshot_stale = False
+            logger.debug(f"Loaded MinHash index '{self.name}' with {len(self._key_to_row)} signatures.")
+        except Exception as e:
+            logger.error(f"Failed to load MinHash index '{self.name}' from {self.directory}: {e}. Starting empty.")
+            self._keys, self._key_to_row, self._fingerprints = [], {}, {}
+            self._signatures = np.zeros((0, self._params['num_perm']), dtype=np.uint32)
+            self._buckets = [{} for _ in range(self.bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [band.tobytes() for band in signature.reshape(self.bands, -1)]
+
+    def _add_to_buckets(self, row: int) -> None:
+        for band, band_key in enumerate(self._band_keys(self._signatures[row])):
+            self._buckets[band].setdefault(band_key, []).append(row)
+
+    # --- Reads ---
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        return self.hasher.signature(text)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._key_to_row)
+
+    def __contains__(self, key: str) -> bool:
+        """True for every key inserted, including those whose text was too short for a signature."""
+        with self._lock:
+            self._load()
+            return key in self._key_to_row or key in self._fingerprints
+
+    def get_fingerprint(self, key: str) -> Optional[str]:
+        with self._lock:
+            self._load()
+            return self._fingerprints.get(key)
+
+    def query(self, signature: np.ndarray, min_jaccard: float, exclude: Iterable[str] = ()) -> List[Tuple[str, float]]:
+        """(key, estimated Jaccard) for indexed keys sharing an LSH bucket with `signature` and estimated >= min_jaccard, best first."""
+        with self._lock:
+            self._load()
+            candidate_rows = set()
+            for band, band_key in enumerate(self._band_keys(signature)):
+                candidate_rows.update(self._buckets[band].get(band_key, ()))
+            excluded = set(exclude)
+            candidate_rows = sorted(row for row in candidate_rows if self._keys[row] and self._keys[row] not in excluded)
+            if not candidate_rows:
+                return []
+            similarities = estimate_jaccard(signature, self._signatures[candidate_rows])
+            matches = [(self._keys[row], float(similarity)) for row, similarity in zip(candidate_rows, similarities) if similarity >= min_jaccard]
+            return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    # --- Writes ---
+    def add_many(self, items: Sequence[Tuple[str, Optional[np.ndarray], Optional[str]]]) -> int:
+        """
+        Inserts (key, signature, text fingerprint) triples and persists them. A None signature (text too short)
+        only records the fingerprint, so the key is not re-examined until its text changes. Returns the rows written.
+        """
+        if not items:
+            return 0
+        with self._lock:
+            self._load()
+            fingerprints = {key: fingerprint for key, _, fingerprint in items if fingerprint}
+            # Text shrank below the minimum: stop matching it
+            dropped = [key for key, signature, _ in items if signature is None and key in self._key_to_row]
+            rows = [(key, signature) for key, signature, _ in items if signature is not None]
+            if rows:
+                signatures = np.asarray([signature for _, signature in rows], dtype=np.uint32)
+                os.makedirs(self.directory, exist_ok=True)
+                expected_bytes = self._signatures.size * 4
+                with open(self.signatures_path, 'ab') as f:
+                    if f.tell() != expected_bytes: # Drop rows left behind by an interrupted write
+                        f.truncate(expected_bytes)
+                        f.seek(expected_bytes)
+                    f.write(signatures.tobytes())
+                self._signatures = np.vstack([self._signatures, signatures])
+            first_row = len(self._keys)
+            row_keys = [key for key, _ in rows]
+            self._apply_insert(fingerprints, dropped, row_keys)
+            for row in range(first_row, len(self._keys)):
+                self._add_to_buckets(row)
+            if self._snapshot_stale or self._journal.needs_compaction(max(len(self._key_to_row), len(self._fingerprints))):
+                self._compact()
+            else:
+                self._journal.append({'keys': row_keys, 'fingerprints': fingerprints, 'dropped': dropped})
+            return len(rows)
+
+    def _apply_insert(self, fingerprints: Dict[str, str], dropped: Iterable[str], row_keys: Iterable[str]) -> None:
+        """Key bookkeeping of one add_many call (also used to replay the journal); buckets are handled by the caller."""
+        self._fingerprints.update(fingerprints)
+        for key in dropped:
+            if key in self._key_to_row:
+                self._keys[self._key_to_row.pop(key)] = ''
+        for key in row_keys:
+            old_row = self._key_to_row.get(key)
+            if old_row is not None:
+                self._keys[old_row] = ''
+            self._key_to_row[key] = len(self._keys)
+            self._keys.append(key)
+
+    def _compact(self) -> None:
+        self._journal.compact({**self._params, 'keys': self._keys, 'fingerprints': self._fingerprints})
+        self._snapshot_stale = False
@@ -0,0 +1,243 @@
+# src/utils/model_registry.py
+
+"""
+Process-wide registry of heavy ML models (sentence-transformers, spaCy), shared by every agent.
+
+Each (kind, name) pair is loaded at most once per process, on first use, under a per-model lock, so
+concurrent callers wait for the one load instead of loading their own copy. A failed load (library
+or weights missing) is remembered and not retried, and callers get None.
+
+Settings (environment):
+    MODEL_DEVICE               device passed to sentence-transformers ('cpu', 'cuda', 'mps'); unset = library default
+    MODEL_NUM_THREADS          torch intra-op threads, applied once before the first load; 0 = library default
+    MODEL_IDLE_UNLOAD_SECONDS  unload models unused for this long (checked by a daemon thread); 0 = never
+
+Callers should fetch the model from the registry for each unit of work rather than keep it in a module
+global, so an idle unload actually frees the weights. metrics() reports load time, resident-memory growth
+during the load, parameter size, use count and idle time per model.
+"""
+
+import os
+import gc
+import time
+import logging
+import threading
+import importlib.util
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+# --- Configuration ---
+MODEL_DEVICE: Optional[str] = os.getenv('MODEL_DEVICE') or None
+MODEL_NUM_THREADS: int = int(os.getenv('MODEL_NUM_THREADS', '0'))
+MODEL_IDLE_UNLOAD_SECONDS: float = float(os.getenv('MODEL_IDLE_UNLOAD_SECONDS', '0'))
+
+SENTENCE_TRANSFORMER: str = 'sentence_transformer'
+SPACY: str = 'spacy'
+KIND_MODULES: Dict[str, str] = {SENTENCE_TRANSFORMER: 'sentence_transformers', SPACY: 'spacy'}
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux /proc), or None where unavailable."""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except Exception:
+        return None
+
+def _parameter_bytes(model: Any) -> Optional[int]:
+    parameters = getattr(model, 'parameters', None)
+    if not callable(parameters):
+        return None
+    try:
+        return sum(parameter.numel() * parameter.element_size() for parameter in parameters())
+    except Exception:
+        return None
+
+def _load_sentence_transformer(name: str, device: Optional[str]) -> Any:
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(name, device=device) if device else SentenceTransformer(name)
+
+def _load_spacy(name: str, device: Optional[str]) -> Any:
+    import spacy
+    if device and device.startswith('cuda'):
+        spacy.prefer_gpu()
+    return spacy.load(name)
+
+
+class _ModelEntry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.model: Any = None
+        self.error: Optional[str] = None
+        self.loads = 0
+        self.uses = 0
+        self.load_seconds: Optional[float] = None
+        self.rss_delta_bytes: Optional[int] = None
+        self.parameter_bytes: Optional[int] = None
+        self.last_used = 0.0
+
+
+class ModelRegistry:
+    """Lazy, thread-safe, one-instance-per-name model cache with an optional idle unload policy."""
+
+    def __init__(self, device: Optional[str] = MODEL_DEVICE, num_threads: int = MODEL_NUM_THREADS,
+                 idle_unload_seconds: float = MODEL_IDLE_UNLOAD_SECONDS):
+        self.device = device
+        self.num_threads = num_threads
+        self.idle_unload_seconds = idle_unload_seconds
+        self._loaders: Dict[str, Callable[[str, Optional[str]], Any]] = {SENTENCE_TRANSFORMER: _load_sentence_transformer, SPACY: _load_spacy}
+        self._entries: Dict[Tuple[str, str], _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self._threads_configured = False
+        self._reaper: Optional[threading.Thread] = None
+
+    def register_loader(self, kind: str, loader: Callable[[str, Optional[str]], Any]) -> None:
+        """Adds (or replaces) the loader for a model kind; loader(name, device) returns the model or raises."""
+        self._loaders[kind] = loader
+
+    def is_available(self, kind: str) -> bool:
+        """True when the library behind `kind` is importable (checked without importing it)."""
+        module_name = KIND_MODULES.get(kind)
+        if module_name is None:
+            return kind in self._loaders
+        return importlib.util.find_spec(module_name) is not None
+
+    def _entry(self, kind: str, name: str) -> _ModelEntry:
+        with self._lock:
+            return self._entries.setdefault((kind, name), _ModelEntry())
+
+    def _configure_threads(self) -> None:
+        if self._threads_configured or self.num_threads <= 0:
+            return
+        self._threads_configured = True
+        try:
+            import torch
+            torch.set_num_threads(self.num_threads)
+            logger.info(f"Model registry: torch intra-op threads set to {self.num_threads}.")
+        except Exception as e:
+            logger.warning(f"Model registry: could not set torch threads to {self.num_threads}: {e}")
+
+    # --- Access ---
+    def get(self, kind: str, name: str) -> Optional[Any]:
+        """The shared model instance, loading it on first use. Returns None if it cannot be loaded."""
+        entry = self._entry(kind, name)
+        with entry.lock:
+            if entry.model is None and entry.error is None:
+                self._load(kind, name, entry)
+            if entry.model is not None:
+                entry.uses += 1
+                entry.last_used = time.monotonic()
+            return entry.model
+
+    def sentence_transformer(self, name: str) -> Optional[Any]:
+        return self.get(SENTENCE_TRANSFORMER, name)
+
+    def spacy(self, name: str) -> Optional[Any]:
+        return self.get(SPACY, name)
+
+    def _load(self, kind: str, name: str, entry: _ModelEntry) -> None:
+        loader = self._loaders.get(kind)
+        if loader is None:
+            entry.error = f"no loader registered for kind '{kind}'"
+            logger.error(f"Model registry: {entry.error}.")
+            return
+        if not self.is_available(kind):
+            entry.error = f"library '{KIND_MODULES.get(kind, kind)}' is not installed"
+            logger.warning(f"Model registry: cannot load {kind} '{name}': {entry.error}.")
+            return
+        with self._lock:
+            self._configure_threads()
+        rss_before = _current_rss_bytes()
+        started_at = time.perf_counter()
+        try:
+            logger.info(f"Loading {kind} model '{name}'{f' on {self.device}' if self.device else ''}...")
+            entry.model = loader(name, self.device)
+        except Exception as e:
+            entry.error = str(e)
+            logger.error(f"Failed to load {kind} model '{name}': {e}")
+            return
+        entry.load_seconds = time.perf_counter() - started_at
+        rss_after = _current_rss_bytes()
+        entry.rss_delta_bytes = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        entry.parameter_bytes = _parameter_bytes(entry.model)
+        entry.loads += 1
+        rss_note = f", +{entry.rss_delta_bytes / 1048576:.0f} MB RSS" if entry.rss_delta_bytes is not None else ''
+        logger.info(f"Loaded {kind} model '{name}' in {entry.load_seconds:.2f}s{rss_note}.")
+        self._start_reaper()
+
+    # --- Unloading ---
+    def unload(self, kind: str, name: str) -> bool:
+        """Drops the registry's reference to a loaded model (a later get() reloads it). Returns True if one was loaded."""
+        entry = self._entry(kind, name)
+        with entry.lock:
+            if entry.model is None:
+                return False
+            entry.model = None
+        gc.collect()
+        logger.info(f"Unloaded {kind} model '{name}'.")
+        return True
+
+    def unload_idle(self, max_idle_seconds: Optional[float] = None) -> List[str]:
+        """Unloads every model unused for max_idle_seconds (default: the registry's idle_unload_seconds). Returns 'kind:name' ids."""
+        max_idle_seconds = self.idle_unload_seconds if max_idle_seconds is None else max_idle_seconds
+        if max_idle_seconds <= 0:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            idle_keys = [key for key, entry in self._entries.items() if entry.model is not None and now - entry.last_used >= max_idle_seconds]
+        return [f"{kind}:{name}" for kind, name in idle_keys if self.unload(kind, name)]
+
+    def _start_reaper(self) -> None:
+        if self.idle_unload_seconds <= 0:
+            return
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_idle_models, name='model-registry-reaper', daemon=True)
+            self._reaper.start()
+
+    def _reap_idle_models(self) -> None:
+        interval = max(1.0, min(self.idle_unload_seconds / 2, 60.0))
+        while True:
+            time.sleep(interval)
+            try:
+                self.unload_idle()
+            except Exception as e:
+                logger.error(f"Model registry idle unload failed: {e}")
+
+    # --- Metrics ---
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entries = list(self._entries.items())
+        return {f"{kind}:{name}": {'loaded': entry.model is not None, 'error': entry.error, 'loads': entry.loads, 'uses': entry.uses,
+                                   'load_seconds': entry.load_seconds, 'rss_delta_mb': entry.rss_delta_bytes / 1048576 if entry.rss_delta_bytes is not None else None,
+                                   'parameter_mb': entry.parameter_bytes / 1048576 if entry.parameter_bytes is not None else None,
+                                   'idle_seconds': now - entry.last_used if entry.last_used else None}
+                for (kind, name), entry in entries}
+
+    def log_metrics(self) -> None:
+        for model_id, stats in self.metrics().items():
+            if stats['error']:
+                logger.info(f"Model {model_id}: unavailable ({stats['error']}).")
+                continue
+            load_time = f"{stats['load_seconds']:.2f}s" if stats['load_seconds'] is not None else '-'
+            rss = f"{stats['rss_delta_mb']:.0f} MB" if stats['rss_delta_mb'] is not None else '-'
+            params = f"{stats['parameter_mb']:.0f} MB" if stats['parameter_mb'] is not None else '-'
+            logger.info(f"Model {model_id}: loaded={stats['loaded']}, loads={stats['loads']}, uses={stats['uses']}, "
+                        f"load time {load_time}, RSS +{rss}, parameters {params}.")
+
+
+_registry: Optional[ModelRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    """The process-wide registry, created with the environment settings on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
@@ -0,0 +1,170 @@
+# src/utils/persistent_cache.py
+
+"""
+Small JSON-backed key/value cache with per-entry TTL and LRU eviction.
+
+Used for research-stage caches that must survive between cron runs (image validation
+results and similar). Entries are kept in access order; once `max_entries` is exceeded the
+least recently used entries are evicted; with `max_bytes` set, LRU entries are also evicted while the
+serialised values exceed that budget. The file is written atomically (temp file + os.replace) and
+only when something changed.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+if not logging.getLogger().hasHandlers():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+
+class PersistentCache:
+    """
+    A thread-safe, size-bounded cache persisted to a JSON file.
+
+    Each stored record looks like {"value": ..., "stored_at": epoch_seconds, "expires_at": epoch_seconds or null}.
+    """
+
+    def __init__(self, file_path: str, default_ttl_seconds: Optional[float] = None, max_entries: int = 5000, name: Optional[str] = None,
+                 max_bytes: Optional[int] = None):
+        self.file_path = file_path
+        self.default_ttl_seconds = default_ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.name = name or os.path.basename(file_path)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {} # Serialised value sizes, tracked only when max_bytes is set
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dirty = False
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'writes': 0}
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = data.get('entries') if isinstance(data, dict) else None
+            if not isinstance(entries, list):
+                logger.warning(f"Cache file {self.file_path} has invalid format. Starting empty.")
+                return
+            for item in entries: # Stored oldest -> most recently used
+                if isinstance(item, dict) and isinstance(item.get('key'), str) and 'value' in item:
+                    key = item.pop('key')
+                    self._entries[key] = item
+                    self._track_size(key, item['value'])
+            self._evict_over_budget() # Budgets may have been lowered since the file was written
+            logger.debug(f"Loaded {len(self._entries)} entries into cache '{self.name}'.")
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding JSON from cache file {self.file_path}. Starting empty.")
+        except Exception as e:
+            logger.error(f"Error loading cache file {self.file_path}: {e}")
+
+    def _track_size(self, key: str, value: Any) -> None:
+        if self.max_bytes is None:
+            return
+        size = len(json.dumps(value, ensure_ascii=False))
+        self._total_bytes += size - self._sizes.get(key, 0)
+        self._sizes[key] = size
+
+    def _pop_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        self._total_bytes -= self._sizes.pop(key, 0)
+        return self._entries.pop(key, None)
+
+    def _evict_over_budget(self) -> None:
+        while len(self._entries) > self.max_entries or (self.max_bytes is not None and self._total_bytes > self.max_bytes and len(self._entries) > 1):
+            self._pop_entry(next(iter(self._entries)))
+            self._dirty = True
+            self.stats['evicted'] += 1
+
+    @property
+    def total_bytes(self) -> Optional[int]:
+        """Approximate serialised size of all values (None unless max_bytes is set)."""
+        with self._lock:
+            self._load()
+            return self._total_bytes if self.max_bytes is not None else None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            self._load()
+            record = self._entries.get(key)
+            if record is None:
+                self.stats['misses'] += 1
+                return default
+            expires_at = record.get('expires_at')
+            if expires_at is not None and expires_at < time.time():
+                self._pop_entry(key)
+                self._dirty = True
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._dirty = True # Access order is part of the persisted state
+            self.stats['hits'] += 1
+            return record['value']
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Like get(), but does not count towards stats or refresh the entry's LRU position."""
+        with self._lock:
+            self._load()
+            record = self._entries.get(key)
+            if record is None or (record.get('expires_at') is not None and record['expires_at'] < time.time()):
+                return default
+            return record['value']
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.default_ttl_seconds
+        now = time.time()
+        with self._lock:
+            self._load()
+            self._entries[key] = {'value': value, 'stored_at': now, 'expires_at': (now + ttl) if ttl is not None else None}
+            self._entries.move_to_end(key)
+            self._track_size(key, value)
+            self._dirty = True
+            self.stats['writes'] += 1
+            self._evict_over_budget()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._load()
+            if self._pop_entry(key) is not None:
+                self._dirty = True
+
+    def __contains__(self, key: str) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    def save(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return True
+            now = time.time()
+            serialisable = [{'key': key, **record} for key, record in self._entries.items()
+                            if record.get('expires_at') is None or record['expires_at'] >= now]
+            tmp_path = f"{self.file_path}.tmp"
+            try:
+                os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'entries': serialisable}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.file_path)
+                self._dirty = False
+                logger.debug(f"Saved {len(serialisable)} entries for cache '{self.name}'. Stats: {self.stats}")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to save cache '{self.name}' to {self.file_path}: {e}")
+                return False